@@ -0,0 +1,62 @@
+"""Reduced-dimension embeddings with HNSW indexes
+
+The downgrade is lossy: truncated vectors cannot be widened back to 3072
+dimensions, so it deletes the stored embeddings. Run ``kedb-reindex``
+after downgrading to regenerate them with the full-size model output.
+
+Revision ID: 6c1d2e8a4b7f
+Revises: 457f09125f49
+Create Date: 2025-11-20 09:42:18.311204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+# revision identifiers, used by Alembic.
+revision = '6c1d2e8a4b7f'
+down_revision = '457f09125f49'
+branch_labels = None
+depends_on = None
+
+EMBEDDING_TABLES = ('entry_embeddings', 'solution_embeddings')
+
+# pgvector refuses to build HNSW indexes above these sizes.
+MAX_INDEXABLE_DIMENSIONS = {'vector': 2000, 'halfvec': 4000}
+
+
+def upgrade() -> None:
+    storage = settings.embedding_storage
+    dims = settings.embedding_dimensions
+    if storage not in MAX_INDEXABLE_DIMENSIONS:
+        raise ValueError(f"Unsupported embedding_storage {storage!r}")
+    if dims > MAX_INDEXABLE_DIMENSIONS[storage]:
+        raise ValueError(
+            f"{storage}({dims}) cannot be HNSW-indexed; "
+            f"max is {MAX_INDEXABLE_DIMENSIONS[storage]} dimensions"
+        )
+
+    column_type = f"{storage}({dims})"
+    for table in EMBEDDING_TABLES:
+        # text-embedding-3 vectors are Matryoshka-trained: the leading
+        # dimensions re-normalised are a valid lower-dimensional embedding.
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN embedding TYPE {column_type} "
+            f"USING l2_normalize(subvector(embedding, 1, {dims}))::{column_type}"
+        )
+        op.execute(sa.text(f"UPDATE {table} SET dimension = :dims").bindparams(dims=dims))
+        op.execute(
+            f"CREATE INDEX ix_{table}_embedding_hnsw ON {table} "
+            f"USING hnsw (embedding {storage}_cosine_ops) "
+            f"WITH (m = {settings.hnsw_m}, ef_construction = {settings.hnsw_ef_construction})"
+        )
+
+
+def downgrade() -> None:
+    for table in EMBEDDING_TABLES:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_embedding_hnsw")
+        # Truncated vectors cannot be widened back. Drop the rows rather than
+        # leave NULL embeddings behind, so a reindex regenerates every one.
+        op.execute(f"DELETE FROM {table}")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN embedding TYPE vector(3072) USING NULL")
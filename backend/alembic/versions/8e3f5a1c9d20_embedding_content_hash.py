@@ -0,0 +1,26 @@
+"""Add content hash to embeddings
+
+Revision ID: 8e3f5a1c9d20
+Revises: 6c1d2e8a4b7f
+Create Date: 2025-11-21 14:05:51.902117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e3f5a1c9d20'
+down_revision = '6c1d2e8a4b7f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('entry_embeddings', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('solution_embeddings', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('solution_embeddings', 'content_hash')
+    op.drop_column('entry_embeddings', 'content_hash')
@@ -0,0 +1,48 @@
+"""One embedding per entity and model
+
+Revision ID: a4b7c2d9e613
+Revises: 8e3f5a1c9d20
+Create Date: 2025-11-22 10:17:33.480652
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4b7c2d9e613'
+down_revision = '8e3f5a1c9d20'
+branch_labels = None
+depends_on = None
+
+# (table, owner column, unique constraint, old single-column index)
+EMBEDDING_TABLES = (
+    ('entry_embeddings', 'entry_id', 'uq_entry_embeddings_entry_model', 'ix_entry_embeddings_entry_id'),
+    ('solution_embeddings', 'solution_id', 'uq_solution_embeddings_solution_model', 'ix_solution_embeddings_solution_id'),
+)
+
+
+def upgrade() -> None:
+    for table, owner, constraint, old_index in EMBEDDING_TABLES:
+        # Compaction: every re-index appended a row; keep only the newest
+        # per (owner, model) before the unique key can be created.
+        op.execute(
+            f"DELETE FROM {table} a USING {table} b "
+            f"WHERE a.{owner} = b.{owner} AND a.model_name = b.model_name "
+            f"AND (a.created_at, a.id) < (b.created_at, b.id)"
+        )
+        op.add_column(
+            table,
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        )
+        op.execute(f"UPDATE {table} SET updated_at = created_at")
+        op.create_unique_constraint(constraint, table, [owner, 'model_name'])
+        # The unique key's leading column serves owner lookups.
+        op.drop_index(old_index, table_name=table)
+
+
+def downgrade() -> None:
+    for table, owner, constraint, old_index in EMBEDDING_TABLES:
+        op.create_index(old_index, table, [owner], unique=False)
+        op.drop_constraint(constraint, table, type_='unique')
+        op.drop_column(table, 'updated_at')
@@ -0,0 +1,38 @@
+"""Keyset indexes for the entry filter combinations that include created_by
+
+Revision ID: b3e9d4a1c7f2
+Revises: f1d7a2c9e4b6
+Create Date: 2025-12-01 09:14:37.210584
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e9d4a1c7f2'
+down_revision = 'f1d7a2c9e4b6'
+branch_labels = None
+depends_on = None
+
+# Completes e8c4b1f7a3d2: every combination of the three listing filters
+# now has its own (..., created_at, id) index
+KEYSET_INDEXES = {
+    'ix_entries_severity_created_by_created_at_id': ['severity', 'created_by'],
+    'ix_entries_workflow_created_by_created_at_id': ['workflow_state', 'created_by'],
+    'ix_entries_workflow_severity_created_by_created_at_id': ['workflow_state', 'severity', 'created_by'],
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps writes flowing on a large entries table
+    with op.get_context().autocommit_block():
+        for name, columns in KEYSET_INDEXES.items():
+            op.create_index(
+                name, 'entries', columns + ['created_at', 'id'],
+                unique=False, postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    for name in reversed(list(KEYSET_INDEXES)):
+        op.drop_index(name, table_name='entries')
@@ -0,0 +1,34 @@
+"""Transactional outbox table
+
+Revision ID: c7e2f4a8b1d5
+Revises: a4b7c2d9e613
+Create Date: 2025-11-24 09:42:18.265301
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2f4a8b1d5'
+down_revision = 'a4b7c2d9e613'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'outbox_events',
+        sa.Column('id', sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column('event_type', sa.String(length=100), nullable=False),
+        sa.Column('aggregate_type', sa.String(length=50), nullable=False),
+        sa.Column('aggregate_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('outbox_events')
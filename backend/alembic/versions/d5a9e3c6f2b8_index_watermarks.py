@@ -0,0 +1,33 @@
+"""Per-backend index watermarks
+
+Revision ID: d5a9e3c6f2b8
+Revises: c7e2f4a8b1d5
+Create Date: 2025-11-25 16:08:44.713920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a9e3c6f2b8'
+down_revision = 'c7e2f4a8b1d5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'index_watermarks',
+        sa.Column('entity_type', sa.String(length=50), nullable=False),
+        sa.Column('entity_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('backend', sa.String(length=50), nullable=False),
+        sa.Column('source_updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('indexed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('entity_type', 'backend', 'entity_id', name='pk_index_watermarks'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('index_watermarks')
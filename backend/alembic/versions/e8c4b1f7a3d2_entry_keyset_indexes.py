@@ -0,0 +1,46 @@
+"""Composite (filter, created_at, id) indexes for keyset pagination
+
+Revision ID: e8c4b1f7a3d2
+Revises: d5a9e3c6f2b8
+Create Date: 2025-11-27 10:21:05.482113
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8c4b1f7a3d2'
+down_revision = 'd5a9e3c6f2b8'
+branch_labels = None
+depends_on = None
+
+# Leading columns per listing filter; each index ends in (created_at, id)
+KEYSET_INDEXES = {
+    'ix_entries_created_at_id': [],
+    'ix_entries_workflow_created_at_id': ['workflow_state'],
+    'ix_entries_severity_created_at_id': ['severity'],
+    'ix_entries_created_by_created_at_id': ['created_by'],
+    'ix_entries_workflow_severity_created_at_id': ['workflow_state', 'severity'],
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps writes flowing on a large entries table
+    with op.get_context().autocommit_block():
+        for name, columns in KEYSET_INDEXES.items():
+            op.create_index(
+                name, 'entries', columns + ['created_at', 'id'],
+                unique=False, postgresql_concurrently=True, if_not_exists=True,
+            )
+        # Both are prefixes of the new indexes
+        op.drop_index('ix_entries_created_at', table_name='entries', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(
+            'ix_entries_workflow_severity', table_name='entries', postgresql_concurrently=True, if_exists=True
+        )
+
+
+def downgrade() -> None:
+    op.create_index('ix_entries_workflow_severity', 'entries', ['workflow_state', 'severity'], unique=False)
+    op.create_index('ix_entries_created_at', 'entries', ['created_at'], unique=False)
+    for name in reversed(list(KEYSET_INDEXES)):
+        op.drop_index(name, table_name='entries')
@@ -0,0 +1,44 @@
+"""Materialized view of dashboard entry counts
+
+Revision ID: f1d7a2c9e4b6
+Revises: e8c4b1f7a3d2
+Create Date: 2025-11-28 14:37:52.906118
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1d7a2c9e4b6'
+down_revision = 'e8c4b1f7a3d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One GROUPING SETS pass: a row per severity, workflow state and status,
+    # plus the grand total (which also carries the last-30-days count).
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW entry_stats AS
+        SELECT
+            CASE
+                WHEN grouping(severity) = 0 THEN 'severity'
+                WHEN grouping(workflow_state) = 0 THEN 'workflow_state'
+                WHEN grouping(status) = 0 THEN 'status'
+                ELSE 'total'
+            END AS dimension,
+            coalesce(severity::text, workflow_state::text, status::text, '') AS value,
+            count(*) AS entries,
+            count(*) FILTER (WHERE created_at >= now() - interval '30 days') AS recent,
+            now() AS refreshed_at
+        FROM entries
+        GROUP BY GROUPING SETS ((severity), (workflow_state), (status), ())
+        """
+    )
+    # REFRESH ... CONCURRENTLY requires a unique index
+    op.create_index('ux_entry_stats_dimension_value', 'entry_stats', ['dimension', 'value'], unique=True)
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS entry_stats")
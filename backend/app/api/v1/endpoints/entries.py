@@ -51,9 +51,11 @@ async def list_entries(
     workflow_state: Optional[str] = Query(None),
     severity: Optional[str] = Query(None),
     created_by: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    total_mode: Optional[str] = Query(None, description="How total is computed: exact, estimate or cached"),
     db: AsyncSession = Depends(get_db),
 ):
-    """List entries with filters and pagination."""
+    """List entries with filters and keyset (cursor) or offset pagination."""
     try:
         service = EntryService(db)
         result = await service.list_entries(
@@ -62,6 +64,8 @@ async def list_entries(
             workflow_state=workflow_state,
             severity=severity,
             created_by=created_by,
+            cursor=cursor,
+            total_mode=total_mode,
         )
         # Convert Entry models to dict for serialization
         result["items"] = [
@@ -76,6 +80,8 @@ async def list_entries(
             for entry in result["items"]
         ]
         return result
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
@@ -0,0 +1,33 @@
+"""Hybrid search endpoints."""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db
+from app.core.config import settings
+from app.schemas.search import SearchResponse
+from app.search.hybrid import HybridSearchService
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SearchResponse)
+async def search_entries(
+    q: str = Query(..., min_length=1, description="Free-text query"),
+    limit: int = Query(settings.suggestion_top_k, ge=1, le=100),
+    severity: Optional[str] = Query(None),
+    workflow_state: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """Search entries with BM25 and vector retrieval fused by reciprocal rank."""
+    try:
+        service = HybridSearchService(db)
+        return await service.search(
+            q,
+            limit=limit,
+            severity=severity,
+            workflow_state=workflow_state,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
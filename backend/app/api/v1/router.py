@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, entries, health, reviews, solutions, stats, tags, user
+from app.api.v1.endpoints import auth, entries, health, reviews, search, solutions, stats, tags, user
 
 api_router = APIRouter()
 api_router.include_router(health.router, prefix="/health", tags=["health"])
@@ -10,4 +10,5 @@ api_router.include_router(entries.router, prefix="/entries", tags=["entries"])
 api_router.include_router(solutions.router, prefix="/solutions", tags=["solutions"])
 api_router.include_router(tags.router, prefix="/tags", tags=["tags"])
 api_router.include_router(reviews.router, prefix="/reviews", tags=["reviews"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
 api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
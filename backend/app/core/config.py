@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import List
+from typing import Dict, List
 
 from pydantic import AnyUrl, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -17,15 +17,96 @@ class Settings(BaseSettings):
     rq_default_queue: str = "default"
     meilisearch_url: AnyUrl = "http://localhost:7700"
     meilisearch_master_key: str = "local_master_key"
+    meilisearch_batch_size: int = 1000
+    meilisearch_flush_interval_ms: int = 200
+    meilisearch_max_concurrency: int = 20
 
     openai_api_key: str = ""
+    # "openai" or "hashing" (deterministic local model for offline benchmarks;
+    # pair it with a distinct embedding_model name so vectors never mix)
+    embedding_provider: str = "openai"
     embedding_model: str = "text-embedding-3-large"
+    # Matryoshka-truncated output size requested from the embeddings API.
+    # pgvector can only build HNSW indexes on `vector` up to 2000 dimensions
+    # (4000 for `halfvec`), so the default stays below that limit.
+    embedding_dimensions: int = 1536
+    embedding_storage: str = "vector"  # "vector" or "halfvec"
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 64
+    hnsw_ef_search: int = 40
+    # Per-request budget when packing texts into one embeddings call
+    embedding_batch_max_items: int = 256
+    embedding_batch_max_tokens: int = 100_000
+    embedding_batch_concurrency: int = 4
+    # Provider quota (0 disables a limit) and retry policy
+    embedding_requests_per_minute: int = 3000
+    embedding_tokens_per_minute: int = 1_000_000
+    embedding_max_attempts: int = 6
+    embedding_retry_max_wait_seconds: float = 60.0
+    # Content-hash cache: LRU entries per process, Redis TTL (0 disables Redis)
+    embedding_cache_size: int = 1000
+    embedding_cache_ttl_seconds: int = 0
     reranker_model: str = "ms-marco-MiniLM-L-12-v2"
     suggestion_top_k: int = 5
 
+    # Hybrid search: per-backend deadlines and reciprocal rank fusion
+    search_candidate_k: int = 50
+    search_lexical_timeout_ms: int = 300
+    search_vector_timeout_ms: int = 800
+    rrf_k: int = 60
+
+    # Re-ranking: "none", "lexical" (local overlap scorer) or "cross-encoder"
+    # (reranker_model via sentence-transformers, installed separately)
+    reranker_backend: str = "none"
+    rerank_candidates: int = 20
+    rerank_max_batch_size: int = 64
+    rerank_max_wait_ms: int = 5
+    rerank_cache_size: int = 10000
+    search_rerank_timeout_ms: int = 500
+
+    # Optional in-process exact vector index (empty dir = query pgvector),
+    # refreshed by kedb-worker every vector_index_refresh_seconds (0 disables)
+    vector_index_dir: str = ""
+    vector_index_dtype: str = "float16"
+    vector_index_refresh_seconds: int = 30
+
     uvicorn_host: str = "0.0.0.0"
     uvicorn_port: int = 8080
     worker_concurrency: int = 2
+    # Per-downstream in-flight limits shared by a worker's concurrent jobs
+    worker_embedding_concurrency: int = 4
+    worker_meilisearch_concurrency: int = 4
+    worker_postgres_concurrency: int = 4
+    # Debounced indexing: edits within the window coalesce into one job
+    index_debounce_ms: int = 5000
+    index_batch_size: int = 100
+    index_scheduler_interval_ms: int = 1000
+    # Queue lanes: weighted fair share while busy; these severities use the critical lane
+    queue_lane_weights: Dict[str, int] = Field(
+        default_factory=lambda: {"critical": 8, "interactive": 4, "backfill": 1}
+    )
+    critical_severities: List[str] = Field(default_factory=lambda: ["critical", "high"])
+    # Transactional outbox dispatcher
+    outbox_batch_size: int = 500
+    outbox_poll_interval_ms: int = 500
+    # Worker metrics: Prometheus endpoint (0 disables) and periodic log dump (0 disables)
+    worker_metrics_host: str = "0.0.0.0"
+    worker_metrics_port: int = 9108
+    worker_metrics_log_interval_seconds: int = 60
+    # Drift reconciliation inside kedb-worker (0 disables; use kedb-reconcile)
+    reconcile_interval_seconds: int = 3600
+    reindex_chunk_size: int = 500
+    reindex_concurrency: int = 4
+
+    # List totals: default total_mode ("exact", "estimate", "cached") and cache bounds
+    list_total_mode: str = "exact"
+    count_cache_ttl_seconds: int = 30
+    count_cache_size: int = 1024
+
+    # Dashboard stats: entry_stats view refresh period (0 = always compute live)
+    # and the age beyond which the API ignores the view
+    stats_view_refresh_seconds: int = 60
+    stats_view_max_staleness_seconds: int = 300
 
     allowed_origins: List[str] = Field(default_factory=lambda: ["*"])
 
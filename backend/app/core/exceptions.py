@@ -29,3 +29,18 @@ class WorkflowError(KEDBException):
 class PermissionError(KEDBException):
     """Permission denied."""
     pass
+
+
+class EmbeddingError(KEDBException):
+    """Embedding provider failed after retries."""
+    pass
+
+
+class SearchIndexError(KEDBException):
+    """Search index rejected or could not receive a write."""
+    pass
+
+
+class ReindexError(KEDBException):
+    """A reindex run finished with failed chunks."""
+    pass
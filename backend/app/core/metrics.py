@@ -0,0 +1,227 @@
+"""Process-local metrics with Prometheus text exposition and per-job stage spans."""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# Seconds; spans from a cached 5ms lookup up to a rate-limited embedding retry
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues, extra: Sequence[Tuple[str, str]] = ()) -> str:
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(_Metric):
+    """Monotonic count per label set."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self.values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for key, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{self._labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Last observed value per label set."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        self.values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count per label set."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label values -> [per-bucket counts..., sum, count]
+        self.values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        state = self.values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[i] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def count(self, **labels: str) -> int:
+        state = self.values.get(self._key(labels))
+        return int(state[-1]) if state else 0
+
+    def sum(self, **labels: str) -> float:
+        state = self.values.get(self._key(labels))
+        return state[-2] if state else 0.0
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for key, state in sorted(self.values.items()):
+            for bound, count in zip(self.buckets, state):
+                le = (("le", _format_value(bound)),)
+                lines.append(f"{self.name}_bucket{self._labels(key, le)} {_format_value(count)}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{self._labels(key)} {_format_value(state[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Metrics owned by this process.
+
+    Values live in plain dicts and are only touched from the event loop, so
+    no locking is needed. ``render`` produces the Prometheus text format and
+    ``snapshot`` a compact dict for structured log dumps.
+    """
+
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """
+        ``{metric: {"label=value,...": value}}``; histograms report count,
+        sum and mean instead of buckets.
+        """
+        snapshot: Dict[str, Dict[str, object]] = {}
+        for name, metric in self.metrics.items():
+            series = {}
+            for key, value in metric.values.items():
+                label = ",".join(f"{n}={v}" for n, v in zip(metric.labelnames, key)) or "_"
+                if isinstance(metric, Histogram):
+                    count, total = int(value[-1]), value[-2]
+                    value = {
+                        "count": count,
+                        "sum": round(total, 6),
+                        "mean": round(total / count, 6) if count else 0.0,
+                    }
+                series[label] = value
+            if series:
+                snapshot[name] = series
+        return snapshot
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "kedb_stage_seconds",
+    "Time spent in one worker stage (fetch, embed, meilisearch_upsert, meilisearch_delete, "
+    "meilisearch_write, db_flush, stats_refresh).",
+    ["stage"],
+)
+
+# Stage -> seconds accumulated by the job running in the current context
+_job_stages: ContextVar[Optional[Dict[str, float]]] = ContextVar("kedb_job_stages", default=None)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """
+    Time a block as one ``stage``.
+
+    Every span feeds the process-wide ``kedb_stage_seconds`` histogram and,
+    inside ``collect_stages``, the running job's per-stage breakdown. Tasks
+    spawned by the job inherit the context, so their spans count too.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        stages = _job_stages.get()
+        if stages is not None:
+            stages[stage] = stages.get(stage, 0.0) + elapsed
+
+
+@contextmanager
+def collect_stages() -> Iterator[Dict[str, float]]:
+    """Collect the seconds spent per stage by spans inside this block."""
+    stages: Dict[str, float] = {}
+    token = _job_stages.set(stages)
+    try:
+        yield stages
+    finally:
+        _job_stages.reset(token)
@@ -6,13 +6,20 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.router import api_router
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.search.meilisearch import get_meilisearch_client
+from app.search.reranker import get_reranker
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    """Placeholder for startup/shutdown hooks (workers, indexers, etc.)."""
+    """Startup/shutdown hooks: logging, the reranker model and the shared Meilisearch client."""
     setup_logging(settings.log_level)
+    # Load the reranker model at boot rather than on the first search
+    get_reranker()
+    meilisearch = get_meilisearch_client()
+    await meilisearch.start()
     yield
+    await meilisearch.aclose()
 
 
 app = FastAPI(
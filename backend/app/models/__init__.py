@@ -4,6 +4,8 @@ from app.models.audit import AuditLog, SuggestionEvent
 from app.models.base import Base
 from app.models.embedding import EntryEmbedding, SolutionEmbedding
 from app.models.entry import Entry, EntryIncident, EntrySymptom, EntryStatus, SeverityLevel, WorkflowState
+from app.models.index_watermark import IndexWatermark
+from app.models.outbox import OutboxEvent
 from app.models.review import ParticipantRole, Review, ReviewParticipant, ReviewStatus
 from app.models.solution import Solution, SolutionStep, SolutionType
 from app.models.tag import EntryTag, Tag
@@ -25,6 +27,8 @@ __all__ = [
     "EntryStatus",
     "SeverityLevel",
     "WorkflowState",
+    "IndexWatermark",
+    "OutboxEvent",
     "ParticipantRole",
     "Review",
     "ReviewParticipant",
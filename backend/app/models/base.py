@@ -4,4 +4,6 @@ from sqlalchemy.orm import DeclarativeBase
 class Base(DeclarativeBase):
     """Base class for declarative models with UUID/id helpers to be extended later."""
 
-    pass
+    # Fetch server-generated values (created_at, updated_at, ...) with
+    # RETURNING on the INSERT/UPDATE itself rather than a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
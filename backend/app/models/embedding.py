@@ -3,14 +3,33 @@ from datetime import datetime
 from typing import Optional
 from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC, Vector
 
+from app.core.config import settings
 from app.models.base import Base
 
 
+def embedding_column_type():
+    """Column type for stored vectors, driven by the configured storage mode."""
+    if settings.embedding_storage == "halfvec":
+        return HALFVEC(settings.embedding_dimensions)
+    return Vector(settings.embedding_dimensions)
+
+
+def hnsw_index(name: str) -> Index:
+    """HNSW cosine index over the `embedding` column."""
+    return Index(
+        name,
+        "embedding",
+        postgresql_using="hnsw",
+        postgresql_with={"m": settings.hnsw_m, "ef_construction": settings.hnsw_ef_construction},
+        postgresql_ops={"embedding": f"{settings.embedding_storage}_cosine_ops"},
+    )
+
+
 class EntryEmbedding(Base):
     """Vector embedding for an entry (title + description + symptoms)."""
 
@@ -21,26 +40,38 @@ class EntryEmbedding(Base):
         UUID(as_uuid=True),
         ForeignKey("entries.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     
     # Embedding metadata
     model_name: Mapped[str] = mapped_column(String(100), nullable=False)
     dimension: Mapped[int] = mapped_column(Integer, nullable=False)
+    # sha256 of normalized source text + model; unchanged hash means no re-embed
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64))
     
-    # The actual vector (pgvector type)
-    # Using 3072 for text-embedding-3-large
-    embedding: Mapped[Optional[list]] = mapped_column(Vector(3072))
+    # The actual vector (pgvector type), truncated to settings.embedding_dimensions
+    embedding: Mapped[Optional[list]] = mapped_column(embedding_column_type())
     
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
         nullable=False,
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
 
     # Relationships
     entry: Mapped["Entry"] = relationship("Entry", back_populates="embeddings")
 
+    __table_args__ = (
+        # One row per (entry, model): re-indexing upserts instead of appending
+        UniqueConstraint("entry_id", "model_name", name="uq_entry_embeddings_entry_model"),
+        hnsw_index("ix_entry_embeddings_embedding_hnsw"),
+    )
+
     def __repr__(self) -> str:
         return f"<EntryEmbedding(entry_id={self.entry_id}, model={self.model_name})>"
 
@@ -55,25 +86,37 @@ class SolutionEmbedding(Base):
         UUID(as_uuid=True),
         ForeignKey("solutions.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     
     # Embedding metadata
     model_name: Mapped[str] = mapped_column(String(100), nullable=False)
     dimension: Mapped[int] = mapped_column(Integer, nullable=False)
+    # sha256 of normalized source text + model; unchanged hash means no re-embed
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64))
     
     # The actual vector
-    embedding: Mapped[Optional[list]] = mapped_column(Vector(3072))
+    embedding: Mapped[Optional[list]] = mapped_column(embedding_column_type())
     
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
         nullable=False,
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
 
     # Relationships
     solution: Mapped["Solution"] = relationship("Solution", back_populates="embeddings")
 
+    __table_args__ = (
+        UniqueConstraint("solution_id", "model_name", name="uq_solution_embeddings_solution_model"),
+        hnsw_index("ix_solution_embeddings_embedding_hnsw"),
+    )
+
     def __repr__(self) -> str:
         return f"<SolutionEmbedding(solution_id={self.solution_id}, model={self.model_name})>"
 
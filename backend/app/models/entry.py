@@ -21,6 +21,10 @@ class WorkflowState(str, PyEnum):
     MERGED = "merged"
 
 
+# Entries in these states are withdrawn from the search indexes
+UNSEARCHABLE_STATES = (WorkflowState.RETIRED, WorkflowState.MERGED)
+
+
 class EntryStatus(str, PyEnum):
     """Entry operational status."""
 
@@ -142,9 +146,29 @@ class Entry(Base):
         foreign_keys=[merged_into_id],
     )
 
+    # Keyset pagination: (<filters>, created_at, id) per listing filter
     __table_args__ = (
-        Index("ix_entries_workflow_severity", "workflow_state", "severity"),
-        Index("ix_entries_created_at", "created_at"),
+        Index("ix_entries_created_at_id", "created_at", "id"),
+        Index("ix_entries_workflow_created_at_id", "workflow_state", "created_at", "id"),
+        Index("ix_entries_severity_created_at_id", "severity", "created_at", "id"),
+        Index("ix_entries_created_by_created_at_id", "created_by", "created_at", "id"),
+        Index(
+            "ix_entries_workflow_severity_created_at_id",
+            "workflow_state",
+            "severity",
+            "created_at",
+            "id",
+        ),
+        Index("ix_entries_severity_created_by_created_at_id", "severity", "created_by", "created_at", "id"),
+        Index("ix_entries_workflow_created_by_created_at_id", "workflow_state", "created_by", "created_at", "id"),
+        Index(
+            "ix_entries_workflow_severity_created_by_created_at_id",
+            "workflow_state",
+            "severity",
+            "created_by",
+            "created_at",
+            "id",
+        ),
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,40 @@
+"""Per-backend record of which version of an entity each search backend holds."""
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import DateTime, PrimaryKeyConstraint, String, func
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class IndexWatermark(Base):
+    """
+    The ``updated_at`` of an entity as last written to one backend.
+
+    An entity is stale for a backend when its current ``updated_at`` is
+    newer than ``source_updated_at`` (or no row exists). Storing the
+    source version rather than the wall clock avoids missing edits that
+    commit while an indexing job is running.
+    """
+
+    __tablename__ = "index_watermarks"
+
+    entity_type: Mapped[str] = mapped_column(String(50), nullable=False)  # "entries", "solutions"
+    entity_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    backend: Mapped[str] = mapped_column(String(50), nullable=False)  # "meilisearch", "embedding"
+
+    source_updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    indexed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        PrimaryKeyConstraint("entity_type", "backend", "entity_id", name="pk_index_watermarks"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<IndexWatermark({self.backend}:{self.entity_type}:{self.entity_id})>"
@@ -0,0 +1,38 @@
+"""Transactional outbox: side effects recorded alongside the domain change."""
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import BigInteger, DateTime, Identity, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class OutboxEvent(Base):
+    """
+    A pending event written in the same transaction as the change it describes.
+
+    Rows are claimed by the dispatcher with ``FOR UPDATE SKIP LOCKED``,
+    fanned out to the indexing pipeline and deleted in one transaction.
+    """
+
+    __tablename__ = "outbox_events"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False)  # e.g. "entry.updated"
+    aggregate_type: Mapped[str] = mapped_column(String(50), nullable=False)  # "entries", "solutions"
+    aggregate_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    payload: Mapped[Optional[dict]] = mapped_column(JSONB)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<OutboxEvent(id={self.id}, type={self.event_type}, aggregate={self.aggregate_type}:{self.aggregate_id})>"
@@ -1,13 +1,19 @@
 """Repository package for database operations."""
 from .base import BaseRepository
+from .embedding_repo import EmbeddingRepository
 from .entry_repo import EntryRepository
+from .index_watermark_repo import IndexWatermarkRepository
+from .outbox_repo import OutboxRepository
 from .review_repo import ReviewRepository
 from .solution_repo import SolutionRepository
 from .tag_repo import EntryTagRepository, TagRepository
 
 __all__ = [
     "BaseRepository",
+    "EmbeddingRepository",
     "EntryRepository",
+    "IndexWatermarkRepository",
+    "OutboxRepository",
     "SolutionRepository",
     "TagRepository",
     "EntryTagRepository",
@@ -1,19 +1,104 @@
 """Base repository with common CRUD operations."""
-from typing import Any, Generic, List, Optional, Type, TypeVar
+import time
+from collections import OrderedDict
+from typing import Any, Generic, List, Optional, Sequence, Tuple, Type, TypeVar
 from uuid import UUID
 
-from sqlalchemy import select
+import orjson
+from sqlalchemy import Select, func, insert, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
+from app.core.config import settings
 from app.models.base import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# How list endpoints compute their total
+EXACT = "exact"
+ESTIMATE = "estimate"
+CACHED = "cached"
+TOTAL_MODES = (EXACT, ESTIMATE, CACHED)
+
+
+class _Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON) <statement>`` keeping the statement's bind parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+# Planner row estimate for a table, scaled from the last ANALYZE to its
+# current size the way the planner does; NULL if it was never analysed.
+_TABLE_ESTIMATE = text(
+    """
+    SELECT (CASE
+        WHEN c.reltuples < 0 THEN NULL
+        WHEN c.relpages = 0 THEN c.reltuples
+        ELSE c.reltuples / c.relpages
+             * (pg_relation_size(c.oid) / current_setting('block_size')::int)
+    END)::bigint
+    FROM pg_class c
+    WHERE c.oid = CAST(:table AS regclass)
+    """
+)
+
+
+class CountCache:
+    """
+    Short-lived totals keyed by table and filter set.
+
+    Process-local and bounded; an entry is served until ``ttl_seconds`` after
+    it was computed, so a cached total may trail writes by up to the TTL.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024, clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self._data: "OrderedDict[Tuple, Tuple[float, int]]" = OrderedDict()
+
+    def get(self, key: Tuple) -> Optional[int]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= self.clock():
+            del self._data[key]
+            return None
+        return value
+
+    def set(self, key: Tuple, value: int) -> None:
+        if self.max_entries <= 0:
+            return
+        self._data[key] = (self.clock() + self.ttl_seconds, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+
+# Shared by every repository in the process
+count_cache = CountCache(settings.count_cache_ttl_seconds, settings.count_cache_size)
+
 
 class BaseRepository(Generic[ModelType]):
     """Base repository with common database operations."""
 
+    # Re-SELECT written objects after each flush. Mappers already fetch
+    # server defaults with RETURNING, so this is only needed for values set
+    # by the database outside the statement itself (e.g. triggers).
+    refresh_on_write = False
+
     def __init__(self, model: Type[ModelType], db: AsyncSession):
         """
         Initialize repository.
@@ -40,13 +125,7 @@ class BaseRepository(Generic[ModelType]):
         filters: Optional[dict] = None
     ) -> List[ModelType]:
         """Get multiple records with pagination."""
-        query = select(self.model)
-        
-        if filters:
-            for key, value in filters.items():
-                if value is not None and hasattr(self.model, key):
-                    query = query.where(getattr(self.model, key) == value)
-        
+        query = self._apply_filters(select(self.model), filters)
         query = query.offset(skip).limit(limit)
         result = await self.db.execute(query)
         return list(result.scalars().all())
@@ -55,10 +134,64 @@ class BaseRepository(Generic[ModelType]):
         """Create new record."""
         db_obj = self.model(**obj_in)
         self.db.add(db_obj)
-        await self.db.flush()
-        await self.db.refresh(db_obj)
+        await self._flush(db_obj)
         return db_obj
 
+    async def bulk_create(self, rows: List[dict]) -> List[ModelType]:
+        """
+        Insert many records in one statement.
+
+        The rows are sent as batched multi-row ``INSERT ... RETURNING``, so
+        server defaults come back with the insert and no per-row refresh is
+        needed. Returns the objects in the order of ``rows``.
+        """
+        if not rows:
+            return []
+        result = await self.db.execute(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True), rows
+        )
+        return list(result.scalars().all())
+
+    async def bulk_update(self, rows: List[dict]) -> None:
+        """
+        Update many records by primary key in one executemany round trip.
+
+        Each row holds ``id`` plus the columns to set; rows may set different
+        columns. Objects already loaded in the session are not refreshed.
+        """
+        if rows:
+            await self.db.execute(update(self.model), rows)
+
+    async def bulk_upsert(
+        self,
+        rows: List[dict],
+        index_elements: Sequence[str],
+        update_columns: Optional[Sequence[str]] = None,
+    ) -> List[ModelType]:
+        """
+        ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` for many records.
+
+        On a conflict on ``index_elements`` the ``update_columns`` (by default
+        every other column given in the rows) take the new values, and
+        ``updated_at`` is bumped if the model has one. Returns the inserted or
+        updated objects in the order of ``rows``.
+        """
+        if not rows:
+            return []
+        if update_columns is None:
+            update_columns = [key for key in rows[0] if key not in index_elements]
+        stmt = pg_insert(self.model)
+        set_ = {column: stmt.excluded[column] for column in update_columns}
+        if "updated_at" in self.model.__table__.c and "updated_at" not in set_:
+            set_["updated_at"] = func.now()
+        stmt = stmt.on_conflict_do_update(index_elements=list(index_elements), set_=set_)
+        result = await self.db.execute(
+            stmt.returning(self.model, sort_by_parameter_order=True),
+            rows,
+            execution_options={"populate_existing": True},
+        )
+        return list(result.scalars().all())
+
     async def update(self, id: UUID, obj_in: dict) -> Optional[ModelType]:
         """Update existing record."""
         db_obj = await self.get(id)
@@ -69,10 +202,16 @@ class BaseRepository(Generic[ModelType]):
             if value is not None and hasattr(db_obj, field):
                 setattr(db_obj, field, value)
         
-        await self.db.flush()
-        await self.db.refresh(db_obj)
+        await self._flush(db_obj)
         return db_obj
 
+    async def _flush(self, *objs: Any) -> None:
+        """Flush pending writes; with ``refresh_on_write``, also reload ``objs``."""
+        await self.db.flush()
+        if self.refresh_on_write:
+            for obj in objs:
+                await self.db.refresh(obj)
+
     async def delete(self, id: UUID) -> bool:
         """Delete record by ID."""
         db_obj = await self.get(id)
@@ -83,16 +222,58 @@ class BaseRepository(Generic[ModelType]):
         await self.db.flush()
         return True
 
-    async def count(self, filters: Optional[dict] = None) -> int:
-        """Count records with optional filters."""
-        from sqlalchemy import func
-        
-        query = select(func.count()).select_from(self.model)
-        
+    def _apply_filters(self, query: Select, filters: Optional[dict]) -> Select:
+        """Add an equality condition per non-None filter naming a model column."""
         if filters:
             for key, value in filters.items():
                 if value is not None and hasattr(self.model, key):
                     query = query.where(getattr(self.model, key) == value)
-        
+        return query
+
+    async def count(self, filters: Optional[dict] = None) -> int:
+        """Count records with optional filters."""
+        query = self._apply_filters(select(func.count()).select_from(self.model), filters)
         result = await self.db.execute(query)
         return result.scalar_one()
+
+    async def estimate_count(self, filters: Optional[dict] = None) -> int:
+        """
+        Planner estimate of the row count, without scanning.
+
+        Unfiltered, this reads ``pg_class.reltuples``; filtered, the row
+        estimate of ``EXPLAIN`` for the filtered select. Estimates follow the
+        last ``ANALYZE``, so they can be off by a few percent. Falls back to
+        ``count`` if the table has never been analysed.
+        """
+        active = {key: value for key, value in (filters or {}).items() if value is not None}
+        if not active:
+            result = await self.db.execute(_TABLE_ESTIMATE, {"table": self.model.__tablename__})
+            estimate = result.scalar_one_or_none()
+            if estimate is None:
+                return await self.count()
+            return int(estimate)
+
+        query = self._apply_filters(select(self.model.id), active)
+        raw = (await self.db.execute(_Explain(query))).scalar_one()
+        plan = orjson.loads(raw) if isinstance(raw, (str, bytes)) else raw
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    async def cached_count(self, filters: Optional[dict] = None) -> int:
+        """Exact count, reused across requests for ``count_cache_ttl_seconds``."""
+        active = {key: value for key, value in (filters or {}).items() if value is not None}
+        key = (self.model.__tablename__, tuple(sorted((k, str(v)) for k, v in active.items())))
+        total = count_cache.get(key)
+        if total is None:
+            total = await self.count(active)
+            count_cache.set(key, total)
+        return total
+
+    async def total(self, filters: Optional[dict] = None, mode: str = EXACT) -> int:
+        """Total for a listing, computed as ``mode`` (exact, estimate or cached) asks."""
+        if mode == ESTIMATE:
+            return await self.estimate_count(filters)
+        if mode == CACHED:
+            return await self.cached_count(filters)
+        if mode == EXACT:
+            return await self.count(filters)
+        raise ValueError(f"Unknown total mode: {mode}")
@@ -0,0 +1,118 @@
+"""Embedding repository for vector similarity queries."""
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.embedding import EntryEmbedding, SolutionEmbedding
+from app.models.entry import Entry
+from app.repositories.base import BaseRepository
+from app.repositories.entry_repo import search_filters
+
+# pgvector's upper bound for hnsw.ef_search
+HNSW_MAX_EF_SEARCH = 1000
+
+
+class EmbeddingRepository:
+    """Repository for approximate nearest-neighbour search over embeddings."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.entry_embeddings = BaseRepository(EntryEmbedding, db)
+        self.solution_embeddings = BaseRepository(SolutionEmbedding, db)
+
+    async def set_ef_search(self, ef_search: Optional[int] = None) -> None:
+        """Set the HNSW candidate list size for the current transaction."""
+        value = ef_search or settings.hnsw_ef_search
+        await self.db.execute(
+            select(func.set_config("hnsw.ef_search", str(value), True))
+        )
+
+    async def search_entries(
+        self,
+        query_vector: List[float],
+        *,
+        limit: int = 20,
+        ef_search: Optional[int] = None,
+        severity: Optional[str] = None,
+        workflow_state: Optional[str] = None,
+    ) -> List[Tuple[UUID, float]]:
+        """
+        Return (entry_id, cosine_distance) pairs nearest to the query vector.
+
+        Only entries passing the search filters are returned (see
+        ``search_filters``). HNSW applies the filter to the ``ef_search``
+        candidates it visits, so a severity or workflow-state filter widens
+        the scan to pgvector's maximum to still fill ``limit``.
+        """
+        if ef_search is None and (severity or workflow_state):
+            ef_search = max(settings.hnsw_ef_search, HNSW_MAX_EF_SEARCH)
+        await self.set_ef_search(ef_search)
+        distance = EntryEmbedding.embedding.cosine_distance(query_vector)
+        result = await self.db.execute(
+            select(EntryEmbedding.entry_id, distance.label("distance"))
+            .join(Entry, Entry.id == EntryEmbedding.entry_id)
+            .where(EntryEmbedding.model_name == settings.embedding_model)
+            .where(*search_filters(severity, workflow_state))
+            .order_by(distance)
+            .limit(limit)
+        )
+        return [(row.entry_id, row.distance) for row in result.all()]
+
+    async def search_solutions(
+        self,
+        query_vector: List[float],
+        *,
+        limit: int = 20,
+        ef_search: Optional[int] = None,
+    ) -> List[Tuple[UUID, float]]:
+        """Return (solution_id, cosine_distance) pairs nearest to the query vector."""
+        await self.set_ef_search(ef_search)
+        distance = SolutionEmbedding.embedding.cosine_distance(query_vector)
+        result = await self.db.execute(
+            select(SolutionEmbedding.solution_id, distance.label("distance"))
+            .where(SolutionEmbedding.model_name == settings.embedding_model)
+            .order_by(distance)
+            .limit(limit)
+        )
+        return [(row.solution_id, row.distance) for row in result.all()]
+
+    async def upsert_entry_embeddings(self, rows: List[dict]) -> List[EntryEmbedding]:
+        """Insert or replace the embedding for each (entry_id, model_name) in one statement."""
+        return await self.entry_embeddings.bulk_upsert(rows, ["entry_id", "model_name"])
+
+    async def upsert_solution_embeddings(self, rows: List[dict]) -> List[SolutionEmbedding]:
+        """Insert or replace the embedding for each (solution_id, model_name) in one statement."""
+        return await self.solution_embeddings.bulk_upsert(rows, ["solution_id", "model_name"])
+
+    async def delete_entry_embeddings(self, entry_ids: List[UUID]) -> None:
+        """Delete the embeddings of the given entries, for every model, in one statement."""
+        if entry_ids:
+            await self.db.execute(delete(EntryEmbedding).where(EntryEmbedding.entry_id.in_(entry_ids)))
+
+    async def delete_solution_embeddings(self, solution_ids: List[UUID]) -> None:
+        """Delete the embeddings of the given solutions, for every model, in one statement."""
+        if solution_ids:
+            await self.db.execute(
+                delete(SolutionEmbedding).where(SolutionEmbedding.solution_id.in_(solution_ids))
+            )
+
+    async def get_entry_hashes(self, entry_ids: List[UUID]) -> Dict[UUID, Optional[str]]:
+        """Content hash of the stored embedding per entry for the current model."""
+        return await self._latest_hashes(EntryEmbedding, EntryEmbedding.entry_id, entry_ids)
+
+    async def get_solution_hashes(self, solution_ids: List[UUID]) -> Dict[UUID, Optional[str]]:
+        """Content hash of the stored embedding per solution for the current model."""
+        return await self._latest_hashes(SolutionEmbedding, SolutionEmbedding.solution_id, solution_ids)
+
+    async def _latest_hashes(self, model, id_column, ids: List[UUID]) -> Dict[UUID, Optional[str]]:
+        if not ids:
+            return {}
+        result = await self.db.execute(
+            select(id_column, model.content_hash)
+            .where(id_column.in_(ids))
+            .where(model.model_name == settings.embedding_model)
+        )
+        return {row[0]: row[1] for row in result.all()}
@@ -1,13 +1,31 @@
 """Entry repository for database operations."""
-from typing import List, Optional
+from typing import List, Optional, Set
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import func, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.models.entry import Entry, EntryIncident, EntrySymptom
+from app.models.entry import UNSEARCHABLE_STATES, Entry, EntryIncident, EntrySymptom
 from app.repositories.base import BaseRepository
+from app.utils.pagination import Keyset
+
+
+def search_filters(severity: Optional[str] = None, workflow_state: Optional[str] = None) -> list:
+    """
+    WHERE clauses on ``Entry`` for the search filters.
+
+    Retired and merged entries are excluded unless a workflow state is
+    asked for explicitly.
+    """
+    clauses = []
+    if severity:
+        clauses.append(Entry.severity == severity)
+    if workflow_state:
+        clauses.append(Entry.workflow_state == workflow_state)
+    else:
+        clauses.append(Entry.workflow_state.not_in(UNSEARCHABLE_STATES))
+    return clauses
 
 
 class EntryRepository(BaseRepository[Entry]):
@@ -30,6 +48,39 @@ class EntryRepository(BaseRepository[Entry]):
         )
         return result.scalar_one_or_none()
 
+    async def get_by_ids(self, ids: List[UUID]) -> List[Entry]:
+        """Get entries by ID in a single query (order not preserved)."""
+        if not ids:
+            return []
+        result = await self.db.execute(select(Entry).where(Entry.id.in_(ids)))
+        return list(result.scalars().all())
+
+    async def filter_searchable_ids(
+        self,
+        ids: List[UUID],
+        *,
+        severity: Optional[str] = None,
+        workflow_state: Optional[str] = None,
+    ) -> Set[UUID]:
+        """IDs among ``ids`` whose entry passes the search filters."""
+        if not ids:
+            return set()
+        result = await self.db.execute(
+            select(Entry.id).where(Entry.id.in_(ids), *search_filters(severity, workflow_state))
+        )
+        return set(result.scalars().all())
+
+    async def get_many_with_symptoms(self, ids: List[UUID]) -> List[Entry]:
+        """Get entries with symptoms eager-loaded, for bulk indexing."""
+        if not ids:
+            return []
+        result = await self.db.execute(
+            select(Entry)
+            .where(Entry.id.in_(ids))
+            .options(selectinload(Entry.symptoms))
+        )
+        return list(result.scalars().all())
+
     async def get_multi_with_filters(
         self,
         *,
@@ -38,8 +89,16 @@ class EntryRepository(BaseRepository[Entry]):
         workflow_state: Optional[str] = None,
         severity: Optional[str] = None,
         created_by: Optional[str] = None,
+        after: Optional[Keyset] = None,
     ) -> List[Entry]:
-        """Get entries with filters."""
+        """
+        Get entries with filters, newest first.
+
+        With ``after`` (the ``(created_at, id)`` of the previous page's last
+        row) the page starts with a keyset seek on the composite
+        ``(<filters>, created_at, id)`` indexes instead of skipping rows, so
+        every page costs the same. ``skip`` is kept for offset clients.
+        """
         query = select(Entry)
 
         if workflow_state:
@@ -49,43 +108,51 @@ class EntryRepository(BaseRepository[Entry]):
         if created_by:
             query = query.where(Entry.created_by == created_by)
 
-        query = query.order_by(Entry.created_at.desc()).offset(skip).limit(limit)
+        if after is not None:
+            query = query.where(tuple_(Entry.created_at, Entry.id) < tuple_(*after))
+
+        # id breaks created_at ties so pages never overlap or skip rows
+        query = query.order_by(Entry.created_at.desc(), Entry.id.desc()).limit(limit)
+        if skip:
+            query = query.offset(skip)
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
     async def create_with_symptoms(
         self, entry_data: dict, symptoms: Optional[List[dict]] = None
     ) -> Entry:
-        """Create entry with symptoms in one transaction."""
-        entry = Entry(**entry_data)
-        self.db.add(entry)
-        await self.db.flush()
-
+        """Create entry with symptoms in one transaction, in two statements however many symptoms."""
+        [entry] = await self.bulk_create([entry_data])
         if symptoms:
-            for symptom_data in symptoms:
-                symptom = EntrySymptom(entry_id=entry.id, **symptom_data)
-                self.db.add(symptom)
-
-        await self.db.flush()
-        await self.db.refresh(entry)
+            await BaseRepository(EntrySymptom, self.db).bulk_create(
+                [{**symptom_data, "entry_id": entry.id} for symptom_data in symptoms]
+            )
         return entry
 
     async def add_symptom(self, entry_id: UUID, symptom_data: dict) -> EntrySymptom:
         """Add symptom to entry."""
         symptom = EntrySymptom(entry_id=entry_id, **symptom_data)
         self.db.add(symptom)
-        await self.db.flush()
-        await self.db.refresh(symptom)
+        await self._flush(symptom)
         return symptom
 
     async def add_incident(self, entry_id: UUID, incident_data: dict) -> EntryIncident:
         """Link incident to entry."""
         incident = EntryIncident(entry_id=entry_id, **incident_data)
         self.db.add(incident)
-        await self.db.flush()
-        await self.db.refresh(incident)
+        await self._flush(incident)
         return incident
 
+    async def touch(self, id: UUID) -> None:
+        """Set ``updated_at`` to now, marking the entry changed for indexing."""
+        await self.db.execute(update(Entry).where(Entry.id == id).values(updated_at=func.now()))
+
+    async def add_incidents(self, entry_id: UUID, incidents: List[dict]) -> List[EntryIncident]:
+        """Link many incidents to entry in one statement."""
+        return await BaseRepository(EntryIncident, self.db).bulk_create(
+            [{**incident_data, "entry_id": entry_id} for incident_data in incidents]
+        )
+
     async def update_workflow_state(self, id: UUID, new_state: str, approved_by: Optional[str] = None) -> Optional[Entry]:
         """Update entry workflow state."""
         entry = await self.get(id)
@@ -98,6 +165,5 @@ class EntryRepository(BaseRepository[Entry]):
             from datetime import datetime, timezone
             entry.approved_at = datetime.now(timezone.utc)
 
-        await self.db.flush()
-        await self.db.refresh(entry)
+        await self._flush(entry)
         return entry
@@ -0,0 +1,79 @@
+"""Index watermark repository for drift detection."""
+from datetime import datetime
+from typing import Iterable, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, and_, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.entry import UNSEARCHABLE_STATES, Entry
+from app.models.index_watermark import IndexWatermark
+from app.models.solution import Solution
+
+MEILISEARCH = "meilisearch"
+EMBEDDING = "embedding"
+
+# Entity type -> model whose updated_at is tracked
+TRACKED_MODELS = {
+    "entries": Entry,
+    "solutions": Solution,
+}
+
+
+class IndexWatermarkRepository:
+    """Repository for recording indexed versions and finding stale entities."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record(
+        self, entity_type: str, backend: str, versions: Iterable[Tuple[UUID, datetime]]
+    ) -> None:
+        """Upsert the indexed ``updated_at`` for each entity in one statement."""
+        rows = [
+            {"entity_type": entity_type, "backend": backend, "entity_id": entity_id, "source_updated_at": updated_at}
+            for entity_id, updated_at in versions
+        ]
+        if not rows:
+            return
+        stmt = insert(IndexWatermark)
+        stmt = stmt.on_conflict_do_update(
+            constraint="pk_index_watermarks",
+            set_={"source_updated_at": stmt.excluded.source_updated_at, "indexed_at": func.now()},
+        )
+        await self.db.execute(stmt, rows)
+
+    def stale_ids_query(self, entity_type: str, backend: str) -> Select:
+        """
+        IDs whose row changed after (or was never) written to ``backend``.
+
+        One anti-join against the watermark table, ordered for streaming.
+        """
+        model = TRACKED_MODELS[entity_type]
+        watermark = and_(
+            IndexWatermark.entity_type == entity_type,
+            IndexWatermark.backend == backend,
+            IndexWatermark.entity_id == model.id,
+        )
+        return (
+            select(model.id)
+            .outerjoin(IndexWatermark, watermark)
+            .where(
+                (IndexWatermark.entity_id.is_(None))
+                | (IndexWatermark.source_updated_at < model.updated_at)
+            )
+            .order_by(model.id)
+        )
+
+    def searchable_ids_query(self, entity_type: str) -> Select:
+        """IDs that belong in the search indexes: not retired or merged (via the parent entry)."""
+        if entity_type == "entries":
+            query = select(Entry.id).where(Entry.workflow_state.not_in(UNSEARCHABLE_STATES))
+        else:
+            query = (
+                select(Solution.id)
+                .join(Entry, Solution.entry_id == Entry.id)
+                .where(Entry.workflow_state.not_in(UNSEARCHABLE_STATES))
+            )
+        return query
@@ -0,0 +1,70 @@
+"""Outbox repository for recording and claiming pending events."""
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.entry import Entry
+from app.models.outbox import OutboxEvent
+from app.models.solution import Solution
+from app.repositories.base import BaseRepository
+
+
+class OutboxRepository(BaseRepository[OutboxEvent]):
+    """Repository for OutboxEvent operations."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(OutboxEvent, db)
+
+    def add(
+        self,
+        event_type: str,
+        aggregate_type: str,
+        aggregate_id: UUID,
+        payload: Optional[dict] = None,
+    ) -> OutboxEvent:
+        """Stage an event in the caller's transaction; it is written on the next flush."""
+        event = OutboxEvent(
+            event_type=event_type,
+            aggregate_type=aggregate_type,
+            aggregate_id=aggregate_id,
+            payload=payload,
+        )
+        self.db.add(event)
+        return event
+
+    async def claim_batch(self, limit: int) -> List[OutboxEvent]:
+        """
+        Lock up to ``limit`` of the oldest events for this transaction.
+
+        ``SKIP LOCKED`` lets several dispatchers drain the table concurrently
+        without waiting on, or double-claiming, each other's rows.
+        """
+        result = await self.db.execute(
+            select(OutboxEvent)
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars().all())
+
+    async def delete_many(self, ids: List[int]) -> None:
+        """Remove delivered events."""
+        if ids:
+            await self.db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(ids)))
+
+    async def aggregate_severities(self, aggregate_type: str, ids: List[UUID]) -> Dict[UUID, str]:
+        """Severity of each aggregate's entry (a solution inherits its parent's)."""
+        if not ids:
+            return {}
+        if aggregate_type == "entries":
+            query = select(Entry.id, Entry.severity).where(Entry.id.in_(ids))
+        else:
+            query = (
+                select(Solution.id, Entry.severity)
+                .join(Entry, Solution.entry_id == Entry.id)
+                .where(Solution.id.in_(ids))
+            )
+        result = await self.db.execute(query)
+        return {row[0]: row[1] for row in result.all()}
@@ -38,26 +38,19 @@ class ReviewRepository(BaseRepository[Review]):
     async def create_with_participants(
         self, review_data: dict, participants: Optional[List[dict]] = None
     ) -> Review:
-        """Create review with participants in one transaction."""
-        review = Review(**review_data)
-        self.db.add(review)
-        await self.db.flush()
-
+        """Create review with participants in one transaction, in two statements however many participants."""
+        [review] = await self.bulk_create([review_data])
         if participants:
-            for participant_data in participants:
-                participant = ReviewParticipant(review_id=review.id, **participant_data)
-                self.db.add(participant)
-
-        await self.db.flush()
-        await self.db.refresh(review)
+            await BaseRepository(ReviewParticipant, self.db).bulk_create(
+                [{**participant_data, "review_id": review.id} for participant_data in participants]
+            )
         return review
 
     async def add_participant(self, review_id: UUID, participant_data: dict) -> ReviewParticipant:
         """Add participant to review."""
         participant = ReviewParticipant(review_id=review_id, **participant_data)
         self.db.add(participant)
-        await self.db.flush()
-        await self.db.refresh(participant)
+        await self._flush(participant)
         return participant
 
     async def update_status(self, id: UUID, new_status: str) -> Optional[Review]:
@@ -67,8 +60,7 @@ class ReviewRepository(BaseRepository[Review]):
             return None
 
         review.status = new_status
-        await self.db.flush()
-        await self.db.refresh(review)
+        await self._flush(review)
         return review
 
     async def approve_by_participant(self, review_id: UUID, user_id: str) -> Optional[ReviewParticipant]:
@@ -85,6 +77,5 @@ class ReviewRepository(BaseRepository[Review]):
 
         from datetime import datetime, timezone
         participant.approved_at = datetime.now(timezone.utc)
-        await self.db.flush()
-        await self.db.refresh(participant)
+        await self._flush(participant)
         return participant
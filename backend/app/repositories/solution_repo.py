@@ -2,7 +2,7 @@
 from typing import List, Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -25,6 +25,28 @@ class SolutionRepository(BaseRepository[Solution]):
         )
         return result.scalar_one_or_none()
 
+    async def get_many_with_steps(self, ids: List[UUID]) -> List[Solution]:
+        """Get solutions with steps and parent entry eager-loaded, for bulk indexing."""
+        if not ids:
+            return []
+        result = await self.db.execute(
+            select(Solution)
+            .where(Solution.id.in_(ids))
+            .options(selectinload(Solution.steps), selectinload(Solution.entry))
+        )
+        return list(result.scalars().all())
+
+    async def get_by_entries_with_steps(self, entry_ids: List[UUID]) -> List[Solution]:
+        """Get every solution of the given entries with steps and parent entry eager-loaded."""
+        if not entry_ids:
+            return []
+        result = await self.db.execute(
+            select(Solution)
+            .where(Solution.entry_id.in_(entry_ids))
+            .options(selectinload(Solution.steps), selectinload(Solution.entry))
+        )
+        return list(result.scalars().all())
+
     async def get_by_entry(self, entry_id: UUID) -> List[Solution]:
         """Get all solutions for an entry."""
         result = await self.db.execute(
@@ -38,26 +60,23 @@ class SolutionRepository(BaseRepository[Solution]):
     async def create_with_steps(
         self, solution_data: dict, steps: Optional[List[dict]] = None
     ) -> Solution:
-        """Create solution with steps in one transaction."""
-        solution = Solution(**solution_data)
-        self.db.add(solution)
-        await self.db.flush()
-
+        """Create solution with steps in one transaction, in two statements however many steps."""
+        [solution] = await self.bulk_create([solution_data])
         if steps:
-            for step_data in steps:
-                step = SolutionStep(solution_id=solution.id, **step_data)
-                self.db.add(step)
-
-        await self.db.flush()
-        await self.db.refresh(solution)
+            await BaseRepository(SolutionStep, self.db).bulk_create(
+                [{**step_data, "solution_id": solution.id} for step_data in steps]
+            )
         return solution
 
+    async def touch(self, id: UUID) -> None:
+        """Set ``updated_at`` to now, marking the solution changed for indexing."""
+        await self.db.execute(update(Solution).where(Solution.id == id).values(updated_at=func.now()))
+
     async def add_step(self, solution_id: UUID, step_data: dict) -> SolutionStep:
         """Add step to solution."""
         step = SolutionStep(solution_id=solution_id, **step_data)
         self.db.add(step)
-        await self.db.flush()
-        await self.db.refresh(step)
+        await self._flush(step)
         return step
 
     async def get_step(self, step_id: UUID) -> Optional[SolutionStep]:
@@ -77,8 +96,7 @@ class SolutionRepository(BaseRepository[Solution]):
             if hasattr(step, field):
                 setattr(step, field, value)
 
-        await self.db.flush()
-        await self.db.refresh(step)
+        await self._flush(step)
         return step
 
     async def delete_step(self, step_id: UUID) -> bool:
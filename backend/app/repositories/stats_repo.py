@@ -0,0 +1,128 @@
+"""Stats repository: single-pass entry aggregates and the materialized dashboard view."""
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import String, case, cast, func, literal, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.entry import Entry, EntryStatus, SeverityLevel, WorkflowState
+from app.models.tag import EntryTag, Tag
+
+STATS_VIEW = "entry_stats"
+RECENT_DAYS = 30
+
+# (dimension, value, entries, recent) rows
+StatsRows = List[Tuple[str, str, int, int]]
+
+
+def entry_stats_query():
+    """
+    Every dashboard count in one scan of ``entries``.
+
+    ``GROUPING SETS`` yields one row per severity, workflow state and status
+    plus a grand total; ``GROUPING()`` tells which set a row belongs to.
+    The ``entry_stats`` materialized view is defined by the same query.
+    """
+    dimension = case(
+        (func.grouping(Entry.severity) == 0, literal("severity")),
+        (func.grouping(Entry.workflow_state) == 0, literal("workflow_state")),
+        (func.grouping(Entry.status) == 0, literal("status")),
+        else_=literal("total"),
+    )
+    value = func.coalesce(
+        cast(Entry.severity, String),
+        cast(Entry.workflow_state, String),
+        cast(Entry.status, String),
+        "",
+    )
+    recent = func.count().filter(Entry.created_at >= func.now() - text(f"interval '{RECENT_DAYS} days'"))
+    return select(
+        dimension.label("dimension"),
+        value.label("value"),
+        func.count().label("entries"),
+        recent.label("recent"),
+    ).group_by(
+        func.grouping_sets(
+            tuple_(Entry.severity), tuple_(Entry.workflow_state), tuple_(Entry.status), tuple_()
+        )
+    )
+
+
+# Dimension -> enum whose member names are the Postgres enum labels
+_DIMENSIONS = {"severity": SeverityLevel, "workflow_state": WorkflowState, "status": EntryStatus}
+
+
+def summarize(rows: StatsRows) -> dict:
+    """Dashboard payload from aggregate rows; absent values count as zero."""
+    counts: Dict[str, Dict[str, int]] = {dimension: {} for dimension in _DIMENSIONS}
+    total = recent = 0
+    for dimension, label, entries, recent_entries in rows:
+        if dimension == "total":
+            total, recent = entries, recent_entries
+        else:
+            enum = _DIMENSIONS[dimension]
+            value = enum[label].value if label in enum.__members__ else label
+            counts[dimension][value] = entries
+
+    severity = {level.value: counts["severity"].get(level.value, 0) for level in SeverityLevel}
+    workflow = {state.value: counts["workflow_state"].get(state.value, 0) for state in WorkflowState}
+    status = {s.value: counts["status"].get(s.value, 0) for s in EntryStatus}
+    return {
+        "total_entries": total,
+        "active_entries": status[EntryStatus.ACTIVE.value],
+        "archived_entries": status[EntryStatus.ARCHIVED.value],
+        "critical_entries": severity[SeverityLevel.CRITICAL.value],
+        "recent_entries": recent,
+        "severity_distribution": severity,
+        "workflow_distribution": workflow,
+        "status_distribution": status,
+    }
+
+
+class StatsRepository:
+    """Repository for dashboard aggregates."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def entry_counts(self) -> StatsRows:
+        """Aggregate rows computed live in one query."""
+        result = await self.db.execute(entry_stats_query())
+        return [tuple(row) for row in result.all()]
+
+    async def entry_counts_from_view(self) -> Tuple[StatsRows, Optional[datetime]]:
+        """Aggregate rows from the materialized view, with the time it was refreshed."""
+        result = await self.db.execute(
+            text(f"SELECT dimension, value, entries, recent, refreshed_at FROM {STATS_VIEW}")
+        )
+        rows = result.all()
+        refreshed_at = min((row.refreshed_at for row in rows), default=None)
+        return [tuple(row[:4]) for row in rows], refreshed_at
+
+    async def refresh_view(self) -> bool:
+        """
+        ``REFRESH MATERIALIZED VIEW CONCURRENTLY`` unless another session is refreshing.
+
+        Readers keep seeing the previous contents while it runs. A transaction
+        advisory lock makes concurrent callers skip instead of queueing.
+        Returns whether this call refreshed.
+        """
+        locked = await self.db.execute(select(func.pg_try_advisory_xact_lock(func.hashtext(STATS_VIEW))))
+        if not locked.scalar_one():
+            return False
+        await self.db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {STATS_VIEW}"))
+        return True
+
+    async def top_tags(self, limit: int = 10) -> List[dict]:
+        """Most used tags with their usage counts."""
+        result = await self.db.execute(
+            select(Tag.id, Tag.name, Tag.color, func.count(EntryTag.id).label("count"))
+            .join(EntryTag, Tag.id == EntryTag.tag_id)
+            .group_by(Tag.id, Tag.name, Tag.color)
+            .order_by(func.count(EntryTag.id).desc())
+            .limit(limit)
+        )
+        return [
+            {"id": str(row[0]), "name": row[1], "color": row[2], "count": row[3]}
+            for row in result.all()
+        ]
@@ -40,18 +40,17 @@ class TagRepository(BaseRepository[Tag]):
         return list(result.scalars().all())
 
 
-class EntryTagRepository:
+class EntryTagRepository(BaseRepository[EntryTag]):
     """Repository for EntryTag relationship."""
 
     def __init__(self, db: AsyncSession):
-        self.db = db
+        super().__init__(EntryTag, db)
 
     async def add_tag_to_entry(self, entry_id: UUID, tag_id: UUID, added_by: str = "system") -> EntryTag:
         """Add tag to entry."""
         entry_tag = EntryTag(entry_id=entry_id, tag_id=tag_id, added_by=added_by)
         self.db.add(entry_tag)
-        await self.db.flush()
-        await self.db.refresh(entry_tag)
+        await self._flush(entry_tag)
         return entry_tag
 
     async def remove_tag_from_entry(self, entry_id: UUID, tag_id: UUID) -> bool:
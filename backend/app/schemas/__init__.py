@@ -31,6 +31,7 @@ from app.schemas.review import (
     ReviewUpdate,
     ReviewWithEntryResponse,
 )
+from app.schemas.search import ScoreBreakdown, SearchResponse, SearchResult
 from app.schemas.solution import (
     SolutionCreate,
     SolutionResponse,
@@ -67,6 +68,10 @@ __all__ = [
     "EntrySymptomResponse",
     "EntryIncidentCreate",
     "EntryIncidentResponse",
+    # Search
+    "ScoreBreakdown",
+    "SearchResult",
+    "SearchResponse",
     # Solution
     "SolutionCreate",
     "SolutionUpdate",
@@ -0,0 +1,32 @@
+"""Search schemas for hybrid retrieval responses."""
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.models.entry import SeverityLevel, WorkflowState
+
+
+class ScoreBreakdown(BaseModel):
+    """Per-backend score contributions (mirrors SuggestionEvent.score_breakdown)."""
+    bm25: Optional[float] = None
+    vector: Optional[float] = None
+    reranker: Optional[float] = None
+    final: float
+
+
+class SearchResult(BaseModel):
+    """Single fused search hit."""
+    entry_id: UUID
+    title: Optional[str] = None
+    severity: Optional[SeverityLevel] = None
+    workflow_state: Optional[WorkflowState] = None
+    score_breakdown: ScoreBreakdown
+
+
+class SearchResponse(BaseModel):
+    """Hybrid search response."""
+    query: str
+    results: List[SearchResult]
+    degraded_backends: List[str] = []
+    latency_ms: int
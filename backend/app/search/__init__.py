@@ -1,3 +1,27 @@
 """
-Search orchestration (Meilisearch, pgvector, re-ranker) module placeholder.
+Search orchestration (Meilisearch, pgvector, re-ranker).
 """
+from .hybrid import HybridSearchService, reciprocal_rank_fusion
+from .meilisearch import MeilisearchClient, get_meilisearch_client
+from .reranker import (
+    CrossEncoderScorer,
+    LexicalOverlapScorer,
+    MicroBatchReranker,
+    Scorer,
+    get_reranker,
+)
+from .vector_index import VectorIndex, get_vector_index
+
+__all__ = [
+    "CrossEncoderScorer",
+    "HybridSearchService",
+    "LexicalOverlapScorer",
+    "MeilisearchClient",
+    "MicroBatchReranker",
+    "Scorer",
+    "VectorIndex",
+    "get_meilisearch_client",
+    "get_reranker",
+    "get_vector_index",
+    "reciprocal_rank_fusion",
+]
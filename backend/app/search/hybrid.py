@@ -0,0 +1,293 @@
+"""Hybrid search: Meilisearch BM25 and pgvector cosine merged with reciprocal rank fusion."""
+import asyncio
+import time
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.models.entry import UNSEARCHABLE_STATES
+from app.repositories.embedding_repo import EmbeddingRepository
+from app.repositories.entry_repo import EntryRepository
+from app.search.meilisearch import MeilisearchClient, get_meilisearch_client
+from app.search.reranker import MicroBatchReranker, get_reranker
+from app.search.vector_index import get_vector_index
+from app.services.embedding_provider import get_embedding_provider
+
+
+def reciprocal_rank_fusion(
+    rankings: Dict[str, List[str]], k: int = 60
+) -> List[Tuple[str, Dict[str, float]]]:
+    """
+    Merge ranked ID lists with reciprocal rank fusion.
+
+    Each backend contributes ``1 / (k + rank)`` for every ID it returned
+    (rank is 1-based). Results are sorted by the summed contribution.
+
+    Args:
+        rankings: Backend name -> IDs ordered best first
+        k: Damping constant; larger values flatten the rank curve
+
+    Returns:
+        (id, {backend: contribution}) pairs, best first
+    """
+    contributions: Dict[str, Dict[str, float]] = {}
+    for backend, ids in rankings.items():
+        for rank, doc_id in enumerate(ids, start=1):
+            contributions.setdefault(doc_id, {})[backend] = 1.0 / (k + rank)
+
+    return sorted(
+        contributions.items(),
+        key=lambda item: sum(item[1].values()),
+        reverse=True,
+    )
+
+
+def meilisearch_filter(severity: Optional[str], workflow_state: Optional[str]) -> Optional[str]:
+    """Meilisearch filter expression for the optional entry-level filters."""
+    clauses = []
+    for field, value in (("severity", severity), ("workflow_state", workflow_state)):
+        if value:
+            escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+            clauses.append(f'{field} = "{escaped}"')
+    return " AND ".join(clauses) or None
+
+
+class HybridSearchService:
+    """Fan out to lexical and semantic backends concurrently and fuse the results."""
+
+    LEXICAL = "bm25"
+    VECTOR = "vector"
+    RERANKER = "reranker"
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        meilisearch: Optional[MeilisearchClient] = None,
+        reranker: Optional[MicroBatchReranker] = None,
+    ):
+        self.db = db
+        self.entry_repo = EntryRepository(db)
+        self.embedding_repo = EmbeddingRepository(db)
+        self.embedding_provider = get_embedding_provider()
+        self.meilisearch = meilisearch or get_meilisearch_client()
+        self.reranker = reranker or get_reranker()
+
+    async def search(
+        self,
+        query: str,
+        *,
+        limit: int = settings.suggestion_top_k,
+        severity: Optional[str] = None,
+        workflow_state: Optional[str] = None,
+    ) -> dict:
+        """
+        Run both backends under their own deadlines and return fused results.
+
+        With a reranker configured, the top ``rerank_candidates`` fused hits
+        are re-scored and re-ordered before truncating to ``limit``; if the
+        reranker fails or misses its deadline the fused order is kept.
+        """
+        started = time.perf_counter()
+        candidate_k = max(limit, settings.search_candidate_k)
+
+        lexical_ids, vector_ids = await asyncio.gather(
+            self._with_deadline(
+                self.LEXICAL,
+                self._lexical_search(query, candidate_k, meilisearch_filter(severity, workflow_state)),
+                settings.search_lexical_timeout_ms,
+            ),
+            self._with_deadline(
+                self.VECTOR,
+                self._vector_search(query, candidate_k, severity, workflow_state),
+                settings.search_vector_timeout_ms,
+            ),
+        )
+
+        degraded = []
+        rankings: Dict[str, List[str]] = {}
+        for backend, ids in ((self.LEXICAL, lexical_ids), (self.VECTOR, vector_ids)):
+            if ids is None:
+                degraded.append(backend)
+            else:
+                rankings[backend] = ids
+
+        if self.VECTOR in degraded:
+            # A cancelled query may leave the transaction aborted; reset it
+            # before hydrating results on the same session.
+            await self.db.rollback()
+
+        fused = reciprocal_rank_fusion(rankings, k=settings.rrf_k)
+        hydrate_k = max(limit, settings.rerank_candidates) if self.reranker else limit
+        hits = await self._hydrate(fused, hydrate_k, severity, workflow_state)
+
+        reranker_scores: List[Optional[float]] = [None] * len(hits)
+        if self.reranker and hits:
+            reranked = await self._with_deadline(
+                self.RERANKER,
+                self.reranker.rerank(query, [self._rerank_text(entry) for entry, _ in hits]),
+                settings.search_rerank_timeout_ms,
+            )
+            if reranked is None:
+                degraded.append(self.RERANKER)
+            else:
+                reranker_scores = reranked
+
+        results = [
+            self._to_result(entry, scores, reranker_score)
+            for (entry, scores), reranker_score in zip(hits, reranker_scores)
+        ]
+        # Stable sort: ties and the degraded case keep fused order
+        results.sort(key=lambda r: r["score_breakdown"]["final"], reverse=True)
+        results = results[:limit]
+
+        return {
+            "query": query,
+            "results": results,
+            "degraded_backends": degraded,
+            "latency_ms": int((time.perf_counter() - started) * 1000),
+        }
+
+    async def _with_deadline(
+        self, backend: str, coro: Awaitable[list], timeout_ms: int
+    ) -> Optional[list]:
+        """Await a backend call; return None instead of raising on timeout or error."""
+        try:
+            return await asyncio.wait_for(coro, timeout=timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            logger.warning(f"Search backend {backend} exceeded {timeout_ms}ms deadline")
+        except Exception as e:
+            logger.error(f"Search backend {backend} failed: {e}")
+        return None
+
+    async def _lexical_search(self, query: str, limit: int, filter: Optional[str] = None) -> List[str]:
+        """
+        BM25 ranking of entries from the entry and solution indexes.
+
+        Both indexes are queried in one multi-search round trip. A solution
+        hit stands in for its parent entry, and the two rankings are merged
+        by reciprocal rank so a command match can surface its entry.
+        """
+        base = {"q": query, "limit": limit}
+        if filter:
+            base["filter"] = filter
+        entry_result, solution_result = await self.meilisearch.multi_search([
+            {**base, "indexUid": "entries", "attributesToRetrieve": ["id"]},
+            {**base, "indexUid": "solutions", "attributesToRetrieve": ["entry_id"]},
+        ])
+
+        solution_entries = list(dict.fromkeys(hit["entry_id"] for hit in solution_result["hits"]))
+        merged = reciprocal_rank_fusion(
+            {"entries": [hit["id"] for hit in entry_result["hits"]], "solutions": solution_entries},
+            k=settings.rrf_k,
+        )
+        return [doc_id for doc_id, _ in merged]
+
+    async def _vector_search(
+        self,
+        query: str,
+        limit: int,
+        severity: Optional[str] = None,
+        workflow_state: Optional[str] = None,
+    ) -> List[str]:
+        """Cosine ranking of entries passing the filters, from pgvector or the in-process index."""
+        if not self.embedding_provider:
+            return []
+
+        query_vector = (await self.embedding_provider.embed([query]))[0]
+
+        if settings.vector_index_dir:
+            return await self._vector_index_search(query_vector, limit, severity, workflow_state)
+
+        neighbours = await self.embedding_repo.search_entries(
+            query_vector, limit=limit, severity=severity, workflow_state=workflow_state
+        )
+        return [str(entry_id) for entry_id, _ in neighbours]
+
+    async def _vector_index_search(
+        self,
+        query_vector: List[float],
+        limit: int,
+        severity: Optional[str],
+        workflow_state: Optional[str],
+    ) -> List[str]:
+        """
+        Top ``limit`` filtered entries from the in-process index.
+
+        The index holds vectors only, so candidates are checked against the
+        entries table and the scan is widened until ``limit`` pass or the
+        index is exhausted. Re-mapping the files and the BLAS scan are
+        blocking, so both run off the event loop.
+        """
+        index = get_vector_index("entries")
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, index.reload_if_changed)
+
+        k = limit
+        while True:
+            results = await loop.run_in_executor(None, index.search, query_vector, k)
+            candidates = [doc_id for doc_id, _ in results[0]]
+            allowed = await self.entry_repo.filter_searchable_ids(
+                [UUID(doc_id) for doc_id in candidates], severity=severity, workflow_state=workflow_state
+            )
+            hits = [doc_id for doc_id in candidates if UUID(doc_id) in allowed]
+            if len(hits) >= limit or k >= len(index):
+                return hits[:limit]
+            k *= 4
+
+    async def _hydrate(
+        self,
+        fused: List[Tuple[str, Dict[str, float]]],
+        limit: int,
+        severity: Optional[str],
+        workflow_state: Optional[str],
+    ) -> List[Tuple[Any, Dict[str, float]]]:
+        """
+        Load entries for fused IDs, apply filters and keep the top `limit` (entry, scores) pairs.
+
+        Retired and merged entries are skipped unless asked for by filter, which
+        covers the window before the indexer withdraws them and the append-only
+        in-process vector index.
+        """
+        entries = await self.entry_repo.get_by_ids([UUID(doc_id) for doc_id, _ in fused])
+        by_id = {str(entry.id): entry for entry in entries}
+
+        hits = []
+        for doc_id, scores in fused:
+            entry = by_id.get(doc_id)
+            if entry is None:
+                continue
+            if severity and entry.severity != severity:
+                continue
+            if workflow_state and entry.workflow_state != workflow_state:
+                continue
+            if not workflow_state and entry.workflow_state in UNSEARCHABLE_STATES:
+                continue
+
+            hits.append((entry, scores))
+            if len(hits) >= limit:
+                break
+
+        return hits
+
+    @staticmethod
+    def _rerank_text(entry) -> str:
+        """Document text the reranker scores against the query."""
+        return f"{entry.title}\n{entry.description}"
+
+    def _to_result(self, entry, scores: Dict[str, float], reranker_score: Optional[float]) -> dict:
+        fused_score = sum(scores.values())
+        return {
+            "entry_id": entry.id,
+            "title": entry.title,
+            "severity": entry.severity,
+            "workflow_state": entry.workflow_state,
+            "score_breakdown": {
+                "bm25": scores.get(self.LEXICAL),
+                "vector": scores.get(self.VECTOR),
+                "reranker": reranker_score,
+                "final": reranker_score if reranker_score is not None else fused_score,
+            },
+        }
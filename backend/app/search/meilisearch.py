@@ -0,0 +1,306 @@
+"""Pooled Meilisearch client with buffered, batched document writes."""
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+import httpx
+
+from app.core.config import settings
+from app.core.exceptions import SearchIndexError
+from app.core.logging import logger
+from app.core.metrics import span
+
+# Pending operation per document ID; the last write wins within a flush.
+_UPSERT = "upsert"
+_DELETE = "delete"
+
+# Per-index settings applied by configure_indexes()
+INDEX_SETTINGS: Dict[str, Dict[str, Any]] = {
+    "entries": {
+        "searchableAttributes": ["title", "symptoms", "description", "root_cause"],
+        "filterableAttributes": ["severity", "workflow_state", "created_by"],
+    },
+    "solutions": {
+        "searchableAttributes": ["title", "commands", "steps", "description", "prerequisites"],
+        "filterableAttributes": ["severity", "workflow_state", "entry_id", "solution_type"],
+    },
+}
+
+
+class MeilisearchClient:
+    """
+    Long-lived Meilisearch client sharing one pooled ``httpx.AsyncClient``.
+
+    ``queue_upsert``/``queue_delete`` buffer writes per index and send them as
+    one ``documents`` and one ``documents/delete-batch`` call per flush, so
+    Meilisearch processes a single task per batch instead of one per document.
+    Buffers flush when they reach ``batch_size``, every ``flush_interval_ms``
+    once ``start()`` has been called, and on ``aclose()``. Writes that fail
+    stay buffered for the next flush.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        *,
+        batch_size: int = 1000,
+        flush_interval_ms: int = 200,
+        timeout: float = 10.0,
+        max_concurrency: int = 20,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.batch_size = batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+
+        # Caps in-flight requests so a slow Meilisearch queues callers here
+        # instead of exhausting the pool or starving other downstreams.
+        self._requests = asyncio.Semaphore(max_concurrency)
+        self._http: Optional[httpx.AsyncClient] = None
+        self._pending: Dict[str, Dict[str, tuple]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(cls) -> "MeilisearchClient":
+        return cls(
+            str(settings.meilisearch_url),
+            settings.meilisearch_master_key,
+            batch_size=settings.meilisearch_batch_size,
+            flush_interval_ms=settings.meilisearch_flush_interval_ms,
+            max_concurrency=settings.meilisearch_max_concurrency,
+        )
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Pooled HTTP client, created on first use."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=min(self.max_concurrency, 10),
+                ),
+            )
+        return self._http
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        async with self._requests:
+            response = await self.http.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    async def start(self) -> None:
+        """Start the periodic background flush."""
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def aclose(self) -> None:
+        """Stop the background flush, send anything buffered and close the pool."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        try:
+            await self.flush()
+        except SearchIndexError as e:
+            logger.error(f"Dropping unsent Meilisearch writes on close: {e}")
+        finally:
+            if self._http is not None:
+                await self._http.aclose()
+                self._http = None
+
+    async def __aenter__(self) -> "MeilisearchClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_ms / 1000)
+            try:
+                await self.flush()
+            except SearchIndexError:
+                pass  # Logged by flush; the writes stay buffered for the next tick
+
+    # Buffered writes
+
+    async def queue_upsert(self, index: str, documents: Sequence[Dict[str, Any]]) -> None:
+        """Buffer documents for a batched upsert."""
+        pending = self._pending.setdefault(index, {})
+        for document in documents:
+            pending[str(document["id"])] = (_UPSERT, document)
+        await self._flush_if_full(index)
+
+    async def queue_delete(self, index: str, ids: Sequence[Any]) -> None:
+        """Buffer document IDs for a batched delete."""
+        pending = self._pending.setdefault(index, {})
+        for doc_id in ids:
+            pending[str(doc_id)] = (_DELETE, None)
+        await self._flush_if_full(index)
+
+    async def _flush_if_full(self, index: str) -> None:
+        if len(self._pending.get(index, {})) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self, wait: bool = False) -> List[int]:
+        """
+        Send every buffered write now.
+
+        Once this returns, Meilisearch has accepted every write buffered
+        before the call. Writes it could not take are put back in the buffer
+        (unless a newer write for the same document was queued meanwhile)
+        and ``SearchIndexError`` is raised, so callers never treat them as
+        indexed.
+
+        Args:
+            wait: Poll the resulting tasks until Meilisearch has applied them
+
+        Returns:
+            Meilisearch task UIDs that were enqueued
+        """
+        async with self._flush_lock:
+            pending, self._pending = self._pending, {}
+            task_uids = []
+            failures = []
+
+            for index, operations in pending.items():
+                for op, send in ((_UPSERT, self.add_documents), (_DELETE, self.delete_documents)):
+                    batch = {doc_id: item for doc_id, item in operations.items() if item[0] == op}
+                    if not batch:
+                        continue
+                    payload = [doc for _, doc in batch.values()] if op == _UPSERT else list(batch)
+                    try:
+                        with span("meilisearch_write"):
+                            task_uids.append(await send(index, payload))
+                    except Exception as e:
+                        logger.error(f"Failed to flush {len(batch)} {op}s to {index}: {e}")
+                        self._requeue(index, batch)
+                        failures.append(f"{len(batch)} {op}s to {index}")
+
+            if failures:
+                raise SearchIndexError(f"Meilisearch did not accept {', '.join(failures)}")
+
+        if wait:
+            await asyncio.gather(*(self.wait_for_task(uid) for uid in task_uids))
+        return task_uids
+
+    def _requeue(self, index: str, operations: Dict[str, tuple]) -> None:
+        pending = self._pending.setdefault(index, {})
+        for doc_id, item in operations.items():
+            pending.setdefault(doc_id, item)
+
+    # Direct calls
+
+    async def add_documents(self, index: str, documents: Sequence[Dict[str, Any]], wait: bool = False) -> int:
+        """Add or replace documents in one task."""
+        response = await self._request("POST", f"/indexes/{index}/documents", json=list(documents))
+        task_uid = response.json()["taskUid"]
+        logger.info(f"Queued {len(documents)} documents for {index} (task {task_uid})")
+        if wait:
+            await self.wait_for_task(task_uid)
+        return task_uid
+
+    async def delete_documents(self, index: str, ids: Sequence[Any], wait: bool = False) -> int:
+        """Delete documents by ID in one task."""
+        response = await self._request(
+            "POST",
+            f"/indexes/{index}/documents/delete-batch",
+            json=[str(doc_id) for doc_id in ids],
+        )
+        task_uid = response.json()["taskUid"]
+        logger.info(f"Queued delete of {len(ids)} documents from {index} (task {task_uid})")
+        if wait:
+            await self.wait_for_task(task_uid)
+        return task_uid
+
+    async def search(self, index: str, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Run a search query against one index."""
+        response = await self._request(
+            "POST",
+            f"/indexes/{index}/search",
+            json=payload,
+            timeout=timeout if timeout is not None else self.timeout,
+        )
+        return response.json()
+
+    async def multi_search(
+        self, queries: Sequence[Dict[str, Any]], timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Run several index queries in one round trip; results follow query order."""
+        response = await self._request(
+            "POST",
+            "/multi-search",
+            json={"queries": list(queries)},
+            timeout=timeout if timeout is not None else self.timeout,
+        )
+        return response.json()["results"]
+
+    async def document_count(self, index: str) -> int:
+        """Number of documents in an index (0 if it does not exist yet)."""
+        try:
+            response = await self._request("GET", f"/indexes/{index}/stats")
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return 0
+            raise
+        return response.json()["numberOfDocuments"]
+
+    async def iter_document_ids(self, index: str, page_size: int = 1000) -> AsyncIterator[str]:
+        """Yield every document ID in an index, one page per request."""
+        offset = 0
+        while True:
+            response = await self._request(
+                "GET",
+                f"/indexes/{index}/documents",
+                params={"fields": "id", "limit": page_size, "offset": offset},
+            )
+            results = response.json()["results"]
+            for document in results:
+                yield str(document["id"])
+            if len(results) < page_size:
+                return
+            offset += page_size
+
+    async def configure_indexes(self) -> List[int]:
+        """Apply ``INDEX_SETTINGS``; Meilisearch creates missing indexes on the fly."""
+        task_uids = []
+        for index, index_settings in INDEX_SETTINGS.items():
+            response = await self._request("PATCH", f"/indexes/{index}/settings", json=index_settings)
+            task_uids.append(response.json()["taskUid"])
+        return task_uids
+
+    async def wait_for_task(self, task_uid: int, timeout_ms: int = 5000, interval_ms: int = 50) -> Dict[str, Any]:
+        """Poll a task until it succeeds, fails or the timeout elapses."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_ms / 1000
+        while True:
+            response = await self._request("GET", f"/tasks/{task_uid}")
+            task = response.json()
+            if task["status"] in ("succeeded", "failed", "canceled"):
+                if task["status"] != "succeeded":
+                    logger.error(f"Meilisearch task {task_uid} {task['status']}: {task.get('error')}")
+                return task
+            if loop.time() >= deadline:
+                raise TimeoutError(f"Meilisearch task {task_uid} still {task['status']} after {timeout_ms}ms")
+            await asyncio.sleep(interval_ms / 1000)
+
+
+_client: Optional[MeilisearchClient] = None
+
+
+def get_meilisearch_client() -> MeilisearchClient:
+    """Process-wide client; its lifecycle is owned by the API lifespan."""
+    global _client
+    if _client is None:
+        _client = MeilisearchClient.from_settings()
+    return _client
@@ -0,0 +1,203 @@
+"""Re-ranking stage: pluggable (query, document) scorers behind a micro-batcher."""
+import asyncio
+import hashlib
+import math
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import List, Optional, Sequence, Set, Tuple
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.embedding_cache import LRUCache
+
+_TOKEN = re.compile(r"\w+")
+
+Pair = Tuple[str, str]
+
+
+class Scorer(ABC):
+    """Scores (query, document) pairs; higher is more relevant."""
+
+    @abstractmethod
+    async def score(self, pairs: Sequence[Pair]) -> List[float]:
+        """Score a batch of pairs; output order matches input order."""
+
+
+class LexicalOverlapScorer(Scorer):
+    """
+    Cheap local scorer for tests and CPU-only deployments.
+
+    Score is the fraction of distinct query terms present in the document,
+    plus a small bonus for term frequency normalised by document length.
+    """
+
+    async def score(self, pairs: Sequence[Pair]) -> List[float]:
+        return [self.score_one(query, document) for query, document in pairs]
+
+    @staticmethod
+    def score_one(query: str, document: str) -> float:
+        query_terms = set(_TOKEN.findall(query.lower()))
+        doc_tokens = _TOKEN.findall(document.lower())
+        if not query_terms or not doc_tokens:
+            return 0.0
+
+        matches = sum(1 for token in doc_tokens if token in query_terms)
+        coverage = len(query_terms & set(doc_tokens)) / len(query_terms)
+        return coverage + 0.1 * matches / math.sqrt(len(doc_tokens))
+
+
+class CrossEncoderScorer(Scorer):
+    """sentence-transformers cross-encoder (optional dependency), run off the event loop."""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import CrossEncoder
+
+        if "/" not in model_name:
+            model_name = f"cross-encoder/{model_name}"
+        self.model = CrossEncoder(model_name)
+
+    async def score(self, pairs: Sequence[Pair]) -> List[float]:
+        loop = asyncio.get_running_loop()
+        scores = await loop.run_in_executor(None, self.model.predict, list(pairs))
+        return [float(s) for s in scores]
+
+
+def _mark_retrieved(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+class MicroBatchReranker:
+    """
+    Coalesce concurrent rerank calls into scorer micro-batches.
+
+    Uncached pairs from every in-flight request join one queue. The queue is
+    scored when it reaches ``max_batch_size`` or ``max_wait_ms`` after the
+    first pair arrived, whichever comes first, so scorer cost grows with
+    batches rather than requests. Scores are kept in an LRU keyed by the
+    (query, document) text, and identical in-flight pairs share one future.
+    """
+
+    def __init__(
+        self,
+        scorer: Scorer,
+        *,
+        max_batch_size: int = 64,
+        max_wait_ms: int = 5,
+        cache_size: int = 10000,
+    ):
+        self.scorer = scorer
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.cache = LRUCache(cache_size)
+
+        self._pending: List[Tuple[str, Pair, asyncio.Future]] = []
+        self._inflight: dict = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def _key(query: str, document: str) -> str:
+        return hashlib.blake2b(f"{query}\0{document}".encode("utf-8"), digest_size=16).hexdigest()
+
+    async def rerank(self, query: str, documents: Sequence[str]) -> List[float]:
+        """Relevance score for each document against the query, in input order."""
+        scores: List[Optional[float]] = [None] * len(documents)
+        waiting = []
+        for i, document in enumerate(documents):
+            key = self._key(query, document)
+            cached = self.cache.get(key)
+            if cached is not None:
+                scores[i] = cached
+            else:
+                waiting.append((i, self._submit(key, (query, document))))
+
+        # Futures are shared with other requests for the same pair; shield
+        # them so a caller that times out does not cancel everyone else.
+        for i, future in waiting:
+            scores[i] = await asyncio.shield(future)
+        return scores
+
+    def _submit(self, key: str, pair: Pair) -> asyncio.Future:
+        future = self._inflight.get(key)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # A failed batch fails every waiter, but once one waiter has raised,
+        # later futures are never awaited; mark their errors as seen.
+        future.add_done_callback(_mark_retrieved)
+        self._inflight[key] = future
+        self._pending.append((key, pair, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._spawn_batch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._on_timer)
+        return future
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        if self._pending:
+            self._spawn_batch()
+
+    def _spawn_batch(self) -> None:
+        batch = self._pending[:self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+
+        if self._timer is not None and not self._pending:
+            self._timer.cancel()
+            self._timer = None
+        elif self._pending and self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._on_timer)
+
+        task = asyncio.create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, Pair, asyncio.Future]]) -> None:
+        try:
+            scores = await self.scorer.score([pair for _, pair, _ in batch])
+        except Exception as e:
+            for key, _, future in batch:
+                self._inflight.pop(key, None)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (key, _, future), score in zip(batch, scores):
+            self.cache.set(key, score)
+            self._inflight.pop(key, None)
+            if not future.done():
+                future.set_result(score)
+
+
+@lru_cache
+def get_reranker() -> Optional[MicroBatchReranker]:
+    """
+    Process-wide reranker for ``settings.reranker_backend`` (None when disabled).
+
+    If the cross-encoder is configured but sentence-transformers is not
+    installed, the error is logged once and the lexical scorer is used;
+    the fallback is cached like any other result.
+    """
+    if settings.reranker_backend == "lexical":
+        scorer: Scorer = LexicalOverlapScorer()
+    elif settings.reranker_backend == "cross-encoder":
+        try:
+            scorer = CrossEncoderScorer(settings.reranker_model)
+        except ImportError as e:
+            logger.error(f"Cross-encoder reranker unavailable, falling back to lexical scoring: {e}")
+            scorer = LexicalOverlapScorer()
+    else:
+        return None
+
+    return MicroBatchReranker(
+        scorer,
+        max_batch_size=settings.rerank_max_batch_size,
+        max_wait_ms=settings.rerank_max_wait_ms,
+        cache_size=settings.rerank_cache_size,
+    )
@@ -0,0 +1,316 @@
+"""In-process exact vector index backed by a memory-mapped NumPy matrix."""
+import asyncio
+import json
+import os
+from contextlib import nullcontext
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Sequence, Set, Tuple, Type, Union
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.models.embedding import EntryEmbedding, SolutionEmbedding
+
+# Rows scored per BLAS call; bounds the float32 working copy of a float16 matrix.
+SEARCH_BLOCK_ROWS = 65536
+
+
+def _to_numpy(value) -> np.ndarray:
+    """Convert a pgvector result (ndarray, HalfVector or list) to a float32 array."""
+    if hasattr(value, "to_numpy"):
+        value = value.to_numpy()
+    return np.asarray(value, dtype=np.float32)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalise rows so dot products are cosine similarities."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class VectorIndex:
+    """
+    Exact cosine-similarity index over one embedding table.
+
+    Vectors live in ``<name>.<token>.npy`` (opened with ``mmap_mode="r"``
+    so every worker process on the host shares the same page-cache pages).
+    ``<name>.ids.json`` names that file and holds the row -> ID map and the
+    refresh watermark, an ``(updated_at, id)`` keyset position so rows
+    sharing a timestamp with the last applied row are not skipped.
+    Every write goes to a new matrix file and the ID map is replaced by
+    rename, so readers never see a partial write or a map and matrix from
+    different versions, even after removed IDs are compacted out.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        name: str,
+        embedding_model: Type[Union[EntryEmbedding, SolutionEmbedding]],
+        id_column: str,
+        dtype: str = "float16",
+    ):
+        self.directory = Path(directory)
+        self.name = name
+        self.embedding_model = embedding_model
+        self.id_column = id_column
+        self.dtype = np.dtype(dtype)
+
+        self.matrix: Optional[np.ndarray] = None
+        self.ids: List[str] = []
+        self.watermark: Optional[datetime] = None
+        self.watermark_id: Optional[str] = None
+        self._loaded_mtime: Optional[float] = None
+
+    @classmethod
+    def for_entries(cls, directory: Union[str, Path], dtype: str = "float16") -> "VectorIndex":
+        return cls(directory, "entries", EntryEmbedding, "entry_id", dtype)
+
+    @classmethod
+    def for_solutions(cls, directory: Union[str, Path], dtype: str = "float16") -> "VectorIndex":
+        return cls(directory, "solutions", SolutionEmbedding, "solution_id", dtype)
+
+    @property
+    def legacy_matrix_file(self) -> str:
+        """Matrix file of indexes written before each write got its own file."""
+        return f"{self.name}.npy"
+
+    @property
+    def meta_path(self) -> Path:
+        return self.directory / f"{self.name}.ids.json"
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def load(self) -> None:
+        """Map the persisted matrix read-only; no-op if nothing was persisted yet."""
+        if not self.meta_path.exists():
+            return
+
+        meta = json.loads(self.meta_path.read_text())
+        self.ids = meta["ids"]
+        self.watermark = datetime.fromisoformat(meta["watermark"]) if meta["watermark"] else None
+        self.watermark_id = meta.get("watermark_id")
+        matrix_path = self.directory / meta.get("matrix", self.legacy_matrix_file)
+        # A legacy matrix file was rewritten in place with rows only ever
+        # appended, so trimming to the ID map keeps it consistent with it.
+        self.matrix = np.load(matrix_path, mmap_mode="r")[:len(self.ids)] if self.ids else None
+        self._loaded_mtime = self.meta_path.stat().st_mtime
+
+    def reload_if_changed(self) -> None:
+        """Re-map the files if another process refreshed them since our last load."""
+        try:
+            mtime = self.meta_path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime != self._loaded_mtime:
+            self.load()
+
+    def search(
+        self, queries: Union[np.ndarray, Sequence[float]], k: int
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Top-k cosine search for one or many query vectors.
+
+        Args:
+            queries: A single vector ``(d,)`` or a batch ``(q, d)``
+            k: Results per query
+
+        Returns:
+            One list of (id, similarity) per query, best first
+        """
+        queries = _normalize(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        if self.matrix is None or not self.ids or k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        k = min(k, len(self.ids))
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+
+        for start in range(0, len(self.ids), SEARCH_BLOCK_ROWS):
+            block = np.asarray(self.matrix[start:start + SEARCH_BLOCK_ROWS], dtype=np.float32)
+            scores = queries @ block.T  # (q, rows): one BLAS call for the whole batch
+
+            block_k = min(k, scores.shape[1])
+            top = np.argpartition(-scores, block_k - 1, axis=1)[:, :block_k]
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
+            best_rows = np.concatenate([best_rows, top + start], axis=1)
+
+            if best_scores.shape[1] > k:
+                keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+
+        return [
+            [(self.ids[row], float(score)) for row, score in zip(rows, scores)]
+            for rows, scores in zip(best_rows, best_scores)
+        ]
+
+    async def refresh(self, db: AsyncSession, db_slots: Optional[asyncio.Semaphore] = None) -> int:
+        """
+        Pull embeddings past the watermark and persist an updated matrix.
+
+        Rows for IDs already in the index are overwritten in place and new
+        IDs are appended. IDs whose embedding row is gone (the document was
+        deleted or withdrawn from search) are dropped. The queries hold one
+        of ``db_slots`` if given; the matrix is rebuilt off the event loop.
+        Returns the number of rows applied.
+        """
+        # Another process on the host may have refreshed the files since
+        self.reload_if_changed()
+
+        id_attr = getattr(self.embedding_model, self.id_column)
+        query = (
+            select(id_attr, self.embedding_model.embedding, self.embedding_model.updated_at)
+            .where(self.embedding_model.model_name == settings.embedding_model)
+            .order_by(self.embedding_model.updated_at, id_attr)
+        )
+        if self.watermark is not None and self.watermark_id is not None:
+            query = query.where(
+                tuple_(self.embedding_model.updated_at, id_attr) > (self.watermark, self.watermark_id)
+            )
+        elif self.watermark is not None:
+            # Index written before the ID tie-breaker: re-applying rows at the
+            # watermark overwrites them in place, skipping them would lose them
+            query = query.where(self.embedding_model.updated_at >= self.watermark)
+        live_query = select(id_attr).where(self.embedding_model.model_name == settings.embedding_model)
+
+        async with db_slots or nullcontext():
+            rows = (await db.execute(query)).all()
+            # Read after the delta, so a row deleted in between is dropped too
+            live = {str(doc_id) for doc_id in (await db.execute(live_query)).scalars().all()}
+
+        if not rows and live.issuperset(self.ids):
+            return 0
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._apply, rows, live)
+        return len(rows)
+
+    def _apply(self, rows: list, live: Set[str]) -> None:
+        """Merge fetched rows into the matrix, drop IDs not in ``live``, persist and re-map."""
+        matrix = (
+            np.array(self.matrix, dtype=self.dtype)
+            if self.matrix is not None
+            else np.zeros((0, _to_numpy(rows[0].embedding).shape[-1]), dtype=self.dtype)
+        )
+        ids = list(self.ids)
+        positions = {doc_id: i for i, doc_id in enumerate(ids)}
+
+        updates, appended = [], []
+        for row in rows:
+            doc_id = str(getattr(row, self.id_column))
+            vector = _normalize(_to_numpy(row.embedding)).astype(self.dtype)
+            if doc_id in positions:
+                updates.append((positions[doc_id], vector))
+            else:
+                positions[doc_id] = len(ids)
+                ids.append(doc_id)
+                appended.append(vector)
+
+        for position, vector in updates:
+            matrix[position] = vector
+        if appended:
+            matrix = np.concatenate([matrix, np.stack(appended)])
+
+        keep = [i for i, doc_id in enumerate(ids) if doc_id in live]
+        dropped = len(ids) - len(keep)
+        if dropped:
+            matrix = matrix[keep]
+            ids = [ids[i] for i in keep]
+
+        if rows:
+            last = rows[-1]
+            watermark, watermark_id = last.updated_at, str(getattr(last, self.id_column))
+        else:
+            watermark, watermark_id = self.watermark, self.watermark_id
+        self._persist(matrix, ids, watermark, watermark_id)
+        self.load()
+        logger.info(
+            f"Vector index {self.name}: applied {len(rows)} rows, dropped {dropped}, {len(ids)} total"
+        )
+
+    def _persist(
+        self,
+        matrix: np.ndarray,
+        ids: List[str],
+        watermark: Optional[datetime],
+        watermark_id: Optional[str] = None,
+    ) -> None:
+        """
+        Write a new matrix file, then point the ID map at it via rename.
+
+        The matrix the previous ID map named is kept for readers that read
+        that map just before the swap; older ones are removed.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        previous = (
+            json.loads(self.meta_path.read_text()).get("matrix", self.legacy_matrix_file)
+            if self.meta_path.exists()
+            else None
+        )
+
+        token = uuid4().hex
+        matrix_file = f"{self.name}.{token}.npy"
+        with open(self.directory / matrix_file, "wb") as fh:
+            np.save(fh, matrix)
+
+        tmp_meta = self.meta_path.with_suffix(f".{token}.tmp")
+        tmp_meta.write_text(json.dumps({
+            "ids": ids,
+            "matrix": matrix_file,
+            "watermark": watermark.isoformat() if watermark else None,
+            "watermark_id": watermark_id,
+            "dtype": self.dtype.name,
+        }))
+        os.replace(tmp_meta, self.meta_path)
+
+        if previous is not None:
+            self._remove_stale_matrices(matrix_file, previous)
+
+    def _remove_stale_matrices(self, current: str, previous: str) -> None:
+        """
+        Delete matrix files older than ``previous``.
+
+        Newer ones are kept: another process may have written one that its
+        ID map does not name yet.
+        """
+        try:
+            cutoff = (self.directory / previous).stat().st_mtime
+        except FileNotFoundError:
+            return
+        candidates = [self.directory / self.legacy_matrix_file, *self.directory.glob(f"{self.name}.*.npy")]
+        for path in candidates:
+            if path.name in (current, previous):
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+@lru_cache
+def get_vector_index(name: str) -> VectorIndex:
+    """Process-wide index handle, loaded on first use."""
+    factory = VectorIndex.for_entries if name == "entries" else VectorIndex.for_solutions
+    index = factory(settings.vector_index_dir, dtype=settings.vector_index_dtype)
+    index.load()
+    return index
+
+
+async def refresh_vector_indexes(db: AsyncSession, db_slots: Optional[asyncio.Semaphore] = None) -> None:
+    """Bring the on-disk entry and solution indexes up to date with the embedding tables."""
+    for name in ("entries", "solutions"):
+        await get_vector_index(name).refresh(db, db_slots)
@@ -0,0 +1,129 @@
+"""Content-hash keyed embedding cache (in-process LRU with optional Redis tier)."""
+import hashlib
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+import orjson
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.core.logging import logger
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def content_hash(text: str) -> str:
+    """
+    Fingerprint of everything that determines an embedding.
+
+    Whitespace is collapsed so formatting-only edits hash the same; the model
+    name and output dimensions are folded in so a model switch re-embeds.
+    """
+    normalized = _WHITESPACE.sub(" ", text).strip()
+    key = f"{settings.embedding_model}:{settings.embedding_dimensions}\0{normalized}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Small bounded mapping that evicts the least recently used key."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Shared by every IndexingService in the process
+_local_cache = LRUCache(settings.embedding_cache_size)
+
+
+class EmbeddingCache:
+    """Two-tier lookup: process LRU first, then Redis when enabled."""
+
+    REDIS_PREFIX = "kedb:embedding:"
+
+    def __init__(self, local: LRUCache = _local_cache, redis: Optional[Redis] = None):
+        self.local = local
+        self.redis = redis
+        self.ttl_seconds = settings.embedding_cache_ttl_seconds
+
+    @classmethod
+    def from_settings(cls) -> "EmbeddingCache":
+        redis = Redis.from_url(settings.redis_url) if settings.embedding_cache_ttl_seconds > 0 else None
+        return cls(redis=redis)
+
+    async def get_many(self, hashes: Iterable[str]) -> Dict[str, List[float]]:
+        """Return cached vectors for the hashes that are known."""
+        found: Dict[str, List[float]] = {}
+        missing = []
+        for key in hashes:
+            vector = self.local.get(key)
+            if vector is not None:
+                found[key] = vector
+            else:
+                missing.append(key)
+
+        if self.redis is not None and missing:
+            try:
+                values = await self.redis.mget([self.REDIS_PREFIX + key for key in missing])
+                for key, raw in zip(missing, values):
+                    if raw is not None:
+                        vector = orjson.loads(raw)
+                        self.local.set(key, vector)
+                        found[key] = vector
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis lookup failed: {e}")
+
+        return found
+
+    async def set_many(self, vectors: Dict[str, List[float]]) -> None:
+        """Store freshly generated vectors in both tiers."""
+        for key, vector in vectors.items():
+            self.local.set(key, vector)
+
+        if self.redis is not None and vectors:
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for key, vector in vectors.items():
+                        pipe.set(self.REDIS_PREFIX + key, orjson.dumps(vector), ex=self.ttl_seconds)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis write failed: {e}")
+
+
+@lru_cache
+def get_embedding_cache() -> EmbeddingCache:
+    """Process-wide cache, so every indexing job shares one Redis connection pool."""
+    return EmbeddingCache.from_settings()
+
+
+async def close_embedding_cache() -> None:
+    """
+    Close the shared cache's Redis pool.
+
+    The next ``get_embedding_cache`` builds a fresh one, which lets
+    one-shot runs that each start their own event loop reuse the getter.
+    """
+    if get_embedding_cache.cache_info().currsize:
+        cache = get_embedding_cache()
+        get_embedding_cache.cache_clear()
+        if cache.redis is not None:
+            await cache.redis.aclose()
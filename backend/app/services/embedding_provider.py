@@ -0,0 +1,187 @@
+"""Embedding providers: OpenAI and a deterministic local feature-hashing model."""
+import asyncio
+import hashlib
+import math
+import re
+from abc import ABC, abstractmethod
+from collections import Counter
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+import numpy as np
+from openai import APIConnectionError, AsyncOpenAI, InternalServerError, RateLimitError
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.rate_limit import TokenBucket
+
+_TOKEN = re.compile(r"\w+")
+
+# Throttling and transient failures worth retrying (APIConnectionError covers timeouts)
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError, asyncio.TimeoutError)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return len(text) // 4 + 1
+
+
+class EmbeddingProvider(ABC):
+    """Turns texts into fixed-size vectors."""
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+
+    @abstractmethod
+    async def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed texts in one call; output order matches input order."""
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """OpenAI embeddings API (Matryoshka-truncated to ``dimensions``)."""
+
+    def __init__(self, api_key: str, model: str, dimensions: int):
+        super().__init__(dimensions)
+        self.model = model
+        # Retries belong to RateLimitedEmbeddingProvider, which charges each
+        # attempt to the token buckets; the SDK's own would bypass them.
+        self.client = AsyncOpenAI(api_key=api_key, max_retries=0)
+
+    async def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        response = await self.client.embeddings.create(
+            model=self.model,
+            input=list(texts),
+            dimensions=self.dimensions,
+        )
+        vectors: List[List[float]] = [None] * len(texts)
+        for item in response.data:
+            vectors[item.index] = item.embedding
+        return vectors
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic, network-free embeddings via signed feature hashing.
+
+    Lower-cased word unigrams and bigrams are hashed (blake2b, so results are
+    stable across processes) into ``dimensions`` buckets with a hash-derived
+    sign, weighted by sublinear term frequency and L2-normalised. Lexically
+    similar texts get high cosine similarity, which is enough to exercise and
+    benchmark the full indexing and vector-search path offline.
+    """
+
+    async def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        return [self.embed_one(text).tolist() for text in texts]
+
+    def embed_one(self, text: str) -> np.ndarray:
+        tokens = _TOKEN.findall(text.lower())
+        features = Counter(tokens)
+        features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature, count in features.items():
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:7], "little") % self.dimensions
+            sign = 1.0 if digest[7] & 1 else -1.0
+            vector[bucket] += sign * (1.0 + math.log(count))
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class LimitedEmbeddingProvider(EmbeddingProvider):
+    """Wraps a provider so at most ``max_concurrency`` calls are in flight across all callers."""
+
+    def __init__(self, inner: EmbeddingProvider, max_concurrency: int):
+        super().__init__(inner.dimensions)
+        self.inner = inner
+        self._calls = asyncio.Semaphore(max_concurrency)
+
+    async def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        async with self._calls:
+            return await self.inner.embed(texts)
+
+
+class RateLimitedEmbeddingProvider(EmbeddingProvider):
+    """
+    Keep a provider under its request and token quotas and retry transient failures.
+
+    Every call takes one token from the requests/min bucket and its estimated
+    token count from the tokens/min bucket before it is sent, so a bulk
+    reindex runs at the quota instead of bouncing off 429s. Throttling and
+    transient errors are retried with full-jitter exponential backoff; once
+    ``max_attempts`` is exhausted the last error is raised to the caller.
+    """
+
+    def __init__(
+        self,
+        inner: EmbeddingProvider,
+        *,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_attempts: int = 6,
+        max_wait_seconds: float = 60.0,
+    ):
+        super().__init__(inner.dimensions)
+        self.inner = inner
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.max_attempts = max_attempts
+        self.max_wait_seconds = max_wait_seconds
+
+    async def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        token_count = sum(estimate_tokens(text) for text in texts)
+        retrying = AsyncRetrying(
+            retry=retry_if_exception_type(RETRYABLE_ERRORS),
+            wait=wait_random_exponential(multiplier=1, max=self.max_wait_seconds),
+            stop=stop_after_attempt(self.max_attempts),
+            before_sleep=self._log_retry,
+            reraise=True,
+        )
+        async for attempt in retrying:
+            with attempt:
+                if self.requests:
+                    await self.requests.acquire(1)
+                if self.tokens:
+                    await self.tokens.acquire(token_count)
+                return await self.inner.embed(texts)
+
+    @staticmethod
+    def _log_retry(state: RetryCallState) -> None:
+        logger.warning(
+            f"Embedding call failed (attempt {state.attempt_number}), "
+            f"retrying in {state.next_action.sleep:.1f}s: {state.outcome.exception()}"
+        )
+
+
+@lru_cache
+def get_embedding_provider() -> Optional[EmbeddingProvider]:
+    """
+    Process-wide provider selected by ``settings.embedding_provider``.
+
+    The OpenAI provider is wrapped in ``RateLimitedEmbeddingProvider`` so all
+    callers in the process share one quota. Returns None for OpenAI without
+    an API key, in which case embedding generation is skipped.
+    """
+    if settings.embedding_provider == "hashing":
+        return HashingEmbeddingProvider(settings.embedding_dimensions)
+    if settings.openai_api_key:
+        return RateLimitedEmbeddingProvider(
+            OpenAIEmbeddingProvider(
+                settings.openai_api_key,
+                settings.embedding_model,
+                settings.embedding_dimensions,
+            ),
+            requests_per_minute=settings.embedding_requests_per_minute,
+            tokens_per_minute=settings.embedding_tokens_per_minute,
+            max_attempts=settings.embedding_max_attempts,
+            max_wait_seconds=settings.embedding_retry_max_wait_seconds,
+        )
+    return None
@@ -4,9 +4,14 @@ from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.exceptions import NotFoundError, ValidationError, WorkflowError
+from app.models.entry import WorkflowState
+from app.repositories.base import TOTAL_MODES
 from app.repositories.entry_repo import EntryRepository
+from app.repositories.outbox_repo import OutboxRepository
 from app.schemas.entry import EntryCreate, EntryIncidentCreate, EntrySymptomCreate, EntryUpdate
+from app.utils.pagination import decode_cursor, encode_cursor
 
 
 class EntryService:
@@ -23,6 +28,7 @@ class EntryService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.repo = EntryRepository(db)
+        self.outbox = OutboxRepository(db)
 
     async def create_entry(self, entry_data: EntryCreate, created_by: str):
         """Create a new entry."""
@@ -37,9 +43,9 @@ class EntryService:
         entry = await self.repo.create_with_symptoms(data_dict, symptoms)
 
         if entry_data.incidents:
-            for incident in entry_data.incidents:
-                await self.repo.add_incident(entry.id, incident.model_dump())
+            await self.repo.add_incidents(entry.id, [i.model_dump() for i in entry_data.incidents])
 
+        self.outbox.add("entry.created", "entries", entry.id)
         return await self.repo.get_with_relations(entry.id)
 
     async def get_entry(self, entry_id: UUID):
@@ -56,16 +62,41 @@ class EntryService:
         workflow_state: Optional[str] = None,
         severity: Optional[str] = None,
         created_by: Optional[str] = None,
+        cursor: Optional[str] = None,
+        total_mode: Optional[str] = None,
     ):
-        """List entries with filters."""
+        """
+        List entries with filters.
+
+        Pass the previous page's ``next_cursor`` as ``cursor`` for keyset
+        pagination; ``skip`` remains for offset clients and cannot be combined
+        with a cursor. ``next_cursor`` is None on the last page.
+
+        ``total_mode`` picks how ``total`` is computed: ``exact`` counts,
+        ``estimate`` uses the planner's row estimate and ``cached`` reuses a
+        recent exact count for the same filters.
+        """
+        if cursor and skip:
+            raise ValidationError("skip cannot be combined with cursor")
+        total_mode = total_mode or settings.list_total_mode
+        if total_mode not in TOTAL_MODES:
+            raise ValidationError(f"total_mode must be one of {', '.join(TOTAL_MODES)}")
+        after = decode_cursor(cursor) if cursor else None
+
+        # One extra row tells whether another page follows
         entries = await self.repo.get_multi_with_filters(
             skip=skip,
-            limit=limit,
+            limit=limit + 1,
             workflow_state=workflow_state,
             severity=severity,
             created_by=created_by,
+            after=after,
         )
-        
+        next_cursor = None
+        if len(entries) > limit:
+            entries = entries[:limit]
+            next_cursor = encode_cursor(entries[-1].created_at, entries[-1].id)
+
         filters = {}
         if workflow_state:
             filters["workflow_state"] = workflow_state
@@ -73,13 +104,15 @@ class EntryService:
             filters["severity"] = severity
         if created_by:
             filters["created_by"] = created_by
-            
-        total = await self.repo.count(filters)
-        
+
+        total = await self.repo.total(filters, total_mode)
+
         return {
             "total": total,
             "skip": skip,
             "limit": limit,
+            "next_cursor": next_cursor,
+            "total_mode": total_mode,
             "items": entries,
         }
 
@@ -94,15 +127,18 @@ class EntryService:
 
         data_dict = entry_data.model_dump(exclude_unset=True)
         updated = await self.repo.update(entry_id, data_dict)
+        self.outbox.add("entry.updated", "entries", entry_id)
         return await self.repo.get_with_relations(entry_id)
 
     async def delete_entry(self, entry_id: UUID):
-        """Soft delete entry by marking as retired."""
+        """Soft delete entry by marking as retired; the indexer withdraws it from search."""
         entry = await self.repo.get(entry_id)
         if not entry:
             raise NotFoundError(f"Entry {entry_id} not found")
 
+        previous_state = entry.workflow_state
         await self.repo.update_workflow_state(entry_id, "retired")
+        self._record_transition(entry_id, previous_state, "retired")
         return True
 
     async def add_symptom(self, entry_id: UUID, symptom_data: EntrySymptomCreate):
@@ -112,6 +148,7 @@ class EntryService:
             raise NotFoundError(f"Entry {entry_id} not found")
 
         symptom = await self.repo.add_symptom(entry_id, symptom_data.model_dump())
+        await self._record_child_change(entry_id)
         return symptom
 
     async def add_incident(self, entry_id: UUID, incident_data: EntryIncidentCreate):
@@ -121,6 +158,7 @@ class EntryService:
             raise NotFoundError(f"Entry {entry_id} not found")
 
         incident = await self.repo.add_incident(entry_id, incident_data.model_dump())
+        await self._record_child_change(entry_id)
         return incident
 
     async def transition_workflow(self, entry_id: UUID, new_state: str, approved_by: Optional[str] = None):
@@ -138,4 +176,32 @@ class EntryService:
                 f"Valid transitions: {', '.join(valid_transitions)}"
             )
 
-        return await self.repo.update_workflow_state(entry_id, new_state, approved_by)
+        updated = await self.repo.update_workflow_state(entry_id, new_state, approved_by)
+        self._record_transition(entry_id, current_state, new_state)
+        return updated
+
+    async def _record_child_change(self, entry_id: UUID):
+        """
+        Bump the entry's ``updated_at`` and queue a reindex after a symptom or incident change.
+
+        Symptoms are part of the entry's search document and embedding text,
+        and the drift watermark compares ``updated_at``, so a child change
+        has to advance the parent's version.
+        """
+        await self.repo.touch(entry_id)
+        self.outbox.add("entry.updated", "entries", entry_id)
+
+    def _record_transition(self, entry_id: UUID, previous_state: str, new_state: str):
+        """
+        Queue a reindex for a workflow change.
+
+        ``workflow_state`` is a search filter, so every transition reindexes
+        the entry; for ``retired`` and ``merged`` the indexer removes the
+        entry and its solutions from Meilisearch and the vector store.
+        """
+        self.outbox.add(
+            "entry.workflow_changed",
+            "entries",
+            entry_id,
+            {"from": WorkflowState(previous_state).value, "to": WorkflowState(new_state).value},
+        )
@@ -1,163 +1,402 @@
 """Indexing service for Meilisearch and vector embeddings."""
 import asyncio
-from typing import List, Optional
+from contextlib import asynccontextmanager, nullcontext
+from typing import AsyncIterator, Dict, List, Optional, Sequence
 from uuid import UUID
 
-import httpx
-from openai import AsyncOpenAI
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.exceptions import EmbeddingError
 from app.core.logging import logger
-from app.models.embedding import EntryEmbedding, SolutionEmbedding
-from app.models.entry import Entry
+from app.core.metrics import span
+from app.models.entry import UNSEARCHABLE_STATES, Entry
 from app.models.solution import Solution
+from app.repositories.embedding_repo import EmbeddingRepository
 from app.repositories.entry_repo import EntryRepository
+from app.repositories.index_watermark_repo import EMBEDDING, MEILISEARCH, IndexWatermarkRepository
 from app.repositories.solution_repo import SolutionRepository
+from app.search.meilisearch import MeilisearchClient, get_meilisearch_client
+from app.services.embedding_cache import EmbeddingCache, content_hash, get_embedding_cache
+from app.services.embedding_provider import EmbeddingProvider, estimate_tokens, get_embedding_provider
+
+
+def pack_batches(
+    texts: Sequence[str], max_items: int, max_tokens: int
+) -> List[List[int]]:
+    """
+    Group text positions into batches under an item and token budget.
+
+    A single text larger than the token budget still gets a batch of its own.
+
+    Returns:
+        Lists of indexes into ``texts``, in input order
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+
+    for i, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if current and (len(current) >= max_items or current_tokens + tokens > max_tokens):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def entry_embedding_text(entry: Entry) -> str:
+    """Text embedded for an entry (title + description + symptoms)."""
+    symptoms_text = " ".join([s.description for s in entry.symptoms])
+    return f"{entry.title}\n\n{entry.description}\n\nSymptoms:\n{symptoms_text}"
+
+
+def solution_embedding_text(solution: Solution) -> str:
+    """Text embedded for a solution (description + ordered steps)."""
+    steps_text = "\n".join([
+        f"{s.order_index + 1}. {s.action}"
+        for s in sorted(solution.steps, key=lambda x: x.order_index)
+    ])
+    return f"{solution.description}\n\nSteps:\n{steps_text}"
+
+
+def solution_document(solution: Solution) -> dict:
+    """
+    Meilisearch document for a solution.
+
+    Steps are flattened into ordered ``steps``/``commands`` arrays, and the
+    parent entry's filterable fields are copied in so filtered solution
+    search needs no join back to Postgres.
+    """
+    steps = sorted(solution.steps, key=lambda x: x.order_index)
+    return {
+        "id": str(solution.id),
+        "entry_id": str(solution.entry_id),
+        "title": solution.title,
+        "description": solution.description,
+        "solution_type": solution.solution_type,
+        "prerequisites": solution.prerequisites or "",
+        "steps": [s.action for s in steps],
+        "commands": [c for s in steps for c in (s.command, s.rollback_command) if c],
+        "severity": solution.entry.severity,
+        "workflow_state": solution.entry.workflow_state,
+        "created_at": solution.created_at.isoformat(),
+    }
 
 
 class IndexingService:
     """Service for indexing entries and solutions."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        meilisearch: Optional[MeilisearchClient] = None,
+        embedding_provider: Optional[EmbeddingProvider] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        *,
+        db_slots: Optional[asyncio.Semaphore] = None,
+    ):
         self.db = db
+        self.db_slots = db_slots
         self.entry_repo = EntryRepository(db)
         self.solution_repo = SolutionRepository(db)
-        self.openai_client = AsyncOpenAI(api_key=settings.openai_api_key) if settings.openai_api_key else None
-        self.meilisearch_url = str(settings.meilisearch_url)
-        self.meilisearch_key = settings.meilisearch_master_key
+        self.embedding_repo = EmbeddingRepository(db)
+        self.watermark_repo = IndexWatermarkRepository(db)
+        self.embedding_cache = embedding_cache or get_embedding_cache()
+        self.embedding_provider = embedding_provider or get_embedding_provider()
+        self.meilisearch = meilisearch or get_meilisearch_client()
+
+    @asynccontextmanager
+    async def db_phase(self, stage: str) -> AsyncIterator[None]:
+        """
+        Span a stretch of Postgres work, holding one of ``db_slots`` if set.
+
+        Only the queries themselves take a slot; embedding and Meilisearch
+        calls between them run without one.
+        """
+        async with self.db_slots or nullcontext():
+            with span(stage):
+                yield
 
     async def index_entry(self, entry_id: UUID):
         """Index entry in Meilisearch and generate embeddings."""
-        entry = await self.entry_repo.get_with_relations(entry_id)
-        if not entry:
-            logger.warning(f"Entry {entry_id} not found for indexing")
+        await self.index_entries([entry_id])
+
+    async def index_solution(self, solution_id: UUID):
+        """Index solution and generate embeddings."""
+        await self.index_solutions([solution_id])
+
+    async def index_entries(self, entry_ids: Sequence[UUID]):
+        """
+        Index many entries with one Meilisearch call and batched embedding requests.
+
+        Retired and merged entries are withdrawn instead, together with their
+        solutions, so a bulk retirement costs one batched delete per backend.
+        """
+        async with self.db_phase("fetch"):
+            entries = await self.entry_repo.get_many_with_symptoms(list(entry_ids))
+        self._warn_missing("Entry", entry_ids, entries)
+        if not entries:
             return
 
-        # Index in Meilisearch
-        await self._index_entry_meilisearch(entry)
+        async with self.db_phase("fetch"):
+            solutions = await self.solution_repo.get_by_entries_with_steps([entry.id for entry in entries])
+        removed = [entry for entry in entries if entry.workflow_state in UNSEARCHABLE_STATES]
+        if removed:
+            removed_ids = {entry.id for entry in removed}
+            await self.remove_entries(removed, [s for s in solutions if s.entry_id in removed_ids])
+            entries = [entry for entry in entries if entry.id not in removed_ids]
+            solutions = [s for s in solutions if s.entry_id not in removed_ids]
+            if not entries:
+                return
+
+        # Index in Meilisearch, refreshing the entry fields rolled up into solutions.
+        # The watermark only advances once Meilisearch has accepted the flush;
+        # a failed flush fails the job so it is retried.
+        await self._index_entries_meilisearch(entries)
+        await self._index_solutions_meilisearch(solutions)
+        await self.meilisearch.flush()
+        await self._record_indexed("entries", MEILISEARCH, entries)
 
         # Generate and store embeddings
-        if self.openai_client:
-            await self._generate_entry_embedding(entry)
+        if self.embedding_provider:
+            await self._generate_entry_embeddings(entries)
+            await self._record_indexed("entries", EMBEDDING, entries)
 
-    async def index_solution(self, solution_id: UUID):
-        """Index solution and generate embeddings."""
-        solution = await self.solution_repo.get_with_steps(solution_id)
-        if not solution:
-            logger.warning(f"Solution {solution_id} not found for indexing")
+    async def index_solutions(self, solution_ids: Sequence[UUID]):
+        """
+        Index many solutions in Meilisearch and generate embeddings with batched requests.
+
+        Solutions of retired or merged entries are withdrawn instead.
+        """
+        async with self.db_phase("fetch"):
+            solutions = await self.solution_repo.get_many_with_steps(list(solution_ids))
+        self._warn_missing("Solution", solution_ids, solutions)
+
+        removed = [s for s in solutions if s.entry.workflow_state in UNSEARCHABLE_STATES]
+        if removed:
+            await self.remove_solutions(removed)
+            solutions = [s for s in solutions if s.entry.workflow_state not in UNSEARCHABLE_STATES]
+        if not solutions:
             return
 
+        # Index in Meilisearch
+        await self._index_solutions_meilisearch(solutions)
+        await self.meilisearch.flush()
+        await self._record_indexed("solutions", MEILISEARCH, solutions)
+
         # Generate and store embeddings
-        if self.openai_client:
-            await self._generate_solution_embedding(solution)
-
-    async def _index_entry_meilisearch(self, entry: Entry):
-        """Index entry in Meilisearch."""
-        try:
-            # Prepare entry document
-            symptoms_text = " ".join([s.description for s in entry.symptoms])
-            
-            document = {
+        if self.embedding_provider:
+            await self._generate_solution_embeddings(solutions)
+            await self._record_indexed("solutions", EMBEDDING, solutions)
+
+    async def _record_indexed(self, entity_type: str, backend: str, objs: list):
+        """Advance the drift watermark to the version just written."""
+        async with self.db_phase("db_flush"):
+            await self.watermark_repo.record(entity_type, backend, [(obj.id, obj.updated_at) for obj in objs])
+
+    def _warn_missing(self, kind: str, requested: Sequence[UUID], found: list):
+        found_ids = {obj.id for obj in found}
+        for missing_id in requested:
+            if missing_id not in found_ids:
+                logger.warning(f"{kind} {missing_id} not found for indexing")
+
+    async def _index_entries_meilisearch(self, entries: List[Entry]):
+        """Buffer entry documents for the next batched Meilisearch write."""
+        documents = [
+            {
                 "id": str(entry.id),
                 "title": entry.title,
                 "description": entry.description,
-                "symptoms": symptoms_text,
+                "symptoms": " ".join([s.description for s in entry.symptoms]),
                 "severity": entry.severity,
                 "workflow_state": entry.workflow_state,
-                "environment": entry.environment or "",
                 "root_cause": entry.root_cause or "",
                 "created_by": entry.created_by,
                 "created_at": entry.created_at.isoformat(),
             }
+            for entry in entries
+        ]
+        with span("meilisearch_upsert"):
+            await self.meilisearch.queue_upsert("entries", documents)
+
+    async def _index_solutions_meilisearch(self, solutions: List[Solution]):
+        """Buffer solution documents for the next batched Meilisearch write."""
+        if solutions:
+            with span("meilisearch_upsert"):
+                await self.meilisearch.queue_upsert("solutions", [solution_document(s) for s in solutions])
+
+    async def embed_texts(
+        self, texts: Sequence[str], hashes: Optional[Sequence[str]] = None
+    ) -> List[Optional[List[float]]]:
+        """
+        Embed texts with as few provider calls as the batch budget allows.
+
+        Texts whose content hash is already cached are served without a
+        provider call. Up to ``embedding_batch_concurrency`` batches are in
+        flight at once. A batch that still fails after the provider's own
+        retries yields ``None`` for its texts.
+        """
+        if hashes is None:
+            hashes = [content_hash(text) for text in texts]
+
+        cached = await self.embedding_cache.get_many(hashes)
+        vectors: List[Optional[List[float]]] = [cached.get(h) for h in hashes]
+        pending = [i for i, vector in enumerate(vectors) if vector is None]
+        if not pending:
+            return vectors
+
+        batches = pack_batches(
+            [texts[i] for i in pending],
+            settings.embedding_batch_max_items,
+            settings.embedding_batch_max_tokens,
+        )
+        semaphore = asyncio.Semaphore(settings.embedding_batch_concurrency)
+        fresh: Dict[str, List[float]] = {}
+
+        async def run_batch(batch: List[int]):
+            positions = [pending[i] for i in batch]
+            try:
+                async with semaphore:
+                    batch_vectors = await self.embedding_provider.embed([texts[i] for i in positions])
+                for position, vector in zip(positions, batch_vectors):
+                    vectors[position] = vector
+                    fresh[hashes[position]] = vector
+            except Exception as e:
+                logger.error(f"Failed to embed batch of {len(positions)} texts: {e}")
+
+        with span("embed"):
+            await asyncio.gather(*(run_batch(batch) for batch in batches))
+        await self.embedding_cache.set_many(fresh)
+        return vectors
+
+    async def _generate_entry_embeddings(self, entries: List[Entry]):
+        """Generate and bulk-store embeddings for entries whose embeddable text changed."""
+        async with self.db_phase("fetch"):
+            stored = await self.embedding_repo.get_entry_hashes([entry.id for entry in entries])
+        pending = []
+        for entry in entries:
+            text = entry_embedding_text(entry)
+            digest = content_hash(text)
+            if stored.get(entry.id) != digest:
+                pending.append((entry, text, digest))
+
+        if len(pending) < len(entries):
+            logger.info(f"Skipped {len(entries) - len(pending)} unchanged entry embeddings")
+        if not pending:
+            return
+
+        vectors = await self.embed_texts([text for _, text, _ in pending], [d for _, _, d in pending])
+        rows = [
+            {
+                "entry_id": entry.id,
+                "model_name": settings.embedding_model,
+                "dimension": len(vector),
+                "content_hash": digest,
+                "embedding": vector,
+            }
+            for (entry, _, digest), vector in zip(pending, vectors)
+            if vector is not None
+        ]
+        if rows:
+            async with self.db_phase("db_flush"):
+                await self.embedding_repo.upsert_entry_embeddings(rows)
+            logger.info(f"Generated embeddings for {len(rows)} entries")
+
+        # Fail the job so it is retried or dead-lettered. The rows above are
+        # only kept if the caller commits them (see run_indexing); then their
+        # hashes match on retry and only the failed ones are re-embedded.
+        failed = len(pending) - len(rows)
+        if failed:
+            raise EmbeddingError(f"Failed to embed {failed} of {len(pending)} entries")
+
+    async def _generate_solution_embeddings(self, solutions: List[Solution]):
+        """Generate and bulk-store embeddings for solutions whose embeddable text changed."""
+        async with self.db_phase("fetch"):
+            stored = await self.embedding_repo.get_solution_hashes([solution.id for solution in solutions])
+        pending = []
+        for solution in solutions:
+            text = solution_embedding_text(solution)
+            digest = content_hash(text)
+            if stored.get(solution.id) != digest:
+                pending.append((solution, text, digest))
+
+        if len(pending) < len(solutions):
+            logger.info(f"Skipped {len(solutions) - len(pending)} unchanged solution embeddings")
+        if not pending:
+            return
+
+        vectors = await self.embed_texts([text for _, text, _ in pending], [d for _, _, d in pending])
+        rows = [
+            {
+                "solution_id": solution.id,
+                "model_name": settings.embedding_model,
+                "dimension": len(vector),
+                "content_hash": digest,
+                "embedding": vector,
+            }
+            for (solution, _, digest), vector in zip(pending, vectors)
+            if vector is not None
+        ]
+        if rows:
+            async with self.db_phase("db_flush"):
+                await self.embedding_repo.upsert_solution_embeddings(rows)
+            logger.info(f"Generated embeddings for {len(rows)} solutions")
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.meilisearch_url}/indexes/entries/documents",
-                    json=[document],
-                    headers={"Authorization": f"Bearer {self.meilisearch_key}"},
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-                logger.info(f"Indexed entry {entry.id} in Meilisearch")
-
-        except Exception as e:
-            logger.error(f"Failed to index entry {entry.id} in Meilisearch: {e}")
-
-    async def _generate_entry_embedding(self, entry: Entry):
-        """Generate and store entry embedding."""
-        try:
-            # Combine text for embedding
-            symptoms_text = " ".join([s.description for s in entry.symptoms])
-            combined_text = f"{entry.title}\n\n{entry.description}\n\nSymptoms:\n{symptoms_text}"
-
-            # Generate embedding
-            response = await self.openai_client.embeddings.create(
-                model=settings.embedding_model,
-                input=combined_text,
-            )
-
-            embedding_vector = response.data[0].embedding
-
-            # Store in database
-            entry_embedding = EntryEmbedding(
-                entry_id=entry.id,
-                model_name=settings.embedding_model,
-                dimension=len(embedding_vector),
-                embedding=embedding_vector,
-            )
-            self.db.add(entry_embedding)
-            await self.db.flush()
-
-            logger.info(f"Generated embedding for entry {entry.id}")
-
-        except Exception as e:
-            logger.error(f"Failed to generate embedding for entry {entry.id}: {e}")
-
-    async def _generate_solution_embedding(self, solution: Solution):
-        """Generate and store solution embedding."""
-        try:
-            # Combine solution text
-            steps_text = "\n".join([
-                f"{s.order_index + 1}. {s.description}"
-                for s in sorted(solution.steps, key=lambda x: x.order_index)
-            ])
-            combined_text = f"{solution.description}\n\nSteps:\n{steps_text}"
-
-            # Generate embedding
-            response = await self.openai_client.embeddings.create(
-                model=settings.embedding_model,
-                input=combined_text,
-            )
-
-            embedding_vector = response.data[0].embedding
-
-            # Store in database
-            solution_embedding = SolutionEmbedding(
-                solution_id=solution.id,
-                model_name=settings.embedding_model,
-                dimension=len(embedding_vector),
-                embedding=embedding_vector,
-            )
-            self.db.add(solution_embedding)
-            await self.db.flush()
-
-            logger.info(f"Generated embedding for solution {solution.id}")
-
-        except Exception as e:
-            logger.error(f"Failed to generate embedding for solution {solution.id}: {e}")
+        # Fail the job so it is retried or dead-lettered. The rows above are
+        # only kept if the caller commits them (see run_indexing); then their
+        # hashes match on retry and only the failed ones are re-embedded.
+        failed = len(pending) - len(rows)
+        if failed:
+            raise EmbeddingError(f"Failed to embed {failed} of {len(pending)} solutions")
+
+    async def remove_entries(self, entries: List[Entry], solutions: List[Solution]):
+        """
+        Withdraw entries and their solutions from Meilisearch and the vector store.
+
+        Documents go out in one batched Meilisearch delete per index and
+        embeddings in one ``DELETE`` per table. Once Meilisearch has accepted
+        the deletes, the removal is recorded as the indexed version, so drift
+        reconciliation does not re-queue it.
+        """
+        entry_ids = [entry.id for entry in entries]
+        await self.delete_entries_from_index(entry_ids)
+        await self.meilisearch.flush()
+        await self._record_indexed("entries", MEILISEARCH, entries)
+        async with self.db_phase("db_flush"):
+            await self.embedding_repo.delete_entry_embeddings(entry_ids)
+        await self._record_indexed("entries", EMBEDDING, entries)
+
+        if solutions:
+            await self.remove_solutions(solutions)
+        logger.info(f"Removed {len(entries)} entries and {len(solutions)} solutions from search")
+
+    async def remove_solutions(self, solutions: List[Solution]):
+        """Withdraw solutions from Meilisearch and the vector store in one batch each."""
+        solution_ids = [solution.id for solution in solutions]
+        await self.delete_solutions_from_index(solution_ids)
+        await self.meilisearch.flush()
+        await self._record_indexed("solutions", MEILISEARCH, solutions)
+        async with self.db_phase("db_flush"):
+            await self.embedding_repo.delete_solution_embeddings(solution_ids)
+        await self._record_indexed("solutions", EMBEDDING, solutions)
 
     async def delete_entry_from_index(self, entry_id: UUID):
         """Remove entry from Meilisearch."""
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.delete(
-                    f"{self.meilisearch_url}/indexes/entries/documents/{entry_id}",
-                    headers={"Authorization": f"Bearer {self.meilisearch_key}"},
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-                logger.info(f"Deleted entry {entry_id} from Meilisearch")
-
-        except Exception as e:
-            logger.error(f"Failed to delete entry {entry_id} from Meilisearch: {e}")
+        await self.delete_entries_from_index([entry_id])
+
+    async def delete_entries_from_index(self, entry_ids: Sequence[UUID]):
+        """Buffer entry IDs for the next batched Meilisearch delete."""
+        await self._delete_from_index("entries", entry_ids)
+
+    async def delete_solutions_from_index(self, solution_ids: Sequence[UUID]):
+        """Buffer solution IDs for the next batched Meilisearch delete."""
+        await self._delete_from_index("solutions", solution_ids)
+
+    async def _delete_from_index(self, index: str, ids: Sequence[UUID]):
+        with span("meilisearch_delete"):
+            await self.meilisearch.queue_delete(index, ids)
@@ -0,0 +1,43 @@
+"""Token-bucket rate limiting for outbound API calls."""
+import asyncio
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """
+    Refill ``rate_per_minute`` tokens per minute up to ``capacity``.
+
+    ``acquire`` waits until enough tokens are available. Waiters are served
+    in arrival order (the lock is held while sleeping), so a large request
+    is not starved by a stream of small ones.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate_per_minute / 60
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        # Larger than the bucket could ever hold: wait for a full bucket instead
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError, ValidationError, WorkflowError
 from app.repositories.entry_repo import EntryRepository
+from app.repositories.outbox_repo import OutboxRepository
 from app.repositories.review_repo import ReviewRepository
 from app.schemas.review import ReviewCreate, ReviewDecision, ReviewParticipantCreate
 
@@ -17,6 +18,7 @@ class ReviewService:
         self.db = db
         self.repo = ReviewRepository(db)
         self.entry_repo = EntryRepository(db)
+        self.outbox = OutboxRepository(db)
 
     async def create_review(self, entry_id: UUID, review_data: ReviewCreate, created_by: str):
         """Create a review for an entry."""
@@ -103,4 +105,11 @@ class ReviewService:
         elif decision.status == "changes_requested":
             await self.entry_repo.update_workflow_state(review.entry_id, "draft")
 
+        # The entry's workflow_state changed; reindex it after commit
+        self.outbox.add(
+            "review.decided",
+            "entries",
+            review.entry_id,
+            {"review_id": str(review_id), "status": decision.status},
+        )
         return await self.repo.get_with_participants(review_id)
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError, ValidationError
 from app.repositories.entry_repo import EntryRepository
+from app.repositories.outbox_repo import OutboxRepository
 from app.repositories.solution_repo import SolutionRepository
 from app.schemas.solution import SolutionCreate, SolutionStepCreate, SolutionStepUpdate, SolutionUpdate
 
@@ -17,6 +18,7 @@ class SolutionService:
         self.db = db
         self.repo = SolutionRepository(db)
         self.entry_repo = EntryRepository(db)
+        self.outbox = OutboxRepository(db)
 
     async def create_solution(self, entry_id: UUID, solution_data: SolutionCreate, created_by: str):
         """Create solution for an entry."""
@@ -33,6 +35,7 @@ class SolutionService:
             steps = [s.model_dump() for s in solution_data.steps]
 
         solution = await self.repo.create_with_steps(data_dict, steps)
+        self.outbox.add("solution.created", "solutions", solution.id)
         return await self.repo.get_with_steps(solution.id)
 
     async def get_solution(self, solution_id: UUID):
@@ -58,6 +61,7 @@ class SolutionService:
 
         data_dict = solution_data.model_dump(exclude_unset=True)
         updated = await self.repo.update(solution_id, data_dict)
+        self.outbox.add("solution.updated", "solutions", solution_id)
         return await self.repo.get_with_steps(solution_id)
 
     async def delete_solution(self, solution_id: UUID):
@@ -66,6 +70,7 @@ class SolutionService:
         if not solution:
             raise NotFoundError(f"Solution {solution_id} not found")
 
+        self.outbox.add("solution.deleted", "solutions", solution_id)
         return await self.repo.delete(solution_id)
 
     async def add_step(self, solution_id: UUID, step_data: SolutionStepCreate):
@@ -75,6 +80,7 @@ class SolutionService:
             raise NotFoundError(f"Solution {solution_id} not found")
 
         step = await self.repo.add_step(solution_id, step_data.model_dump())
+        await self._record_step_change(solution_id)
         return step
 
     async def update_step(self, step_id: UUID, step_data: SolutionStepUpdate):
@@ -84,7 +90,9 @@ class SolutionService:
             raise NotFoundError(f"Step {step_id} not found")
 
         data_dict = step_data.model_dump(exclude_unset=True)
-        return await self.repo.update_step(step_id, data_dict)
+        updated = await self.repo.update_step(step_id, data_dict)
+        await self._record_step_change(step.solution_id)
+        return updated
 
     async def delete_step(self, step_id: UUID):
         """Delete solution step."""
@@ -92,4 +100,18 @@ class SolutionService:
         if not step:
             raise NotFoundError(f"Step {step_id} not found")
 
-        return await self.repo.delete_step(step_id)
+        solution_id = step.solution_id
+        deleted = await self.repo.delete_step(step_id)
+        await self._record_step_change(solution_id)
+        return deleted
+
+    async def _record_step_change(self, solution_id: UUID):
+        """
+        Bump the solution's ``updated_at`` and queue a reindex after a step change.
+
+        Steps are part of the solution's search document and embedding text,
+        and the drift watermark compares ``updated_at``, so a step change has
+        to advance the parent's version.
+        """
+        await self.repo.touch(solution_id)
+        self.outbox.add("solution.updated", "solutions", solution_id)
@@ -0,0 +1,53 @@
+"""Stats service for dashboard aggregates."""
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.repositories.stats_repo import StatsRepository, summarize
+
+
+class StatsService:
+    """Service for dashboard statistics."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repo = StatsRepository(db)
+
+    async def get_dashboard(self) -> dict:
+        """
+        Dashboard counts and top tags.
+
+        Counts come from the ``entry_stats`` materialized view while it is
+        younger than ``stats_view_max_staleness_seconds``; otherwise (view
+        disabled, missing or stale) from one live ``GROUPING SETS`` query.
+        ``as_of`` tells when the counts were computed.
+        """
+        rows, as_of = None, None
+        if settings.stats_view_refresh_seconds > 0:
+            rows, as_of = await self._from_view()
+        if rows is None:
+            rows, as_of = await self.repo.entry_counts(), datetime.now(timezone.utc)
+
+        return {
+            **summarize(rows),
+            "top_tags": await self.repo.top_tags(),
+            "as_of": as_of,
+        }
+
+    async def _from_view(self):
+        try:
+            rows, refreshed_at = await self.repo.entry_counts_from_view()
+        except Exception as e:
+            logger.warning(f"Stats view unavailable, computing live: {e}")
+            await self.db.rollback()
+            return None, None
+
+        if refreshed_at is None:
+            return None, None
+        age = (datetime.now(timezone.utc) - refreshed_at).total_seconds()
+        if age > settings.stats_view_max_staleness_seconds:
+            logger.warning(f"Stats view is {age:.0f}s old, computing live")
+            return None, None
+        return rows, refreshed_at
@@ -0,0 +1,28 @@
+"""Opaque keyset cursors for listing endpoints."""
+import base64
+import binascii
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+import orjson
+
+from app.core.exceptions import ValidationError
+
+Keyset = Tuple[datetime, UUID]
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """Cursor pointing just past the row with this ``(created_at, id)`` sort key."""
+    raw = orjson.dumps([created_at.isoformat(), str(id)])
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Keyset:
+    """Sort key encoded by ``encode_cursor``; raises ``ValidationError`` if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = orjson.loads(raw)
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError) as e:
+        raise ValidationError(f"Invalid cursor: {cursor}") from e
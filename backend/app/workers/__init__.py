@@ -1,5 +1,29 @@
 """Background worker tasks."""
-from .indexing_worker import index_entry_task, index_solution_task
-
-__all__ = ["index_entry_task", "index_solution_task"]
+from .context import WorkerContext
+from .indexing_worker import (
+    TASKS,
+    index_entries_task,
+    index_entry_task,
+    index_solution_task,
+    index_solutions_task,
+    refresh_vector_index_task,
+)
+from .outbox import OutboxDispatcher
+from .queue import Job, JobQueue
+from .runtime import AsyncWorker
+from .scheduler import IndexScheduler
 
+__all__ = [
+    "AsyncWorker",
+    "IndexScheduler",
+    "Job",
+    "JobQueue",
+    "OutboxDispatcher",
+    "TASKS",
+    "WorkerContext",
+    "index_entry_task",
+    "index_entries_task",
+    "index_solution_task",
+    "index_solutions_task",
+    "refresh_vector_index_task",
+]
@@ -0,0 +1,84 @@
+"""Clients shared by every job a worker process runs."""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.logging import logger
+from app.search.meilisearch import MeilisearchClient
+from app.services.embedding_cache import close_embedding_cache
+from app.services.embedding_provider import (
+    EmbeddingProvider,
+    LimitedEmbeddingProvider,
+    get_embedding_provider,
+)
+from app.services.indexing_service import IndexingService
+
+
+class WorkerContext:
+    """
+    Session factory and HTTP clients created once per worker.
+
+    Jobs open short sessions from the shared engine pool and reuse the same
+    Meilisearch and embedding clients, so a job pays no connection setup.
+    Each downstream has its own in-flight limit, so concurrent jobs stuck on
+    a slow embedding API do not hold back Meilisearch or Postgres work.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        meilisearch: Optional[MeilisearchClient] = None,
+        embedding_provider: Optional[EmbeddingProvider] = None,
+        *,
+        postgres_concurrency: Optional[int] = None,
+        embedding_concurrency: Optional[int] = None,
+    ):
+        self.session_factory = session_factory
+        self.meilisearch = meilisearch or MeilisearchClient(
+            str(settings.meilisearch_url),
+            settings.meilisearch_master_key,
+            batch_size=settings.meilisearch_batch_size,
+            flush_interval_ms=settings.meilisearch_flush_interval_ms,
+            max_concurrency=settings.worker_meilisearch_concurrency,
+        )
+
+        provider = embedding_provider or get_embedding_provider()
+        if provider is not None:
+            provider = LimitedEmbeddingProvider(
+                provider, embedding_concurrency or settings.worker_embedding_concurrency
+            )
+        self.embedding_provider = provider
+
+        self.postgres_slots = asyncio.Semaphore(postgres_concurrency or settings.worker_postgres_concurrency)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """
+        Open a session for one job.
+
+        No Postgres slot is taken here: the indexing service holds one only
+        around its queries and commit (``IndexingService.db_phase``), so a
+        job waiting on the embedding API or Meilisearch does not block
+        DB-only jobs.
+        """
+        async with self.session_factory() as session:
+            yield session
+
+    def indexing_service(self, session: AsyncSession) -> IndexingService:
+        return IndexingService(session, self.meilisearch, self.embedding_provider, db_slots=self.postgres_slots)
+
+    async def start(self) -> None:
+        try:
+            await self.meilisearch.configure_indexes()
+        except Exception as e:
+            logger.error(f"Failed to configure Meilisearch indexes: {e}")
+        await self.meilisearch.start()
+
+    async def aclose(self) -> None:
+        """Flush buffered Meilisearch writes and close the HTTP and Redis pools."""
+        await self.meilisearch.aclose()
+        await close_embedding_cache()
@@ -0,0 +1,49 @@
+"""Inspect and replay jobs in the dead-letter queue."""
+import argparse
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.workers.queue import JobQueue
+
+
+async def show(queue_name: str, limit: int) -> None:
+    redis = Redis.from_url(settings.redis_url)
+    try:
+        queue = JobQueue(redis, queue_name)
+        print(f"{await queue.dead_letter_size()} dead-lettered jobs on {queue_name}")
+        for job in await queue.dead_letters(limit):
+            failed_at = datetime.fromtimestamp(job.failed_at, tz=timezone.utc).isoformat()
+            print(f"{job.id}  {failed_at}  {job.task}  {job.error}")
+    finally:
+        await redis.aclose()
+
+
+async def replay(queue_name: str, limit: Optional[int]) -> int:
+    redis = Redis.from_url(settings.redis_url)
+    try:
+        replayed = await JobQueue(redis, queue_name).replay_dead_letters(limit)
+        print(f"Replayed {replayed} jobs onto {queue_name}")
+        return replayed
+    finally:
+        await redis.aclose()
+
+
+def run() -> None:
+    """Entrypoint for `poetry run kedb-dlq`."""
+    parser = argparse.ArgumentParser(description="Inspect or replay dead-lettered worker jobs.")
+    parser.add_argument("--queue", default=settings.rq_default_queue)
+    commands = parser.add_subparsers(dest="command", required=True)
+    show_parser = commands.add_parser("list", help="Show the oldest dead-lettered jobs")
+    show_parser.add_argument("--limit", type=int, default=20)
+    replay_parser = commands.add_parser("replay", help="Move dead-lettered jobs back onto the queue")
+    replay_parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == "list":
+        asyncio.run(show(args.queue, args.limit))
+    else:
+        asyncio.run(replay(args.queue, args.limit))
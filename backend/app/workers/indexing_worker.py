@@ -1,33 +1,100 @@
 """Background worker tasks for indexing."""
 import asyncio
+from typing import Awaitable, Callable, Dict, List
 from uuid import UUID
 
-from app.core.database import AsyncSessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_engine
+from app.core.exceptions import EmbeddingError
 from app.core.logging import logger
+from app.search.vector_index import refresh_vector_indexes
 from app.services.indexing_service import IndexingService
+from app.workers.context import WorkerContext
+
 
+async def run_indexing(session: AsyncSession, service: IndexingService, method: str, ids: List[UUID]):
+    """
+    Call ``service.<method>(ids)`` and commit the session.
 
-async def _index_entry_async(entry_id: str):
-    """Async task to index an entry."""
-    async with AsyncSessionLocal() as session:
-        service = IndexingService(session)
-        await service.index_entry(UUID(entry_id))
+    When only some embeddings failed (``EmbeddingError``), the ones already
+    upserted are committed before the error is re-raised, so the retry finds
+    their content hashes stored and re-embeds only what is missing. Any
+    other error leaves the session to roll back. Commits run in the
+    service's ``db_phase`` so they count against the Postgres limit.
+    """
+    try:
+        await getattr(service, method)(ids)
+    except EmbeddingError:
+        async with service.db_phase("db_flush"):
+            await session.commit()
+        raise
+    async with service.db_phase("db_flush"):
         await session.commit()
 
 
-async def _index_solution_async(solution_id: str):
-    """Async task to index a solution."""
-    async with AsyncSessionLocal() as session:
-        service = IndexingService(session)
-        await service.index_solution(UUID(solution_id))
-        await session.commit()
+async def index_entry(ctx: WorkerContext, entry_id: str):
+    """Index an entry."""
+    async with ctx.session() as session:
+        await run_indexing(session, ctx.indexing_service(session), "index_entries", [UUID(entry_id)])
+
+
+async def index_solution(ctx: WorkerContext, solution_id: str):
+    """Index a solution."""
+    async with ctx.session() as session:
+        await run_indexing(session, ctx.indexing_service(session), "index_solutions", [UUID(solution_id)])
+
+
+async def index_entries(ctx: WorkerContext, entry_ids: List[str]):
+    """Index a batch of entries."""
+    async with ctx.session() as session:
+        ids = [UUID(entry_id) for entry_id in entry_ids]
+        await run_indexing(session, ctx.indexing_service(session), "index_entries", ids)
+
+
+async def index_solutions(ctx: WorkerContext, solution_ids: List[str]):
+    """Index a batch of solutions."""
+    async with ctx.session() as session:
+        ids = [UUID(solution_id) for solution_id in solution_ids]
+        await run_indexing(session, ctx.indexing_service(session), "index_solutions", ids)
+
+
+async def refresh_vector_index(ctx: WorkerContext):
+    """Apply new and removed embeddings to the in-process vector indexes."""
+    async with ctx.session() as session:
+        await refresh_vector_indexes(session, ctx.postgres_slots)
+
+
+# Task name -> async handler, as dispatched by the native worker
+TASKS: Dict[str, Callable[..., Awaitable[None]]] = {
+    "index_entry": index_entry,
+    "index_solution": index_solution,
+    "index_entries": index_entries,
+    "index_solutions": index_solutions,
+    "refresh_vector_index": refresh_vector_index,
+}
+
+
+async def _run_standalone(handler, *args):
+    """
+    Run one handler on a fresh loop (RQ path).
+
+    The engine pool is disposed afterwards because its connections are bound
+    to this loop and cannot be reused by the next ``asyncio.run``.
+    """
+    ctx = WorkerContext()
+    try:
+        await handler(ctx, *args)
+    finally:
+        await ctx.aclose()
+        await async_engine.dispose()
 
 
 def index_entry_task(entry_id: str):
     """RQ task wrapper for indexing entry."""
     logger.info(f"Starting indexing task for entry {entry_id}")
     try:
-        asyncio.run(_index_entry_async(entry_id))
+        asyncio.run(_run_standalone(index_entry, entry_id))
         logger.info(f"Completed indexing task for entry {entry_id}")
     except Exception as e:
         logger.error(f"Failed indexing task for entry {entry_id}: {e}")
@@ -38,8 +105,41 @@ def index_solution_task(solution_id: str):
     """RQ task wrapper for indexing solution."""
     logger.info(f"Starting indexing task for solution {solution_id}")
     try:
-        asyncio.run(_index_solution_async(solution_id))
+        asyncio.run(_run_standalone(index_solution, solution_id))
         logger.info(f"Completed indexing task for solution {solution_id}")
     except Exception as e:
         logger.error(f"Failed indexing task for solution {solution_id}: {e}")
         raise
+
+
+def index_entries_task(entry_ids: List[str]):
+    """RQ task wrapper for bulk indexing entries."""
+    logger.info(f"Starting bulk indexing task for {len(entry_ids)} entries")
+    try:
+        asyncio.run(_run_standalone(index_entries, entry_ids))
+        logger.info(f"Completed bulk indexing task for {len(entry_ids)} entries")
+    except Exception as e:
+        logger.error(f"Failed bulk indexing task for {len(entry_ids)} entries: {e}")
+        raise
+
+
+def index_solutions_task(solution_ids: List[str]):
+    """RQ task wrapper for bulk indexing solutions."""
+    logger.info(f"Starting bulk indexing task for {len(solution_ids)} solutions")
+    try:
+        asyncio.run(_run_standalone(index_solutions, solution_ids))
+        logger.info(f"Completed bulk indexing task for {len(solution_ids)} solutions")
+    except Exception as e:
+        logger.error(f"Failed bulk indexing task for {len(solution_ids)} solutions: {e}")
+        raise
+
+
+def refresh_vector_index_task():
+    """RQ task wrapper for applying new embeddings to the in-process vector index."""
+    logger.info("Starting vector index refresh")
+    try:
+        asyncio.run(_run_standalone(refresh_vector_index))
+        logger.info("Completed vector index refresh")
+    except Exception as e:
+        logger.error(f"Failed vector index refresh: {e}")
+        raise
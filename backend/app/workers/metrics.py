@@ -0,0 +1,117 @@
+"""Worker metrics: job outcomes and latency, queue depth and age, exposed over HTTP and logs."""
+import asyncio
+import time
+from typing import Optional
+
+from app.core.logging import logger
+from app.core.metrics import REGISTRY, MetricsRegistry
+from app.workers.queue import LANES, JobQueue
+
+JOBS = REGISTRY.counter(
+    "kedb_worker_jobs_total",
+    "Jobs finished by the worker, by outcome (success, failure, unknown_task).",
+    ["task", "lane", "outcome"],
+)
+JOB_SECONDS = REGISTRY.histogram(
+    "kedb_worker_job_seconds",
+    "Wall time spent running a job.",
+    ["task"],
+)
+JOB_WAIT_SECONDS = REGISTRY.histogram(
+    "kedb_worker_job_wait_seconds",
+    "Time a job waited in its lane between enqueue and start.",
+    ["lane"],
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0),
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    "kedb_worker_queue_depth",
+    "Jobs waiting in a queue lane.",
+    ["queue", "lane"],
+)
+OLDEST_JOB_AGE = REGISTRY.gauge(
+    "kedb_worker_oldest_job_age_seconds",
+    "Age of the job at the head of a queue lane (0 when empty).",
+    ["queue", "lane"],
+)
+DEAD_LETTERS = REGISTRY.gauge(
+    "kedb_worker_dead_letters",
+    "Jobs parked in the dead-letter list.",
+    ["queue"],
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsReporter:
+    """
+    Refresh queue gauges from Redis and publish the registry.
+
+    Counters and timings are updated in-process as jobs run; the gauges are
+    read from Redis on demand, so a scrape or log dump always sees current
+    depth and age. ``serve`` answers ``GET /metrics`` in the Prometheus text
+    format and ``run`` logs a snapshot every interval.
+    """
+
+    def __init__(self, queue: JobQueue, registry: MetricsRegistry = REGISTRY):
+        self.queue = queue
+        self.registry = registry
+
+    async def collect(self, now: Optional[float] = None) -> None:
+        """Update depth, oldest-job age and dead-letter gauges for every lane."""
+        now = now if now is not None else time.time()
+        name = self.queue.name
+        for lane in LANES:
+            QUEUE_DEPTH.set(await self.queue.size(lane), queue=name, lane=lane)
+            oldest = await self.queue.oldest_enqueued_at(lane)
+            OLDEST_JOB_AGE.set(max(0.0, now - oldest) if oldest is not None else 0.0, queue=name, lane=lane)
+        DEAD_LETTERS.set(await self.queue.dead_letter_size(), queue=name)
+
+    async def render(self) -> str:
+        try:
+            await self.collect()
+        except Exception as e:
+            logger.error(f"Failed to collect queue metrics: {e}")
+        return self.registry.render()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+
+            parts = request_line.split()
+            if len(parts) >= 2 and parts[0] == b"GET" and parts[1].split(b"?")[0] == b"/metrics":
+                status, body = "200 OK", (await self.render()).encode()
+            else:
+                status, body = "404 Not Found", b"Not found\n"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {CONTENT_TYPE}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.warning(f"Metrics request failed: {e}")
+        finally:
+            writer.close()
+
+    async def serve(self, stopping: asyncio.Event, host: str, port: int) -> None:
+        """Serve ``/metrics`` until ``stopping`` is set."""
+        server = await asyncio.start_server(self._handle, host, port)
+        logger.info(f"Serving worker metrics on {host}:{port}/metrics")
+        async with server:
+            await stopping.wait()
+
+    async def run(self, stopping: asyncio.Event, interval_seconds: float) -> None:
+        """Log a metrics snapshot every ``interval_seconds`` until ``stopping`` is set."""
+        while not stopping.is_set():
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.collect()
+                logger.info("Worker metrics", queue=self.queue.name, metrics=self.registry.snapshot())
+            except Exception as e:
+                logger.error(f"Failed to report worker metrics: {e}")
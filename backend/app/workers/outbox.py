@@ -0,0 +1,97 @@
+"""Outbox dispatcher: moves committed events into the indexing pipeline."""
+import asyncio
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.repositories.outbox_repo import OutboxRepository
+from app.search.meilisearch import MeilisearchClient, get_meilisearch_client
+from app.workers.queue import lane_for_severity
+from app.workers.scheduler import IndexScheduler
+
+# Events whose row is gone: its document is deleted from the index instead of re-indexed
+REMOVAL_EVENTS = {"solution.deleted"}
+
+
+class OutboxDispatcher:
+    """
+    Drain ``outbox_events`` into the debounced ``IndexScheduler``.
+
+    Changes are routed to the critical lane when the affected entry's
+    severity is in ``critical_severities`` and to the interactive lane
+    otherwise. Removal events delete the aggregate's Meilisearch document
+    directly, since there is no row left for an indexing job to load.
+
+    Each batch is claimed, scheduled and deleted in one transaction. If
+    Redis or Meilisearch fails the transaction rolls back and the rows are retried; if the
+    process dies after scheduling but before commit the rows are delivered
+    again, which is harmless because scheduling is idempotent (``ZADD NX``).
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        scheduler: IndexScheduler,
+        meilisearch: Optional[MeilisearchClient] = None,
+        *,
+        batch_size: Optional[int] = None,
+    ):
+        self.session_factory = session_factory
+        self.scheduler = scheduler
+        self.meilisearch = meilisearch or get_meilisearch_client()
+        self.batch_size = batch_size or settings.outbox_batch_size
+
+    async def dispatch_once(self) -> int:
+        """Deliver one batch; returns the number of events delivered."""
+        async with self.session_factory() as session:
+            outbox = OutboxRepository(session)
+            events = await outbox.claim_batch(self.batch_size)
+            if not events:
+                await session.rollback()
+                return 0
+
+            aggregates: Dict[str, Set] = {}
+            removals: Dict[str, Set] = {}
+            for event in events:
+                target = removals if event.event_type in REMOVAL_EVENTS else aggregates
+                target.setdefault(event.aggregate_type, set()).add(event.aggregate_id)
+
+            if removals:
+                for aggregate_type, ids in removals.items():
+                    aggregates.get(aggregate_type, set()).difference_update(ids)
+                    await self.meilisearch.queue_delete(aggregate_type, sorted(str(i) for i in ids))
+                await self.meilisearch.flush()
+
+            for aggregate_type, ids in aggregates.items():
+                if not ids:
+                    continue
+                severities = await outbox.aggregate_severities(aggregate_type, list(ids))
+                lanes: Dict[str, List] = {}
+                for aggregate_id in ids:
+                    lanes.setdefault(lane_for_severity(severities.get(aggregate_id)), []).append(aggregate_id)
+                for lane, lane_ids in lanes.items():
+                    await self.scheduler.schedule(aggregate_type, lane_ids, lane=lane)
+
+            await outbox.delete_many([event.id for event in events])
+            await session.commit()
+
+        logger.info(f"Dispatched {len(events)} outbox events")
+        return len(events)
+
+    async def run(self, stopping: asyncio.Event, interval_ms: Optional[int] = None) -> None:
+        """Poll until ``stopping`` is set; full batches are followed up immediately."""
+        interval = (interval_ms or settings.outbox_poll_interval_ms) / 1000
+        while not stopping.is_set():
+            try:
+                delivered = await self.dispatch_once()
+            except Exception as e:
+                logger.error(f"Outbox dispatch failed: {e}")
+                delivered = 0
+            if delivered >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
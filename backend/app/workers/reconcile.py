@@ -0,0 +1,162 @@
+"""Index drift detection and incremental reconciliation."""
+import argparse
+import asyncio
+from typing import Dict, List, Optional, Set
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, async_engine
+from app.core.logging import logger, setup_logging
+from app.repositories.index_watermark_repo import (
+    EMBEDDING,
+    MEILISEARCH,
+    TRACKED_MODELS,
+    IndexWatermarkRepository,
+)
+from app.search.meilisearch import MeilisearchClient
+from app.services.embedding_provider import get_embedding_provider
+from app.workers.queue import BACKFILL, JobQueue
+from app.workers.scheduler import BATCH_TASKS
+
+LOCK_KEY = "kedb:reconcile:lock"
+
+
+class Reconciler:
+    """
+    Find entities whose search backends are behind Postgres and re-queue only those.
+
+    Two checks per entity type:
+
+    * Watermarks: one anti-join per backend returns IDs whose ``updated_at``
+      is newer than the version last written to that backend, or that were
+      never written at all.
+    * Document counts: if Meilisearch and the searchable rows (not retired
+      or merged) disagree, document IDs are diffed to catch documents lost
+      after their watermark was recorded (re-queued) and documents whose row
+      is gone or withdrawn (deleted).
+
+    Stale IDs are enqueued as batch indexing jobs on the backfill lane,
+    replacing full reindexes.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        meilisearch: MeilisearchClient,
+        queue: JobQueue,
+        *,
+        batch_size: Optional[int] = None,
+        dry_run: bool = False,
+    ):
+        self.session_factory = session_factory
+        self.meilisearch = meilisearch
+        self.queue = queue
+        self.batch_size = batch_size or settings.index_batch_size
+        self.dry_run = dry_run
+
+    async def reconcile(self, entity_type: str) -> Dict[str, int]:
+        """Detect and repair drift for one entity type; returns a summary report."""
+        backends = [MEILISEARCH] + ([EMBEDDING] if get_embedding_provider() else [])
+        report: Dict[str, int] = {}
+        stale: Set[UUID] = set()
+
+        async with self.session_factory() as session:
+            repo = IndexWatermarkRepository(session)
+            for backend in backends:
+                ids = await self._stream_ids(session, repo.stale_ids_query(entity_type, backend))
+                report[f"stale_{backend}"] = len(ids)
+                stale.update(ids)
+
+            searchable = repo.searchable_ids_query(entity_type).subquery()
+            postgres_rows = (await session.execute(select(func.count()).select_from(searchable))).scalar_one()
+
+            documents = await self.meilisearch.document_count(entity_type)
+            report["postgres_rows"] = postgres_rows
+            report["meilisearch_documents"] = documents
+
+            missing: Set[UUID] = set()
+            orphans: List[str] = []
+            if documents != postgres_rows:
+                missing, orphans = await self._diff_document_ids(session, repo, entity_type)
+            report["missing_documents"] = len(missing)
+            report["orphan_documents"] = len(orphans)
+            stale.update(missing)
+
+        report["enqueued"] = len(stale)
+        if not self.dry_run:
+            await self._enqueue(entity_type, sorted(stale))
+            if orphans:
+                await self.meilisearch.queue_delete(entity_type, orphans)
+                await self.meilisearch.flush()
+
+        logger.info(f"Reconciled {entity_type}: {report}")
+        return report
+
+    async def _stream_ids(self, session, query) -> Set[UUID]:
+        result = await session.stream(query.execution_options(yield_per=settings.reindex_chunk_size))
+        return {row[0] async for row in result}
+
+    async def _diff_document_ids(self, session, repo: IndexWatermarkRepository, entity_type: str):
+        """Compare Meilisearch document IDs with searchable rows: (missing from Meili, not searchable)."""
+        document_ids = {doc_id async for doc_id in self.meilisearch.iter_document_ids(entity_type)}
+        postgres_ids = await self._stream_ids(session, repo.searchable_ids_query(entity_type))
+        missing = {entity_id for entity_id in postgres_ids if str(entity_id) not in document_ids}
+        orphans = sorted(document_ids - {str(entity_id) for entity_id in postgres_ids})
+        return missing, orphans
+
+    async def _enqueue(self, entity_type: str, ids: List[UUID]) -> None:
+        task = BATCH_TASKS[entity_type]
+        for start in range(0, len(ids), self.batch_size):
+            await self.queue.enqueue(
+                task, [str(entity_id) for entity_id in ids[start:start + self.batch_size]], lane=BACKFILL
+            )
+
+    async def run(self, redis: Redis, stopping: asyncio.Event, interval_seconds: int) -> None:
+        """
+        Reconcile every entity type each ``interval_seconds`` until ``stopping`` is set.
+
+        A Redis lock held for the interval keeps several workers from
+        reconciling in the same period.
+        """
+        while not stopping.is_set():
+            if await redis.set(LOCK_KEY, "1", nx=True, ex=interval_seconds):
+                for entity_type in TRACKED_MODELS:
+                    try:
+                        await self.reconcile(entity_type)
+                    except Exception as e:
+                        logger.error(f"Reconciliation of {entity_type} failed: {e}")
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+
+def run() -> None:
+    """Entrypoint for `poetry run kedb-reconcile`."""
+    parser = argparse.ArgumentParser(description="Detect index drift and re-queue stale entities.")
+    parser.add_argument("--only", choices=sorted(TRACKED_MODELS), help="Reconcile a single kind")
+    parser.add_argument("--queue", default=settings.rq_default_queue)
+    parser.add_argument("--dry-run", action="store_true", help="Report drift without enqueueing")
+    args = parser.parse_args()
+
+    setup_logging(settings.log_level)
+    kinds = [args.only] if args.only else list(TRACKED_MODELS)
+
+    async def main():
+        redis = Redis.from_url(settings.redis_url)
+        try:
+            async with MeilisearchClient.from_settings() as meilisearch:
+                reconciler = Reconciler(
+                    AsyncSessionLocal, meilisearch, JobQueue(redis, args.queue), dry_run=args.dry_run
+                )
+                for kind in kinds:
+                    await reconciler.reconcile(kind)
+        finally:
+            await redis.aclose()
+            await async_engine.dispose()
+
+    asyncio.run(main())
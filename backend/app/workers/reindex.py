@@ -0,0 +1,212 @@
+"""Resumable full reindex of Meilisearch documents and embeddings."""
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+import orjson
+from redis.asyncio import Redis
+from sqlalchemy import select, tuple_
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.exceptions import ReindexError
+from app.core.logging import logger, setup_logging
+from app.models.entry import Entry
+from app.models.solution import Solution
+from app.search.meilisearch import MeilisearchClient
+from app.services.embedding_cache import close_embedding_cache
+from app.services.indexing_service import IndexingService
+from app.workers.indexing_worker import run_indexing
+from app.workers.queue import BACKFILL, JobQueue
+from app.workers.scheduler import BATCH_TASKS
+
+CHECKPOINT_KEY = "kedb:reindex:checkpoint:{kind}"
+
+# Keyset position: (created_at, id) of the last row fully processed
+Position = Tuple[datetime, UUID]
+
+TARGETS = {
+    "entries": (Entry, "index_entries"),
+    "solutions": (Solution, "index_solutions"),
+}
+
+
+class Checkpoint:
+    """
+    Persist the last keyset position whose chunk *and all earlier chunks* are done.
+
+    Chunks finish out of order under concurrency; only the contiguous
+    completed prefix is saved, so a resumed run never skips unfinished work.
+    """
+
+    def __init__(self, redis: Redis, kind: str):
+        self.redis = redis
+        self.key = CHECKPOINT_KEY.format(kind=kind)
+        self._finished: Dict[int, Position] = {}
+        self._next_seq = 0
+
+    async def load(self) -> Optional[Position]:
+        raw = await self.redis.get(self.key)
+        if raw is None:
+            return None
+        data = orjson.loads(raw)
+        return datetime.fromisoformat(data["created_at"]), UUID(data["id"])
+
+    async def mark_done(self, seq: int, position: Position) -> None:
+        self._finished[seq] = position
+        latest = None
+        while self._next_seq in self._finished:
+            latest = self._finished.pop(self._next_seq)
+            self._next_seq += 1
+        if latest is not None:
+            await self.redis.set(
+                self.key,
+                orjson.dumps({"created_at": latest[0].isoformat(), "id": str(latest[1])}),
+            )
+
+    async def clear(self) -> None:
+        await self.redis.delete(self.key)
+
+
+async def _index_chunk(meilisearch: MeilisearchClient, method: str, ids: List[UUID]) -> None:
+    """Index one chunk in its own session so the identity map never outlives it."""
+    async with AsyncSessionLocal() as session:
+        await run_indexing(session, IndexingService(session, meilisearch), method, ids)
+
+
+async def reindex(kind: str, *, chunk_size: int, concurrency: int, reset: bool = False) -> int:
+    """
+    Stream every row of one kind and feed it through the indexing pipeline.
+
+    Keys are read with a server-side cursor (``yield_per``); each chunk is
+    re-loaded with its symptoms/steps eager-loaded and indexed, with at most
+    ``concurrency`` chunks in flight. Returns the number of rows processed.
+
+    After a chunk fails no new chunks start, and ``ReindexError`` is raised
+    once the in-flight ones finish, leaving the checkpoint in place.
+    """
+    model, method = TARGETS[kind]
+    redis = Redis.from_url(settings.redis_url)
+    try:
+        return await _reindex(kind, model, method, Checkpoint(redis, kind), chunk_size, concurrency, reset)
+    finally:
+        await redis.aclose()
+        await close_embedding_cache()
+
+
+async def _reindex(kind, model, method, checkpoint: Checkpoint, chunk_size, concurrency, reset) -> int:
+    """Stream keys after the checkpoint and index them chunk by chunk."""
+    if reset:
+        await checkpoint.clear()
+
+    start = await checkpoint.load()
+    if start:
+        logger.info(f"Resuming {kind} reindex after {start[0].isoformat()} / {start[1]}")
+
+    query = select(model.id, model.created_at).order_by(model.created_at, model.id)
+    if start:
+        query = query.where(tuple_(model.created_at, model.id) > tuple_(*start))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = set()
+    failures: List[Exception] = []
+    processed = 0
+
+    async def run_chunk(seq: int, ids: List[UUID], last: Position):
+        try:
+            await _index_chunk(meilisearch, method, ids)
+            await checkpoint.mark_done(seq, last)
+        except Exception as e:
+            logger.error(f"Failed to reindex {kind} chunk {seq} ({len(ids)} rows): {e}")
+            failures.append(e)
+        finally:
+            semaphore.release()
+
+    async with MeilisearchClient.from_settings() as meilisearch:
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(query.execution_options(yield_per=chunk_size))
+            seq = 0
+            async for partition in result.partitions():
+                await semaphore.acquire()
+                if failures:
+                    semaphore.release()
+                    break
+                ids = [row.id for row in partition]
+                last = (partition[-1].created_at, partition[-1].id)
+                task = asyncio.create_task(run_chunk(seq, ids, last))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                seq += 1
+                processed += len(ids)
+
+            await asyncio.gather(*tasks)
+
+    if failures:
+        # The checkpoint stops before the first failed chunk, so a rerun retries it
+        raise ReindexError(f"{len(failures)} {kind} chunks failed; rerun to resume") from failures[0]
+    await checkpoint.clear()
+    logger.info(f"Reindexed {processed} {kind}")
+    return processed
+
+
+async def enqueue_backfill(kind: str, *, chunk_size: int, queue_name: str) -> int:
+    """
+    Stream every key of one kind onto the backfill lane instead of indexing inline.
+
+    Workers then index the chunks at the backfill lane's weighted share, so
+    interactive and critical edits stay fast during a full reindex.
+    """
+    model, _ = TARGETS[kind]
+    redis = Redis.from_url(settings.redis_url)
+    queue = JobQueue(redis, queue_name)
+    enqueued = 0
+    try:
+        async with AsyncSessionLocal() as session:
+            query = select(model.id).order_by(model.created_at, model.id)
+            result = await session.stream(query.execution_options(yield_per=chunk_size))
+            async for partition in result.partitions():
+                await queue.enqueue(BATCH_TASKS[kind], [str(row.id) for row in partition], lane=BACKFILL)
+                enqueued += len(partition)
+    finally:
+        await redis.aclose()
+
+    logger.info(f"Enqueued {enqueued} {kind} on the {BACKFILL} lane")
+    return enqueued
+
+
+def run() -> None:
+    """Entrypoint for `poetry run kedb-reindex`."""
+    parser = argparse.ArgumentParser(description="Rebuild Meilisearch documents and embeddings.")
+    parser.add_argument("--only", choices=sorted(TARGETS), help="Reindex a single kind")
+    parser.add_argument("--chunk-size", type=int, default=settings.reindex_chunk_size)
+    parser.add_argument("--concurrency", type=int, default=settings.reindex_concurrency)
+    parser.add_argument("--reset", action="store_true", help="Ignore any saved checkpoint")
+    parser.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Queue chunks on the worker backfill lane instead of indexing in this process",
+    )
+    parser.add_argument("--queue", default=settings.rq_default_queue)
+    args = parser.parse_args()
+
+    setup_logging(settings.log_level)
+    kinds = [args.only] if args.only else list(TARGETS)
+
+    async def main() -> bool:
+        ok = True
+        for kind in kinds:
+            if args.enqueue:
+                await enqueue_backfill(kind, chunk_size=args.chunk_size, queue_name=args.queue)
+                continue
+            try:
+                await reindex(kind, chunk_size=args.chunk_size, concurrency=args.concurrency, reset=args.reset)
+            except ReindexError as e:
+                logger.error(f"Reindex of {kind} incomplete: {e}")
+                ok = False
+        return ok
+
+    if not asyncio.run(main()):
+        sys.exit(1)
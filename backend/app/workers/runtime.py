@@ -0,0 +1,185 @@
+"""Native asyncio worker: one event loop, one connection pool, shared clients."""
+import argparse
+import asyncio
+import signal
+import time
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.core.database import async_engine
+from app.core.logging import logger, setup_logging
+from app.core.metrics import collect_stages
+from app.workers.context import WorkerContext
+from app.workers.indexing_worker import TASKS
+from app.workers.metrics import JOB_SECONDS, JOB_WAIT_SECONDS, JOBS, MetricsReporter
+from app.workers.outbox import OutboxDispatcher
+from app.workers.queue import Job, JobQueue
+from app.workers.reconcile import Reconciler
+from app.workers.scheduler import IndexScheduler
+from app.workers.stats import StatsViewRefresher
+from app.workers.vector_index import VectorIndexRefresher
+
+
+class AsyncWorker:
+    """
+    Pull jobs from a ``JobQueue`` and run them on the current event loop.
+
+    Unlike ``rq worker``, which forks and calls ``asyncio.run`` per job, the
+    loop, the SQLAlchemy pool and the HTTP clients in ``context`` live for
+    the whole process. Up to ``concurrency`` jobs run at once; a new job is
+    only dequeued when a slot is free, so unclaimed work stays in Redis.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        context: WorkerContext,
+        tasks: Optional[Dict[str, Callable[..., Awaitable[None]]]] = None,
+        poll_timeout: float = 1.0,
+        concurrency: int = 1,
+    ):
+        self.queue = queue
+        self.context = context
+        self.tasks = tasks if tasks is not None else TASKS
+        self.poll_timeout = poll_timeout
+        self.concurrency = concurrency
+        self._stopping = asyncio.Event()
+        self._slots = asyncio.Semaphore(concurrency)
+        self._running: Set[asyncio.Task] = set()
+
+    def stop(self) -> None:
+        """Stop dequeuing; ``run`` returns once in-flight jobs finish."""
+        self._stopping.set()
+
+    async def run(self) -> None:
+        logger.info(f"Worker listening on queue {self.queue.name} (concurrency {self.concurrency})")
+        while not self._stopping.is_set():
+            await self._slots.acquire()
+            try:
+                job = None
+                if not self._stopping.is_set():
+                    job = await self.queue.dequeue(timeout=self.poll_timeout)
+            except BaseException:
+                self._slots.release()
+                raise
+            if job is None:
+                self._slots.release()
+                continue
+
+            task = asyncio.create_task(self._execute_in_slot(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+        if self._running:
+            await asyncio.gather(*self._running)
+        logger.info("Worker stopped")
+
+    async def _execute_in_slot(self, job: Job) -> None:
+        try:
+            await self.execute(job)
+        finally:
+            self._slots.release()
+
+    async def execute(self, job: Job) -> bool:
+        """
+        Run one job; failures are logged and dead-lettered, never raised.
+
+        Transient provider errors are already retried inside the clients, so
+        a job that raises here has exhausted its retries. Returns success.
+
+        Every job is counted by outcome, and its wait, duration and per-stage
+        timings (fetch, embed, Meilisearch, DB flush) are logged as fields.
+        """
+        JOB_WAIT_SECONDS.observe(max(0.0, time.time() - job.enqueued_at), lane=job.lane)
+        handler = self.tasks.get(job.task)
+        if handler is None:
+            logger.error(f"Unknown task {job.task} for job {job.id}")
+            JOBS.inc(task=job.task, lane=job.lane, outcome="unknown_task")
+            await self.queue.dead_letter(job, f"Unknown task {job.task}")
+            return False
+
+        started = time.perf_counter()
+        error: Optional[Exception] = None
+        with collect_stages() as stages:
+            try:
+                await handler(self.context, *job.args)
+            except Exception as e:
+                error = e
+
+        elapsed = time.perf_counter() - started
+        JOB_SECONDS.observe(elapsed, task=job.task)
+        JOBS.inc(task=job.task, lane=job.lane, outcome="failure" if error else "success")
+        fields = {
+            "task": job.task,
+            "job_id": job.id,
+            "lane": job.lane,
+            "duration_ms": round(elapsed * 1000, 1),
+            "stages_ms": {stage: round(seconds * 1000, 1) for stage, seconds in stages.items()},
+        }
+
+        if error is not None:
+            logger.error(f"Failed {job.task} job {job.id}, moved to dead-letter queue: {error}", **fields)
+            await self.queue.dead_letter(job, f"{type(error).__name__}: {error}")
+            return False
+
+        logger.info(f"Completed {job.task} job {job.id} in {fields['duration_ms']}ms", **fields)
+        return True
+
+
+async def serve(queue_name: str, concurrency: int) -> None:
+    """
+    Run a worker, the outbox dispatcher, the debounced index scheduler, the
+    periodic reconciler, the stats view and vector index refreshers and the
+    metrics endpoint until SIGINT/SIGTERM, then flush and close shared clients.
+    """
+    redis = Redis.from_url(settings.redis_url)
+    queue = JobQueue(redis, queue_name)
+    context = WorkerContext()
+    worker = AsyncWorker(queue, context, concurrency=concurrency)
+    scheduler = IndexScheduler(redis, queue)
+    dispatcher = OutboxDispatcher(context.session_factory, scheduler, context.meilisearch)
+    reporter = MetricsReporter(queue)
+    stopping = asyncio.Event()
+
+    def shutdown():
+        stopping.set()
+        worker.stop()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, shutdown)
+
+    await context.start()
+    try:
+        background = [worker.run(), dispatcher.run(stopping), scheduler.run(stopping)]
+        if settings.worker_metrics_port > 0:
+            background.append(
+                reporter.serve(stopping, settings.worker_metrics_host, settings.worker_metrics_port)
+            )
+        if settings.worker_metrics_log_interval_seconds > 0:
+            background.append(reporter.run(stopping, settings.worker_metrics_log_interval_seconds))
+        if settings.stats_view_refresh_seconds > 0:
+            background.append(StatsViewRefresher(context.session_factory).run(stopping))
+        if settings.vector_index_dir and settings.vector_index_refresh_seconds > 0:
+            background.append(VectorIndexRefresher(context).run(stopping))
+        if settings.reconcile_interval_seconds > 0:
+            reconciler = Reconciler(context.session_factory, context.meilisearch, queue)
+            background.append(reconciler.run(redis, stopping, settings.reconcile_interval_seconds))
+        await asyncio.gather(*background)
+    finally:
+        await context.aclose()
+        await redis.aclose()
+        await async_engine.dispose()
+
+
+def run() -> None:
+    """Entrypoint for `poetry run kedb-worker`."""
+    parser = argparse.ArgumentParser(description="Run the native async indexing worker.")
+    parser.add_argument("--queue", default=settings.rq_default_queue)
+    parser.add_argument("--concurrency", type=int, default=settings.worker_concurrency)
+    args = parser.parse_args()
+
+    setup_logging(settings.log_level)
+    asyncio.run(serve(args.queue, args.concurrency))
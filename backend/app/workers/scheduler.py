@@ -0,0 +1,119 @@
+"""Debounced, coalescing indexing schedule backed by a Redis sorted set."""
+import asyncio
+import time
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.workers.queue import INTERACTIVE, LANES, JobQueue
+
+PENDING_KEY = "kedb:index:pending:{lane}"
+
+# Entity type -> batch task that indexes it
+BATCH_TASKS = {
+    "entries": "index_entries",
+    "solutions": "index_solutions",
+}
+
+
+class IndexScheduler:
+    """
+    Coalesce index requests per ``(entity_type, entity_id)``.
+
+    ``schedule`` adds ``"<type>:<id>"`` to the lane's sorted set scored by
+    its due time, only if it is not already pending (``ZADD NX``). Repeated
+    edits inside the debounce window therefore collapse into one item and
+    the first edit bounds the delay. ``dispatch_due`` claims due members and
+    enqueues them as batch jobs on the same lane; the job reads the latest
+    row state, so only that state is indexed. An edit made after the claim
+    schedules a fresh item.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        queue: JobQueue,
+        *,
+        debounce_ms: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self.redis = redis
+        self.queue = queue
+        self.debounce_ms = settings.index_debounce_ms if debounce_ms is None else debounce_ms
+        self.batch_size = batch_size or settings.index_batch_size
+
+    async def schedule(self, entity_type: str, ids: Iterable[UUID], lane: str = INTERACTIVE) -> None:
+        """Mark entities as needing a reindex once the debounce window passes."""
+        if entity_type not in BATCH_TASKS:
+            raise ValueError(f"Unknown entity type: {entity_type}")
+        if lane not in LANES:
+            raise ValueError(f"Unknown lane: {lane}")
+        due = time.time() + self.debounce_ms / 1000
+        members = {f"{entity_type}:{entity_id}": due for entity_id in ids}
+        if members:
+            await self.redis.zadd(PENDING_KEY.format(lane=lane), members, nx=True)
+
+    async def claim_due(
+        self, lane: str = INTERACTIVE, now: Optional[float] = None, limit: int = 1000
+    ) -> Dict[str, List[str]]:
+        """
+        Remove and return up to ``limit`` due items of one lane, grouped by entity type.
+
+        Each member is claimed by its own ``ZREM`` in one pipeline; only
+        members this call actually removed are returned, so concurrent
+        schedulers never dispatch the same item twice.
+        """
+        key = PENDING_KEY.format(lane=lane)
+        now = time.time() if now is None else now
+        members = await self.redis.zrangebyscore(key, "-inf", now, start=0, num=limit)
+        if not members:
+            return {}
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for member in members:
+                pipe.zrem(key, member)
+            removed = await pipe.execute()
+
+        claimed: Dict[str, List[str]] = {}
+        for member, was_removed in zip(members, removed):
+            if not was_removed:
+                continue
+            if isinstance(member, bytes):
+                member = member.decode()
+            entity_type, entity_id = member.split(":", 1)
+            claimed.setdefault(entity_type, []).append(entity_id)
+        return claimed
+
+    async def dispatch_due(self, now: Optional[float] = None) -> int:
+        """Enqueue batch jobs for every due item, lane by lane; returns the number of items dispatched."""
+        dispatched = 0
+        for lane in LANES:
+            claimed = await self.claim_due(lane, now)
+            for entity_type, ids in claimed.items():
+                for start in range(0, len(ids), self.batch_size):
+                    await self.queue.enqueue(
+                        BATCH_TASKS[entity_type], ids[start:start + self.batch_size], lane=lane
+                    )
+                dispatched += len(ids)
+        if dispatched:
+            logger.info(f"Dispatched {dispatched} debounced index items")
+        return dispatched
+
+    async def pending(self) -> int:
+        return sum([await self.redis.zcard(PENDING_KEY.format(lane=lane)) for lane in LANES])
+
+    async def run(self, stopping: asyncio.Event, interval_ms: Optional[int] = None) -> None:
+        """Dispatch due items every ``interval_ms`` until ``stopping`` is set."""
+        interval = (interval_ms or settings.index_scheduler_interval_ms) / 1000
+        while not stopping.is_set():
+            try:
+                await self.dispatch_due()
+            except Exception as e:
+                logger.error(f"Index scheduler tick failed: {e}")
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
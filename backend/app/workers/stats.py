@@ -0,0 +1,42 @@
+"""Background refresh of the dashboard stats materialized view."""
+import asyncio
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import span
+from app.repositories.stats_repo import StatsRepository
+
+
+class StatsViewRefresher:
+    """
+    Refresh ``entry_stats`` every ``interval_seconds``.
+
+    ``REFRESH ... CONCURRENTLY`` keeps the view readable throughout, and only
+    one worker refreshes at a time; the rest skip their turn.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, *, interval_seconds: Optional[int] = None):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds or settings.stats_view_refresh_seconds
+
+    async def refresh_once(self) -> bool:
+        async with self.session_factory() as session:
+            with span("stats_refresh"):
+                refreshed = await StatsRepository(session).refresh_view()
+            await session.commit()
+        return refreshed
+
+    async def run(self, stopping: asyncio.Event) -> None:
+        """Refresh until ``stopping`` is set."""
+        while not stopping.is_set():
+            try:
+                await self.refresh_once()
+            except Exception as e:
+                logger.error(f"Stats view refresh failed: {e}")
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
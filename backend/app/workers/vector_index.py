@@ -0,0 +1,39 @@
+"""Background refresh of the in-process vector indexes."""
+import asyncio
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import span
+from app.workers.context import WorkerContext
+from app.workers.indexing_worker import refresh_vector_index
+
+
+class VectorIndexRefresher:
+    """
+    Refresh the on-disk vector indexes every ``interval_seconds``.
+
+    API processes on the host pick up each refresh on their next search, so
+    embeddings written by the indexing jobs become searchable within one
+    interval, and withdrawn ones stop matching.
+    """
+
+    def __init__(self, context: WorkerContext, *, interval_seconds: Optional[int] = None):
+        self.context = context
+        self.interval_seconds = interval_seconds or settings.vector_index_refresh_seconds
+
+    async def refresh_once(self) -> None:
+        with span("vector_index_refresh"):
+            await refresh_vector_index(self.context)
+
+    async def run(self, stopping: asyncio.Event) -> None:
+        """Refresh until ``stopping`` is set."""
+        while not stopping.is_set():
+            try:
+                await self.refresh_once()
+            except Exception as e:
+                logger.error(f"Vector index refresh failed: {e}")
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
@@ -5,6 +5,8 @@ from typing import AsyncGenerator
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient
+from sqlalchemy import delete
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
@@ -13,6 +15,7 @@ from app.core.config import settings
 from app.core.database import get_db
 from app.main import app
 from app.models.base import Base
+from app.models.outbox import OutboxEvent
 
 # Test database URL (use a separate test database)
 # Explicitly construct to avoid URL parsing issues
@@ -74,3 +77,120 @@ async def async_client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient,
         yield client
 
     app.dependency_overrides.clear()
+
+
+@pytest_asyncio.fixture(scope="function")
+async def committing_sessions() -> AsyncGenerator[sessionmaker, None]:
+    """
+    Session factory on the test database whose commits are real.
+
+    For transactional paths that need several connections to see each
+    other's commits (row locks, commit vs rollback), which the rolled-back
+    ``db_session`` cannot show. ``outbox_events`` is emptied before and
+    after. Skips when the test database is unreachable.
+    """
+    try:
+        async with test_engine.begin() as connection:
+            await connection.execute(delete(OutboxEvent))
+    except (OSError, DBAPIError) as e:
+        pytest.skip(f"Test database unavailable: {e}")
+
+    yield TestSessionLocal
+
+    async with test_engine.begin() as connection:
+        await connection.execute(delete(OutboxEvent))
+
+
+class FakeResult:
+    """Result double answering the accessors the repositories use."""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+
+    def all(self):
+        return self.rows
+
+    def scalars(self):
+        return self
+
+    def scalar_one(self):
+        return self.rows[0]
+
+    def scalar_one_or_none(self):
+        return self.rows[0] if self.rows else None
+
+
+class FakeStreamResult:
+    """Streamed result double yielding fixed partitions."""
+
+    def __init__(self, partitions):
+        self._partitions = partitions
+
+    async def partitions(self):
+        for partition in self._partitions:
+            yield partition
+
+
+class FakeSession:
+    """
+    ``AsyncSession`` double shared by the unit tests.
+
+    Records each executed statement with its parameters in ``calls`` and
+    answers with the queued ``results`` in order, then with ``default``.
+    A result is a list of rows, or a callable taking (statement, params)
+    that returns one; ``stream`` yields every queued result as a partition.
+    Counts flushes, commits and rollbacks and works as ``async with``.
+    """
+
+    def __init__(self, *results, default=()):
+        self.results = list(results)
+        self.default = default
+        self.calls = []
+        self.added = []
+        self.flushes = self.commits = self.rollbacks = 0
+
+    @property
+    def statements(self):
+        return [statement for statement, _ in self.calls]
+
+    @property
+    def committed(self) -> bool:
+        return self.commits > 0
+
+    @property
+    def rolled_back(self) -> bool:
+        return self.rollbacks > 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def execute(self, statement, params=None, **kwargs):
+        self.calls.append((statement, params))
+        rows = self.results.pop(0) if self.results else self.default
+        return FakeResult(rows(statement, params) if callable(rows) else rows)
+
+    async def stream(self, statement):
+        self.calls.append((statement, None))
+        partitions, self.results = self.results, []
+        return FakeStreamResult(partitions)
+
+    async def flush(self):
+        self.flushes += 1
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def fake_session():
+    """The ``FakeSession`` class, to build sessions or pass as a session factory."""
+    return FakeSession
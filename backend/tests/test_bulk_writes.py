@@ -0,0 +1,105 @@
+"""Tests for bulk repository writes."""
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.dml import Insert, Update
+
+from app.models.entry import Entry, EntrySymptom
+from app.models.embedding import EntryEmbedding
+from app.repositories.base import BaseRepository
+from app.repositories.embedding_repo import EmbeddingRepository
+from app.repositories.entry_repo import EntryRepository
+
+
+def _echo_inserts(statement, params):
+    """Session answer that returns inserted rows as objects, as RETURNING would."""
+    if not isinstance(statement, Insert):
+        return []
+    model = statement.table.entity_namespace
+    return [model(id=uuid4(), **row) for row in params or []]
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_create_with_symptoms_takes_constant_statements(fake_session):
+    """Test that an entry with 20 symptoms is written in two INSERT ... RETURNING statements."""
+    session = fake_session(default=_echo_inserts)
+    symptoms = [{"description": f"symptom {i}", "order_index": i} for i in range(20)]
+
+    entry = await EntryRepository(session).create_with_symptoms(
+        {"title": "Disk full", "description": "d", "severity": "high", "created_by": "u"}, symptoms
+    )
+
+    assert len(session.calls) == 2
+    (entry_insert, entry_rows), (symptom_insert, symptom_rows) = session.calls
+    assert "INSERT INTO entries" in _sql(entry_insert) and "RETURNING" in _sql(entry_insert)
+    assert "INSERT INTO entry_symptoms" in _sql(symptom_insert)
+    assert len(symptom_rows) == 20
+    assert {row["entry_id"] for row in symptom_rows} == {entry.id}
+
+
+@pytest.mark.asyncio
+async def test_bulk_helpers_skip_empty_input(fake_session):
+    """Test that empty bulk writes do not reach the database."""
+    session = fake_session(default=_echo_inserts)
+    repo = BaseRepository(Entry, session)
+
+    assert await repo.bulk_create([]) == []
+    assert await repo.bulk_upsert([], ["id"]) == []
+    await repo.bulk_update([])
+
+    assert session.calls == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_is_one_executemany_by_primary_key(fake_session):
+    """Test that bulk updates send every row with a single UPDATE statement."""
+    session = fake_session(default=_echo_inserts)
+    rows = [{"id": uuid4(), "order_index": i} for i in range(3)]
+
+    await BaseRepository(EntrySymptom, session).bulk_update(rows)
+
+    [(statement, params)] = session.calls
+    assert isinstance(statement, Update)
+    assert params == rows
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_updates_non_key_columns_and_bumps_updated_at(fake_session):
+    """Test that the upsert sets the non-key columns from EXCLUDED and refreshes updated_at."""
+    session = fake_session(default=_echo_inserts)
+    rows = [{"entry_id": uuid4(), "model_name": "m", "dimension": 3, "content_hash": "h", "embedding": [0.0] * 3}]
+
+    await BaseRepository(EntryEmbedding, session).bulk_upsert(rows, ["entry_id", "model_name"])
+
+    [(statement, _)] = session.calls
+    sql = _sql(statement)
+    assert "ON CONFLICT (entry_id, model_name) DO UPDATE SET" in sql
+    assert "dimension = excluded.dimension" in sql
+    assert "content_hash = excluded.content_hash" in sql
+    assert "updated_at = now()" in sql
+    assert "model_name = excluded" not in sql
+    assert "RETURNING" in sql
+
+
+@pytest.mark.asyncio
+async def test_embedding_upserts_go_through_bulk_upsert(fake_session):
+    """Test that embedding upserts are one shared bulk_upsert statement per table."""
+    session = fake_session(default=_echo_inserts)
+    row = {"model_name": "m", "dimension": 3, "content_hash": "h", "embedding": [0.0] * 3}
+    repo = EmbeddingRepository(session)
+
+    await repo.upsert_entry_embeddings([{"entry_id": uuid4(), **row}])
+    await repo.upsert_solution_embeddings([{"solution_id": uuid4(), **row}])
+
+    entry_sql, solution_sql = (_sql(statement) for statement, _ in session.calls)
+    assert "ON CONFLICT (entry_id, model_name) DO UPDATE SET" in entry_sql
+    assert "ON CONFLICT (solution_id, model_name) DO UPDATE SET" in solution_sql
+    for sql in (entry_sql, solution_sql):
+        assert "embedding = excluded.embedding" in sql
+        assert "updated_at = now()" in sql
+        assert "RETURNING" in sql
@@ -0,0 +1,73 @@
+"""Tests for listing totals: exact, estimated and cached counts."""
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.exceptions import ValidationError
+from app.repositories import base as base_module
+from app.repositories.base import CountCache, _Explain
+from app.repositories.entry_repo import EntryRepository
+from app.services.entry_service import EntryService
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_count_cache_expires_after_ttl():
+    """Test that a cached total is served until its TTL and then recomputed."""
+    clock = _Clock()
+    cache = CountCache(ttl_seconds=30, clock=clock)
+    cache.set(("entries", ()), 42)
+
+    clock.now = 29.9
+    assert cache.get(("entries", ())) == 42
+    clock.now = 30.0
+    assert cache.get(("entries", ())) is None
+
+
+@pytest.mark.asyncio
+async def test_estimate_uses_explain_row_estimate_for_filtered_counts(fake_session):
+    """Test that a filtered estimate reads Plan Rows from EXPLAIN instead of counting."""
+    session = fake_session(['[{"Plan": {"Node Type": "Index Only Scan", "Plan Rows": 1234}}]'])
+
+    total = await EntryRepository(session).estimate_count({"severity": "high", "created_by": None})
+
+    assert total == 1234
+    [statement] = session.statements
+    assert isinstance(statement, _Explain)
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT entries.id")
+    assert "entries.severity = %(severity_1)s" in sql
+
+
+@pytest.mark.asyncio
+async def test_unfiltered_estimate_falls_back_to_count_before_analyze(fake_session):
+    """Test that a never-analysed table (no reltuples) is counted exactly."""
+    session = fake_session([None], [7])
+
+    assert await EntryRepository(session).estimate_count() == 7
+    assert "pg_class" in str(session.statements[0])
+
+
+@pytest.mark.asyncio
+async def test_cached_total_reuses_count_for_same_filters(monkeypatch, fake_session):
+    """Test that repeated listings with the same filters run one count."""
+    monkeypatch.setattr(base_module, "count_cache", CountCache(ttl_seconds=30))
+    session = fake_session([5], [9])
+    repo = EntryRepository(session)
+
+    assert await repo.total({"severity": "high"}, "cached") == 5
+    assert await repo.total({"severity": "high", "created_by": None}, "cached") == 5
+    assert await repo.total({"severity": "low"}, "cached") == 9
+    assert len(session.statements) == 2
+
+
+@pytest.mark.asyncio
+async def test_list_entries_rejects_unknown_total_mode():
+    """Test that an unsupported total_mode is a validation error."""
+    with pytest.raises(ValidationError):
+        await EntryService(db=None).list_entries(total_mode="guess")
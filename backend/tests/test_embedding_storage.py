@@ -0,0 +1,111 @@
+"""Tests for the embedding storage mode, the HNSW migration and ef_search plumbing."""
+import importlib.util
+from pathlib import Path
+
+import pytest
+from pgvector.sqlalchemy import HALFVEC, Vector
+from sqlalchemy import Column, MetaData, Table
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app.core.config import settings
+from app.models.embedding import embedding_column_type, hnsw_index
+from app.repositories.embedding_repo import EmbeddingRepository
+
+MIGRATION = (
+    Path(__file__).resolve().parent.parent / "alembic" / "versions" / "6c1d2e8a4b7f_hnsw_indexes_on_embeddings.py"
+)
+
+
+class _RecordingOp:
+    """Stands in for ``alembic.op`` and keeps the SQL each step would run."""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(str(statement))
+
+
+@pytest.fixture
+def migration(monkeypatch):
+    """The HNSW migration module with ``op`` replaced by a recorder."""
+    spec = importlib.util.spec_from_file_location("hnsw_migration", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, "op", _RecordingOp())
+    return module
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+@pytest.mark.parametrize("storage, column_type", [("vector", Vector), ("halfvec", HALFVEC)])
+def test_storage_mode_selects_column_type_and_operator_class(monkeypatch, storage, column_type):
+    """Test that embedding_storage switches both the column type and the HNSW operator class."""
+    monkeypatch.setattr(settings, "embedding_storage", storage)
+    monkeypatch.setattr(settings, "embedding_dimensions", 1024)
+
+    assert isinstance(embedding_column_type(), column_type)
+    assert embedding_column_type().dim == 1024
+
+    index = hnsw_index("ix_embeddings_hnsw")
+    Table("embeddings", MetaData(), Column("embedding", embedding_column_type()), index)
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    assert f"USING hnsw (embedding {storage}_cosine_ops)" in ddl
+
+
+def test_upgrade_converts_to_the_configured_storage(migration, monkeypatch):
+    """Test that upgrade truncates, re-normalises and indexes with the configured storage mode."""
+    monkeypatch.setattr(settings, "embedding_storage", "halfvec")
+    monkeypatch.setattr(settings, "embedding_dimensions", 3072)
+
+    migration.upgrade()
+
+    alter, _, create = migration.op.statements[:3]
+    assert alter == (
+        "ALTER TABLE entry_embeddings ALTER COLUMN embedding TYPE halfvec(3072) "
+        "USING l2_normalize(subvector(embedding, 1, 3072))::halfvec(3072)"
+    )
+    assert "USING hnsw (embedding halfvec_cosine_ops)" in create
+    assert f"m = {settings.hnsw_m}, ef_construction = {settings.hnsw_ef_construction}" in create
+    assert len(migration.op.statements) == 6
+
+
+@pytest.mark.parametrize("storage, dims", [("vector", 2001), ("halfvec", 4001), ("bit", 64)])
+def test_upgrade_refuses_unindexable_storage(migration, monkeypatch, storage, dims):
+    """Test that sizes pgvector cannot HNSW-index, and unknown modes, fail before any DDL."""
+    monkeypatch.setattr(settings, "embedding_storage", storage)
+    monkeypatch.setattr(settings, "embedding_dimensions", dims)
+
+    with pytest.raises(ValueError):
+        migration.upgrade()
+    assert migration.op.statements == []
+
+
+def test_downgrade_drops_embeddings_it_cannot_widen(migration):
+    """Test that the lossy downgrade deletes stored vectors instead of leaving NULL embeddings."""
+    migration.downgrade()
+
+    assert migration.op.statements[:3] == [
+        "DROP INDEX IF EXISTS ix_entry_embeddings_embedding_hnsw",
+        "DELETE FROM entry_embeddings",
+        "ALTER TABLE entry_embeddings ALTER COLUMN embedding TYPE vector(3072) USING NULL",
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ef_search, expected", [(None, "40"), (200, "200")])
+async def test_ef_search_is_set_for_the_transaction(monkeypatch, fake_session, ef_search, expected):
+    """Test that searches set hnsw.ef_search transaction-locally, from settings or the caller."""
+    monkeypatch.setattr(settings, "hnsw_ef_search", 40)
+    vector = [0.1] * settings.embedding_dimensions
+
+    for search in ("search_entries", "search_solutions"):
+        session = fake_session()
+        await getattr(EmbeddingRepository(session), search)(vector, limit=5, ef_search=ef_search)
+
+        set_config, query = (_sql(statement) for statement in session.statements)
+        assert set_config == f"SELECT set_config('hnsw.ef_search', '{expected}', true) AS set_config_1"
+        assert "ORDER BY" in query and "<=>" in query
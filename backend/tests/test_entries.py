@@ -61,6 +61,46 @@ async def test_list_entries(async_client: AsyncClient):
     assert len(data["items"]) >= 3
 
 
+@pytest.mark.asyncio
+async def test_list_entries_with_cursor(async_client: AsyncClient):
+    """Test that following next_cursor visits every entry exactly once."""
+    for i in range(5):
+        await async_client.post(
+            "/api/v1/entries/?created_by=cursor_user",
+            json={"title": f"Cursor Entry {i}", "description": "Paged", "severity": "low"}
+        )
+
+    seen = []
+    params = {"created_by": "cursor_user", "limit": 2}
+    while True:
+        response = await async_client.get("/api/v1/entries/", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        seen.extend(item["id"] for item in data["items"])
+        if not data["next_cursor"]:
+            break
+        params["cursor"] = data["next_cursor"]
+
+    assert len(seen) == len(set(seen)) == 5
+
+    response = await async_client.get("/api/v1/entries/?cursor=garbage")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_entries_total_modes(async_client: AsyncClient):
+    """Test that every total_mode returns a total and reports the mode used."""
+    for mode in ("exact", "estimate", "cached"):
+        response = await async_client.get(f"/api/v1/entries/?severity=low&total_mode={mode}")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_mode"] == mode
+        assert data["total"] >= 0
+
+    response = await async_client.get("/api/v1/entries/?total_mode=guess")
+    assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_get_entry(async_client: AsyncClient):
     """Test getting a single entry."""
@@ -185,3 +225,40 @@ async def test_add_symptom_to_entry(async_client: AsyncClient):
     data = response.json()
     assert data["description"] == "New symptom observed"
     assert data["entry_id"] == entry_id
+
+
+@pytest.mark.asyncio
+async def test_write_path_sql_count_halved(db_session: AsyncSession, monkeypatch):
+    """Test that writes get server defaults via RETURNING instead of a follow-up SELECT."""
+    from sqlalchemy import event
+
+    from app.repositories.base import BaseRepository
+    from app.repositories.entry_repo import EntryRepository
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.bind.engine.sync_engine
+    repo = EntryRepository(db_session)
+    entry = await repo.create(
+        {"title": "Counted", "description": "Counting SQL", "severity": "low", "created_by": "test_user"}
+    )
+
+    counts = {}
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        for refresh_on_write in (True, False):
+            monkeypatch.setattr(BaseRepository, "refresh_on_write", refresh_on_write)
+            statements.clear()
+            symptom = await repo.add_symptom(entry.id, {"description": "s", "order_index": 0})
+            await repo.update(entry.id, {"title": f"Counted {refresh_on_write}"})
+            counts[refresh_on_write] = len(statements)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert symptom.created_at is not None
+    assert entry.updated_at is not None
+    # add_symptom: INSERT (+ SELECT); update: SELECT + UPDATE (+ SELECT)
+    assert counts == {True: 5, False: 3}
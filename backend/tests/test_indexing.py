@@ -0,0 +1,392 @@
+"""Tests for batched embedding generation."""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import EmbeddingError, SearchIndexError
+from app.services.embedding_cache import EmbeddingCache, LRUCache, close_embedding_cache, content_hash
+from app.services.embedding_provider import EmbeddingProvider, HashingEmbeddingProvider, OpenAIEmbeddingProvider
+from app.services.indexing_service import IndexingService, entry_embedding_text, pack_batches, solution_document
+from app.workers.indexing_worker import run_indexing
+
+
+def test_pack_batches_respects_item_budget():
+    """Test that batches never exceed the item budget."""
+    batches = pack_batches(["x"] * 5, max_items=2, max_tokens=1000)
+    assert batches == [[0, 1], [2, 3], [4]]
+
+
+def test_pack_batches_respects_token_budget():
+    """Test that batches split before the token budget is exceeded."""
+    texts = ["a" * 40, "b" * 40, "c" * 40]  # 11 estimated tokens each
+    batches = pack_batches(texts, max_items=100, max_tokens=25)
+    assert batches == [[0, 1], [2]]
+
+
+def test_pack_batches_oversized_text_gets_own_batch():
+    """Test that a text above the token budget is still sent alone."""
+    batches = pack_batches(["a" * 400, "b"], max_items=100, max_tokens=10)
+    assert batches == [[0], [1]]
+
+
+class _RecordingProvider(EmbeddingProvider):
+    """Records calls and embeds each text as its length."""
+
+    def __init__(self):
+        super().__init__(dimensions=1)
+        self.calls = []
+
+    async def embed(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+
+def _service_with_fake_provider():
+    fake = _RecordingProvider()
+    service = IndexingService(db=None, embedding_provider=fake)
+    service.embedding_cache = EmbeddingCache(local=LRUCache(100))
+    return service, fake
+
+
+@pytest.mark.asyncio
+async def test_embed_texts_batches_and_keeps_positions(monkeypatch):
+    """Test that many texts share requests and vectors land at their positions."""
+    monkeypatch.setattr(settings, "embedding_batch_max_items", 3)
+    service, fake = _service_with_fake_provider()
+
+    texts = ["a" * n for n in range(1, 8)]
+    vectors = await service.embed_texts(texts)
+
+    assert len(fake.calls) == 3
+    assert vectors == [[float(n)] for n in range(1, 8)]
+
+
+def test_content_hash_ignores_whitespace_only_changes():
+    """Test that reformatting does not change the hash but content edits do."""
+    assert content_hash("Disk full\n\non  /var") == content_hash("Disk full on /var ")
+    assert content_hash("Disk full on /var") != content_hash("Disk full on /tmp")
+
+
+@pytest.mark.asyncio
+async def test_embed_texts_serves_cached_hashes_without_provider_call():
+    """Test that previously embedded text is not sent to the provider again."""
+    service, fake = _service_with_fake_provider()
+
+    first = await service.embed_texts(["same text", "other"])
+    second = await service.embed_texts(["same  text", "new text"])
+
+    assert fake.calls == [["same text", "other"], ["new text"]]
+    assert second[0] == first[0]
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test LRU eviction order."""
+    cache = LRUCache(2)
+    cache.set("a", [1.0])
+    cache.set("b", [2.0])
+    cache.get("a")
+    cache.set("c", [3.0])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0]
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_hashing_provider_is_deterministic_and_normalized():
+    """Test that the local provider is stable, unit-length and sized as configured."""
+    provider = HashingEmbeddingProvider(dimensions=256)
+    first, second = await provider.embed(["Disk full on /var", "Disk full on /var"])
+
+    assert len(first) == 256
+    assert first == second
+    assert sum(v * v for v in first) == pytest.approx(1.0, rel=1e-5)
+
+
+@pytest.mark.asyncio
+async def test_hashing_provider_ranks_similar_text_higher():
+    """Test that lexical overlap shows up as cosine similarity."""
+    provider = HashingEmbeddingProvider(dimensions=512)
+    query, near, far = await provider.embed([
+        "postgres connection timeout after deploy",
+        "connection timeout to postgres after a deploy",
+        "certificate expired on load balancer",
+    ])
+
+    def cosine(a, b):
+        return sum(x * y for x, y in zip(a, b))
+
+    assert cosine(query, near) > cosine(query, far)
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_orders_by_response_index():
+    """Test that out-of-order API items are mapped back to input order."""
+    provider = OpenAIEmbeddingProvider("key", "text-embedding-3-large", 2)
+
+    async def create(model, input, dimensions):
+        data = [SimpleNamespace(index=i, embedding=[float(i)]) for i in range(len(input))]
+        return SimpleNamespace(data=list(reversed(data)))
+
+    provider.client = SimpleNamespace(embeddings=SimpleNamespace(create=create))
+    assert await provider.embed(["a", "b", "c"]) == [[0.0], [1.0], [2.0]]
+
+
+def test_openai_provider_leaves_retries_to_the_rate_limiter():
+    """Test that the SDK client never retries on its own, outside the token buckets."""
+    assert OpenAIEmbeddingProvider("key", "text-embedding-3-large", 2).client.max_retries == 0
+
+
+def test_solution_document_flattens_steps_and_rolls_up_entry_fields():
+    """Test that solution documents carry ordered steps, commands and parent filters."""
+    entry = SimpleNamespace(severity="high", workflow_state="published")
+    solution = SimpleNamespace(
+        id=uuid4(),
+        entry_id=uuid4(),
+        title="Rotate logs",
+        description="Free disk space",
+        solution_type="workaround",
+        prerequisites=None,
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        entry=entry,
+        steps=[
+            SimpleNamespace(order_index=1, action="Restart", command="systemctl restart app", rollback_command=None),
+            SimpleNamespace(order_index=0, action="Rotate", command="logrotate -f /etc/logrotate.conf", rollback_command=None),
+        ],
+    )
+
+    document = solution_document(solution)
+
+    assert document["steps"] == ["Rotate", "Restart"]
+    assert document["commands"] == ["logrotate -f /etc/logrotate.conf", "systemctl restart app"]
+    assert (document["severity"], document["workflow_state"]) == ("high", "published")
+    assert document["entry_id"] == str(solution.entry_id)
+
+
+class _RecordingMeilisearch:
+    def __init__(self, fail_flush=False):
+        self.upserts = {}
+        self.deletes = {}
+        self.fail_flush = fail_flush
+        self.flushes = 0
+
+    async def queue_upsert(self, index, documents):
+        self.upserts.setdefault(index, []).extend(doc["id"] for doc in documents)
+
+    async def queue_delete(self, index, ids):
+        self.deletes.setdefault(index, []).append(list(ids))
+
+    async def flush(self):
+        self.flushes += 1
+        if self.fail_flush:
+            raise SearchIndexError("Meilisearch did not accept 1 upserts to entries")
+
+
+class _RecordingEmbeddingRepo:
+    def __init__(self):
+        self.deleted = {}
+
+    async def delete_entry_embeddings(self, ids):
+        self.deleted.setdefault("entries", []).append(list(ids))
+
+    async def delete_solution_embeddings(self, ids):
+        self.deleted.setdefault("solutions", []).append(list(ids))
+
+
+class _RecordingWatermarks:
+    def __init__(self):
+        self.recorded = []
+
+    async def record(self, entity_type, backend, versions):
+        self.recorded.append((entity_type, backend, sorted(entity_id for entity_id, _ in versions)))
+
+
+def _entry(workflow_state):
+    return SimpleNamespace(
+        id=uuid4(),
+        title="Disk full",
+        description="Out of space",
+        symptoms=[],
+        severity="high",
+        workflow_state=workflow_state,
+        root_cause=None,
+        created_by="alice",
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        updated_at=datetime(2025, 1, 2, tzinfo=timezone.utc),
+    )
+
+
+def _solution(entry):
+    return SimpleNamespace(
+        id=uuid4(),
+        entry_id=entry.id,
+        entry=entry,
+        title="Rotate logs",
+        description="Free disk space",
+        solution_type="workaround",
+        prerequisites=None,
+        steps=[],
+        created_at=entry.created_at,
+        updated_at=entry.updated_at,
+    )
+
+
+@pytest.mark.asyncio
+async def test_index_entries_withdraws_retired_and_merged_entries_in_one_batch():
+    """Test that removed entries and their solutions are deleted per backend in one call each."""
+    live, retired, merged = _entry("published"), _entry("retired"), _entry("merged")
+    solutions = [_solution(live), _solution(retired), _solution(merged)]
+
+    async def get_entries(ids):
+        return [live, retired, merged]
+
+    async def get_solutions(entry_ids):
+        return solutions
+
+    meilisearch = _RecordingMeilisearch()
+    service = IndexingService(db=None, meilisearch=meilisearch, embedding_provider=_RecordingProvider())
+    service.entry_repo = SimpleNamespace(get_many_with_symptoms=get_entries)
+    service.solution_repo = SimpleNamespace(get_by_entries_with_steps=get_solutions)
+    service.embedding_repo = _RecordingEmbeddingRepo()
+    service.watermark_repo = _RecordingWatermarks()
+
+    async def no_embeddings(objs):
+        assert [obj.id for obj in objs] == [live.id]
+
+    service._generate_entry_embeddings = no_embeddings
+
+    await service.index_entries([live.id, retired.id, merged.id])
+
+    removed = sorted([str(retired.id), str(merged.id)])
+    removed_solutions = sorted(str(s.id) for s in solutions[1:])
+    assert sorted(map(str, meilisearch.deletes["entries"][0])) == removed
+    assert sorted(map(str, meilisearch.deletes["solutions"][0])) == removed_solutions
+    assert len(meilisearch.deletes["entries"]) == 1
+    assert len(meilisearch.deletes["solutions"]) == 1
+    assert meilisearch.upserts == {"entries": [str(live.id)], "solutions": [str(solutions[0].id)]}
+    assert sorted(map(str, service.embedding_repo.deleted["entries"][0])) == removed
+    assert sorted(map(str, service.embedding_repo.deleted["solutions"][0])) == removed_solutions
+    assert ("entries", "meilisearch", sorted([retired.id, merged.id])) in service.watermark_repo.recorded
+
+
+@pytest.mark.asyncio
+async def test_meilisearch_watermark_waits_for_accepted_flush():
+    """Test that a rejected flush fails the job and leaves the Meilisearch watermark behind."""
+    entry = _entry("published")
+
+    async def get_entries(ids):
+        return [entry]
+
+    async def get_solutions(entry_ids):
+        return []
+
+    meilisearch = _RecordingMeilisearch(fail_flush=True)
+    service = IndexingService(db=None, meilisearch=meilisearch)
+    service.embedding_provider = None
+    service.entry_repo = SimpleNamespace(get_many_with_symptoms=get_entries)
+    service.solution_repo = SimpleNamespace(get_by_entries_with_steps=get_solutions)
+    service.watermark_repo = _RecordingWatermarks()
+
+    with pytest.raises(SearchIndexError):
+        await service.index_entries([entry.id])
+    assert service.watermark_repo.recorded == []
+
+    meilisearch.fail_flush = False
+    await service.index_entries([entry.id])
+    assert service.watermark_repo.recorded == [("entries", "meilisearch", [entry.id])]
+
+
+class _FlakyProvider(_RecordingProvider):
+    """Fails every call that includes one of ``failing`` texts."""
+
+    def __init__(self, failing):
+        super().__init__()
+        self.failing = set(failing)
+
+    async def embed(self, texts):
+        self.calls.append(list(texts))
+        if self.failing & set(texts):
+            raise RuntimeError("rate limited")
+        return [[float(len(text))] for text in texts]
+
+
+class _TransactionalStore:
+    """Embedding rows that become visible to later jobs only once committed."""
+
+    def __init__(self):
+        self.committed = {}
+        self.staged = {}
+
+    async def get_entry_hashes(self, entry_ids):
+        return {i: self.committed[i]["content_hash"] for i in entry_ids if i in self.committed}
+
+    async def upsert_entry_embeddings(self, rows):
+        self.staged.update({row["entry_id"]: row for row in rows})
+
+    async def commit(self):
+        self.committed.update(self.staged)
+        self.staged.clear()
+
+    async def rollback(self):
+        self.staged.clear()
+
+
+@pytest.mark.asyncio
+async def test_partial_embedding_failure_keeps_stored_rows_for_the_retry(monkeypatch):
+    """Test that embeddings stored before a failure survive it and are not re-embedded on retry."""
+    monkeypatch.setattr(settings, "embedding_batch_max_items", 1)
+    good, bad = _entry("published"), _entry("published")
+    bad.title = "Flaky"
+    store = _TransactionalStore()
+    provider = _FlakyProvider([entry_embedding_text(bad)])
+
+    async def get_entries(ids):
+        return [good, bad]
+
+    async def get_solutions(entry_ids):
+        return []
+
+    async def attempt():
+        service = IndexingService(db=store, meilisearch=_RecordingMeilisearch(), embedding_provider=provider)
+        service.embedding_cache = EmbeddingCache(local=LRUCache(0))
+        service.entry_repo = SimpleNamespace(get_many_with_symptoms=get_entries)
+        service.solution_repo = SimpleNamespace(get_by_entries_with_steps=get_solutions)
+        service.embedding_repo = store
+        service.watermark_repo = _RecordingWatermarks()
+        await run_indexing(store, service, "index_entries", [good.id, bad.id])
+
+    with pytest.raises(EmbeddingError):
+        await attempt()
+    assert set(store.committed) == {good.id}
+
+    provider.failing.clear()
+    provider.calls.clear()
+    await attempt()
+
+    assert provider.calls == [[entry_embedding_text(bad)]]
+    assert set(store.committed) == {good.id, bad.id}
+
+
+@pytest.mark.asyncio
+async def test_indexing_services_share_one_embedding_cache_until_closed(monkeypatch):
+    """Test that jobs reuse one Redis-backed cache and shutdown closes its pool."""
+    closed = []
+
+    class _Redis:
+        async def aclose(self):
+            closed.append(self)
+
+    monkeypatch.setattr(EmbeddingCache, "from_settings", classmethod(lambda cls: cls(redis=_Redis())))
+    await close_embedding_cache()
+
+    first = IndexingService(db=None, embedding_provider=_RecordingProvider())
+    second = IndexingService(db=None, embedding_provider=_RecordingProvider())
+    assert first.embedding_cache is second.embedding_cache
+
+    await close_embedding_cache()
+    assert closed == [first.embedding_cache.redis]
+    assert IndexingService(db=None).embedding_cache is not first.embedding_cache
+    await close_embedding_cache()
@@ -0,0 +1,117 @@
+"""Tests for the pooled, batching Meilisearch client."""
+import json
+
+import httpx
+import pytest
+
+from app.core.exceptions import SearchIndexError
+from app.search.meilisearch import MeilisearchClient
+
+
+def _client_with_recorder(batch_size: int = 100, task_statuses=None):
+    """Client whose HTTP pool answers from a canned handler and records requests."""
+    requests = []
+    statuses = list(task_statuses or [])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.startswith("/tasks/"):
+            return httpx.Response(200, json={"status": statuses.pop(0) if statuses else "succeeded"})
+        return httpx.Response(202, json={"taskUid": len(requests)})
+
+    client = MeilisearchClient("http://meili", "key", batch_size=batch_size)
+    client._http = httpx.AsyncClient(base_url="http://meili", transport=httpx.MockTransport(handler))
+    return client, requests
+
+
+@pytest.mark.asyncio
+async def test_buffered_writes_flush_as_one_call_per_operation():
+    """Test that many queued writes become one upsert and one delete-batch call."""
+    client, requests = _client_with_recorder()
+
+    await client.queue_upsert("entries", [{"id": "a"}, {"id": "b"}])
+    await client.queue_upsert("entries", [{"id": "c"}])
+    await client.queue_delete("entries", ["d", "e"])
+    assert requests == []
+
+    await client.flush()
+
+    assert [r.url.path for r in requests] == [
+        "/indexes/entries/documents",
+        "/indexes/entries/documents/delete-batch",
+    ]
+    assert [doc["id"] for doc in json.loads(requests[0].content)] == ["a", "b", "c"]
+    assert json.loads(requests[1].content) == ["d", "e"]
+
+
+@pytest.mark.asyncio
+async def test_last_write_wins_within_a_flush():
+    """Test that an upsert followed by a delete of the same ID only deletes."""
+    client, requests = _client_with_recorder()
+
+    await client.queue_upsert("entries", [{"id": "a", "title": "old"}])
+    await client.queue_delete("entries", ["a"])
+    await client.flush()
+
+    assert [r.url.path for r in requests] == ["/indexes/entries/documents/delete-batch"]
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_flushes_immediately():
+    """Test that reaching batch_size sends without waiting for a flush."""
+    client, requests = _client_with_recorder(batch_size=2)
+
+    await client.queue_upsert("entries", [{"id": "a"}])
+    assert requests == []
+    await client.queue_upsert("entries", [{"id": "b"}])
+
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_flush_wait_polls_tasks_until_done():
+    """Test read-your-writes polling of enqueued task UIDs."""
+    client, requests = _client_with_recorder(task_statuses=["enqueued", "processing", "succeeded"])
+
+    await client.queue_upsert("entries", [{"id": "a"}])
+    task_uids = await client.flush(wait=True)
+
+    assert task_uids == [1]
+    assert [r.url.path for r in requests].count("/tasks/1") == 3
+
+
+@pytest.mark.asyncio
+async def test_aclose_flushes_pending_writes():
+    """Test that closing the client does not drop buffered writes."""
+    client, requests = _client_with_recorder()
+
+    await client.queue_delete("entries", ["a"])
+    await client.aclose()
+
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_writes_and_raises():
+    """Test that writes Meilisearch rejects stay buffered, lose to newer writes and are resent."""
+    requests, failures = [], [503]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if failures:
+            return httpx.Response(failures.pop(0))
+        return httpx.Response(202, json={"taskUid": len(requests)})
+
+    client = MeilisearchClient("http://meili", "key")
+    client._http = httpx.AsyncClient(base_url="http://meili", transport=httpx.MockTransport(handler))
+
+    await client.queue_upsert("entries", [{"id": "a", "title": "v1"}, {"id": "b", "title": "v1"}])
+    with pytest.raises(SearchIndexError):
+        await client.flush()
+
+    await client.queue_upsert("entries", [{"id": "a", "title": "v2"}])
+    await client.flush()
+
+    sent = {doc["id"]: doc["title"] for doc in json.loads(requests[-1].content)}
+    assert sent == {"a": "v2", "b": "v1"}
+    assert client._pending == {}
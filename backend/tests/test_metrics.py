@@ -0,0 +1,53 @@
+"""Tests for the in-process metrics registry."""
+import pytest
+
+from app.core.metrics import MetricsRegistry
+
+
+def test_registry_renders_prometheus_text_format():
+    """Test counter, gauge and cumulative histogram exposition."""
+    registry = MetricsRegistry()
+    jobs = registry.counter("jobs_total", "Jobs run.", ["outcome"])
+    depth = registry.gauge("queue_depth", "Queued jobs.", ["lane"])
+    latency = registry.histogram("job_seconds", "Job time.", buckets=(0.1, 1.0))
+
+    jobs.inc(outcome="success")
+    jobs.inc(2, outcome="success")
+    depth.set(7, lane='back"fill')
+    latency.observe(0.05)
+    latency.observe(0.5)
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE jobs_total counter" in lines
+    assert 'jobs_total{outcome="success"} 3' in lines
+    assert 'queue_depth{lane="back\\"fill"} 7' in lines
+    assert 'job_seconds_bucket{le="0.1"} 1' in lines
+    assert 'job_seconds_bucket{le="1"} 2' in lines
+    assert 'job_seconds_bucket{le="+Inf"} 2' in lines
+    assert "job_seconds_count 2" in lines
+    assert latency.sum() == pytest.approx(0.55)
+
+
+def test_registry_snapshot_summarises_histograms():
+    """Test the compact snapshot logged by the worker."""
+    registry = MetricsRegistry()
+    latency = registry.histogram("stage_seconds", "Stage time.", ["stage"])
+    latency.observe(0.2, stage="embed")
+    latency.observe(0.4, stage="embed")
+    registry.gauge("unused", "Never set.")
+
+    snapshot = registry.snapshot()
+
+    assert snapshot == {"stage_seconds": {"stage=embed": {"count": 2, "sum": 0.6, "mean": 0.3}}}
+
+
+def test_metrics_reject_mismatched_labels():
+    """Test that a series must name exactly the declared labels."""
+    registry = MetricsRegistry()
+    jobs = registry.counter("jobs_total", "Jobs run.", ["outcome"])
+
+    with pytest.raises(ValueError):
+        jobs.inc(task="index_entries")
+    with pytest.raises(ValueError):
+        registry.counter("jobs_total", "Again.")
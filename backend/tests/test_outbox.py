@@ -0,0 +1,304 @@
+"""Tests for the transactional outbox dispatcher."""
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.exceptions import SearchIndexError
+from app.repositories.entry_repo import EntryRepository
+from app.repositories.outbox_repo import OutboxRepository
+from app.repositories.solution_repo import SolutionRepository
+from app.schemas.entry import EntryIncidentCreate, EntrySymptomCreate
+from app.schemas.solution import SolutionStepCreate, SolutionStepUpdate
+from app.services.entry_service import EntryService
+from app.services.solution_service import SolutionService
+from app.workers import outbox as outbox_module
+from app.workers.outbox import OutboxDispatcher
+
+
+class _FakeOutboxRepository:
+    """In-memory stand-in sharing one event table across sessions."""
+
+    table = []
+    deleted = []
+    severities = {}
+
+    def __init__(self, db):
+        self.db = db
+
+    async def claim_batch(self, limit):
+        return self.table[:limit]
+
+    async def delete_many(self, ids):
+        self.deleted.extend(ids)
+
+    async def aggregate_severities(self, aggregate_type, ids):
+        return {aggregate_id: self.severities.get(aggregate_id, "low") for aggregate_id in ids}
+
+
+class _RecordingScheduler:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.scheduled = []
+
+    async def schedule(self, entity_type, ids, lane="interactive"):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.scheduled.append((entity_type, set(ids), lane))
+
+
+class _RecordingMeilisearch:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.deletes = []
+
+    async def queue_delete(self, index, ids):
+        self.deletes.append((index, list(ids)))
+
+    async def flush(self):
+        if self.fail:
+            raise SearchIndexError("Meilisearch did not accept 1 deletes to solutions")
+
+
+def _event(event_id, aggregate_id, aggregate_type="entries", event_type=None):
+    return SimpleNamespace(
+        id=event_id,
+        event_type=event_type or f"{aggregate_type[:-1]}.updated",
+        aggregate_type=aggregate_type,
+        aggregate_id=aggregate_id,
+    )
+
+
+@pytest.fixture
+def fake_repo(monkeypatch):
+    _FakeOutboxRepository.table = []
+    _FakeOutboxRepository.deleted = []
+    _FakeOutboxRepository.severities = {}
+    monkeypatch.setattr(outbox_module, "OutboxRepository", _FakeOutboxRepository)
+    return _FakeOutboxRepository
+
+
+@pytest.mark.asyncio
+async def test_dispatch_groups_events_and_deletes_them(fake_repo, fake_session):
+    """Test that a batch is scheduled per aggregate and removed in the same transaction."""
+    entry, solution = uuid4(), uuid4()
+    fake_repo.table = [_event(1, entry), _event(2, entry), _event(3, solution, "solutions")]
+    sessions = []
+
+    def session_factory():
+        sessions.append(fake_session())
+        return sessions[-1]
+
+    scheduler = _RecordingScheduler()
+    dispatcher = OutboxDispatcher(session_factory, scheduler, _RecordingMeilisearch(), batch_size=10)
+    delivered = await dispatcher.dispatch_once()
+
+    assert delivered == 3
+    assert sorted(scheduler.scheduled) == [
+        ("entries", {entry}, "interactive"),
+        ("solutions", {solution}, "interactive"),
+    ]
+    assert fake_repo.deleted == [1, 2, 3]
+    assert sessions[0].committed
+
+
+@pytest.mark.asyncio
+async def test_dispatch_keeps_events_when_scheduling_fails(fake_repo, fake_session):
+    """Test that a Redis failure leaves rows in place for the next attempt."""
+    fake_repo.table = [_event(1, uuid4())]
+    session = fake_session()
+    dispatcher = OutboxDispatcher(lambda: session, _RecordingScheduler(fail=True), _RecordingMeilisearch())
+
+    with pytest.raises(ConnectionError):
+        await dispatcher.dispatch_once()
+
+    assert fake_repo.deleted == []
+    assert not session.committed
+
+
+@pytest.mark.asyncio
+async def test_deleted_solutions_leave_the_index_instead_of_being_reindexed(fake_repo, fake_session):
+    """Test that a solution.deleted event deletes its document and schedules no indexing."""
+    kept, deleted = uuid4(), uuid4()
+    fake_repo.table = [
+        _event(1, kept, "solutions"),
+        _event(2, deleted, "solutions"),
+        _event(3, deleted, "solutions", "solution.deleted"),
+    ]
+    session, scheduler, meilisearch = fake_session(), _RecordingScheduler(), _RecordingMeilisearch()
+
+    await OutboxDispatcher(lambda: session, scheduler, meilisearch).dispatch_once()
+
+    assert meilisearch.deletes == [("solutions", [str(deleted)])]
+    assert scheduler.scheduled == [("solutions", {kept}, "interactive")]
+    assert fake_repo.deleted == [1, 2, 3]
+    assert session.committed
+
+
+@pytest.mark.asyncio
+async def test_dispatch_keeps_removal_events_when_meilisearch_fails(fake_repo, fake_session):
+    """Test that a rejected delete leaves the event for the next attempt."""
+    fake_repo.table = [_event(1, uuid4(), "solutions", "solution.deleted")]
+    session = fake_session()
+    dispatcher = OutboxDispatcher(lambda: session, _RecordingScheduler(), _RecordingMeilisearch(fail=True))
+
+    with pytest.raises(SearchIndexError):
+        await dispatcher.dispatch_once()
+
+    assert fake_repo.deleted == []
+    assert not session.committed
+
+
+@pytest.mark.asyncio
+async def test_claim_batch_skips_locked_rows(fake_session):
+    """Test that claiming compiles to FOR UPDATE SKIP LOCKED in id order."""
+    session = fake_session()
+
+    await OutboxRepository(session).claim_batch(50)
+
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert "ORDER BY outbox_events.id" in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+
+
+@pytest.mark.asyncio
+async def test_dispatch_routes_high_severity_changes_to_critical_lane(fake_repo, fake_session):
+    """Test that edits to critical-severity entries jump the queue."""
+    urgent, routine = uuid4(), uuid4()
+    fake_repo.table = [_event(1, urgent), _event(2, routine)]
+    fake_repo.severities = {urgent: "critical", routine: "low"}
+    scheduler = _RecordingScheduler()
+
+    await OutboxDispatcher(fake_session, scheduler, _RecordingMeilisearch()).dispatch_once()
+
+    assert sorted(scheduler.scheduled, key=lambda s: s[2]) == [
+        ("entries", {urgent}, "critical"),
+        ("entries", {routine}, "interactive"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_workflow_transitions_write_outbox_events():
+    """Test that retiring or merging an entry queues a reindex that withdraws it."""
+    entry_id = uuid4()
+    entry = SimpleNamespace(id=entry_id, workflow_state="published")
+    events = []
+
+    async def get(id):
+        return entry
+
+    async def update_workflow_state(id, new_state, approved_by=None):
+        entry.workflow_state = new_state
+        return entry
+
+    service = EntryService(db=None)
+    service.repo = SimpleNamespace(get=get, update_workflow_state=update_workflow_state)
+    service.outbox = SimpleNamespace(add=lambda *args: events.append(args))
+
+    await service.transition_workflow(entry_id, "merged")
+    entry.workflow_state = "published"
+    await service.delete_entry(entry_id)
+
+    assert events == [
+        ("entry.workflow_changed", "entries", entry_id, {"from": "published", "to": "merged"}),
+        ("entry.workflow_changed", "entries", entry_id, {"from": "published", "to": "retired"}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_solution_delete_writes_removal_event():
+    """Test that deleting a solution records its removal alongside the delete."""
+    solution_id = uuid4()
+    events = []
+
+    async def get(id):
+        return SimpleNamespace(id=solution_id)
+
+    async def delete(id):
+        return True
+
+    service = SolutionService(db=None)
+    service.repo = SimpleNamespace(get=get, delete=delete)
+    service.outbox = SimpleNamespace(add=lambda *args: events.append(args))
+
+    assert await service.delete_solution(solution_id)
+    assert events == [("solution.deleted", "solutions", solution_id)]
+
+
+@pytest.mark.asyncio
+async def test_symptom_and_incident_changes_bump_entry_and_write_events():
+    """Test that child changes advance the entry's version and queue its reindex."""
+    entry_id = uuid4()
+    events, touched = [], []
+
+    async def get(id):
+        return SimpleNamespace(id=entry_id)
+
+    async def add_child(id, data):
+        return SimpleNamespace(entry_id=id, **data)
+
+    async def touch(id):
+        touched.append(id)
+
+    service = EntryService(db=None)
+    service.repo = SimpleNamespace(get=get, add_symptom=add_child, add_incident=add_child, touch=touch)
+    service.outbox = SimpleNamespace(add=lambda *args: events.append(args))
+
+    await service.add_symptom(entry_id, EntrySymptomCreate(description="Disk at 100%", order_index=0))
+    await service.add_incident(entry_id, EntryIncidentCreate(incident_id="INC-1", incident_source="pagerduty"))
+
+    assert touched == [entry_id, entry_id]
+    assert events == [("entry.updated", "entries", entry_id)] * 2
+
+
+@pytest.mark.asyncio
+async def test_step_changes_bump_solution_and_write_events():
+    """Test that adding, editing or deleting a step advances the solution's version and queues its reindex."""
+    solution_id = uuid4()
+    step = SimpleNamespace(id=uuid4(), solution_id=solution_id)
+    events, touched = [], []
+
+    async def get(id):
+        return SimpleNamespace(id=solution_id)
+
+    async def get_step(id):
+        return step
+
+    async def add_step(id, data):
+        return SimpleNamespace(solution_id=id, **data)
+
+    async def update_step(id, data):
+        return step
+
+    async def delete_step(id):
+        return True
+
+    async def touch(id):
+        touched.append(id)
+
+    service = SolutionService(db=None)
+    service.repo = SimpleNamespace(
+        get=get, get_step=get_step, add_step=add_step, update_step=update_step, delete_step=delete_step, touch=touch
+    )
+    service.outbox = SimpleNamespace(add=lambda *args: events.append(args))
+
+    await service.add_step(solution_id, SolutionStepCreate(order_index=0, action="Rotate logs"))
+    await service.update_step(step.id, SolutionStepUpdate(action="Rotate and compress logs"))
+    await service.delete_step(step.id)
+
+    assert touched == [solution_id] * 3
+    assert events == [("solution.updated", "solutions", solution_id)] * 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("repository, table", [(EntryRepository, "entries"), (SolutionRepository, "solutions")])
+async def test_touch_sets_updated_at_to_now(fake_session, repository, table):
+    """Test that touching an entry or solution is a single UPDATE of updated_at."""
+    session = fake_session()
+
+    await repository(session).touch(uuid4())
+
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith(f"UPDATE {table} SET updated_at=now()")
+    assert f"WHERE {table}.id = " in sql
@@ -0,0 +1,89 @@
+"""Tests for keyset (cursor) pagination of entry listings."""
+from datetime import datetime, timedelta, timezone
+from itertools import combinations
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.exceptions import ValidationError
+from app.models.entry import Entry
+from app.repositories.entry_repo import EntryRepository
+from app.services.entry_service import EntryService
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips_sort_key():
+    """Test that a cursor decodes to the exact (created_at, id) it was built from."""
+    created_at = datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    entry_id = uuid4()
+
+    cursor = encode_cursor(created_at, entry_id)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, entry_id)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "W10", encode_cursor(datetime.now(), uuid4())[:-4]])
+def test_malformed_cursor_is_a_validation_error(cursor):
+    """Test that tampered cursors are rejected as bad input, not server errors."""
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [set(c) for n in range(4) for c in combinations(["workflow_state", "severity", "created_by"], n)],
+)
+def test_every_filter_combination_has_a_keyset_index(filters):
+    """Test that each listing filter combination has an index of the filters, then (created_at, id)."""
+    shapes = [[column.name for column in index.columns] for index in Entry.__table__.indexes]
+
+    assert any(
+        set(columns[:len(filters)]) == filters and columns[len(filters):] == ["created_at", "id"]
+        for columns in shapes
+    )
+
+
+@pytest.mark.asyncio
+async def test_keyset_query_seeks_instead_of_offset(fake_session):
+    """Test that a cursor page compares the (created_at, id) row value and skips no rows."""
+    session = fake_session()
+    after = (datetime(2025, 1, 1, tzinfo=timezone.utc), uuid4())
+
+    await EntryRepository(session).get_multi_with_filters(limit=21, severity="high", after=after)
+
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert "(entries.created_at, entries.id) < (" in sql
+    assert "ORDER BY entries.created_at DESC, entries.id DESC" in sql
+    assert "OFFSET" not in sql
+
+
+@pytest.mark.asyncio
+async def test_list_entries_returns_next_cursor_until_last_page():
+    """Test that pages chain through next_cursor and the last page has none."""
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = [SimpleNamespace(id=uuid4(), created_at=base - timedelta(minutes=i)) for i in range(5)]
+
+    async def get_multi_with_filters(*, skip, limit, after, **filters):
+        remaining = [r for r in rows if after is None or (r.created_at, r.id) < after]
+        return remaining[:limit]
+
+    async def total(filters, mode):
+        return len(rows)
+
+    service = EntryService(db=None)
+    service.repo = SimpleNamespace(get_multi_with_filters=get_multi_with_filters, total=total)
+
+    seen, cursor = [], None
+    for _ in range(3):
+        page = await service.list_entries(limit=2, cursor=cursor)
+        seen.extend(page["items"])
+        cursor = page["next_cursor"]
+
+    assert seen == rows
+    assert cursor is None
+
+    with pytest.raises(ValidationError):
+        await service.list_entries(skip=2, cursor=encode_cursor(base, rows[0].id))
@@ -0,0 +1,93 @@
+"""Tests for the embedding rate limiter and retry policy."""
+import asyncio
+
+import pytest
+
+from app.services.embedding_provider import EmbeddingProvider, RateLimitedEmbeddingProvider
+from app.services.rate_limit import TokenBucket
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _FlakyProvider(EmbeddingProvider):
+    """Fails the first ``failures`` calls with the given error."""
+
+    def __init__(self, failures: int, error: Exception):
+        super().__init__(2)
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    async def embed(self, texts):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return [[1.0, 0.0] for _ in texts]
+
+
+def _limited(inner, **kwargs):
+    options = {"requests_per_minute": 0, "tokens_per_minute": 0, "max_attempts": 3, "max_wait_seconds": 0.01}
+    options.update(kwargs)
+    return RateLimitedEmbeddingProvider(inner, **options)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spends_burst_then_refills():
+    """Test that the bucket allows a full burst and refills at the per-minute rate."""
+    clock = _Clock()
+    bucket = TokenBucket(60, clock=clock)
+
+    await bucket.acquire(60)
+    assert bucket.tokens == 0
+
+    clock.now += 10
+    await bucket.acquire(10)
+    assert bucket.tokens == pytest.approx(0)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_waits_for_tokens():
+    """Test that acquiring beyond the balance blocks until refilled."""
+    bucket = TokenBucket(6000)  # 100 tokens/second
+    await bucket.acquire(6000)
+
+    started = asyncio.get_running_loop().time()
+    await bucket.acquire(5)
+    assert asyncio.get_running_loop().time() - started >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried():
+    """Test that throttling/transient failures are retried until success."""
+    inner = _FlakyProvider(failures=2, error=asyncio.TimeoutError())
+
+    vectors = await _limited(inner).embed(["a", "b"])
+
+    assert inner.calls == 3
+    assert vectors == [[1.0, 0.0], [1.0, 0.0]]
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_after_max_attempts():
+    """Test that the last transient error surfaces once attempts are exhausted."""
+    inner = _FlakyProvider(failures=10, error=asyncio.TimeoutError())
+
+    with pytest.raises(asyncio.TimeoutError):
+        await _limited(inner, max_attempts=3).embed(["a"])
+    assert inner.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_permanent_errors_are_not_retried():
+    """Test that non-transient errors fail immediately."""
+    inner = _FlakyProvider(failures=1, error=ValueError("bad input"))
+
+    with pytest.raises(ValueError):
+        await _limited(inner).embed(["a"])
+    assert inner.calls == 1
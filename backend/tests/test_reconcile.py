@@ -0,0 +1,139 @@
+"""Tests for index drift detection and reconciliation."""
+from uuid import uuid4
+
+import httpx
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.index_watermark_repo import IndexWatermarkRepository
+from app.search.meilisearch import MeilisearchClient
+from app.workers import reconcile as reconcile_module
+from app.workers.queue import Job
+from app.workers.reconcile import Reconciler
+
+
+def test_stale_ids_query_is_a_single_anti_join():
+    """Test that stale IDs come from one outer join against the watermark table."""
+    query = IndexWatermarkRepository(None).stale_ids_query("entries", "meilisearch")
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert "LEFT OUTER JOIN index_watermarks" in sql
+    assert "index_watermarks.entity_id IS NULL OR index_watermarks.source_updated_at < entries.updated_at" in sql
+
+
+def _meilisearch(documents):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/stats"):
+            return httpx.Response(200, json={"numberOfDocuments": len(documents)})
+        if request.url.path.endswith("/documents"):
+            offset = int(request.url.params["offset"])
+            limit = int(request.url.params["limit"])
+            return httpx.Response(200, json={"results": [{"id": d} for d in documents[offset:offset + limit]]})
+        return httpx.Response(202, json={"taskUid": 1})
+
+    client = MeilisearchClient("http://meili", "key")
+    client._http = httpx.AsyncClient(base_url="http://meili", transport=httpx.MockTransport(handler))
+    return client
+
+
+@pytest.mark.asyncio
+async def test_iter_document_ids_pages_through_index():
+    """Test that document IDs are read page by page until a short page."""
+    client = _meilisearch([f"d{i}" for i in range(5)])
+
+    ids = [doc_id async for doc_id in client.iter_document_ids("entries", page_size=2)]
+
+    assert ids == ["d0", "d1", "d2", "d3", "d4"]
+
+
+@pytest.mark.asyncio
+async def test_document_count_is_zero_for_missing_index():
+    """Test that an index Meilisearch has not created yet counts as empty."""
+    client = MeilisearchClient("http://meili", "key")
+    client._http = httpx.AsyncClient(
+        base_url="http://meili",
+        transport=httpx.MockTransport(lambda request: httpx.Response(404, json={"code": "index_not_found"})),
+    )
+
+    assert await client.document_count("entries") == 0
+
+
+class _RecordingQueue:
+    def __init__(self):
+        self.jobs = []
+
+    async def enqueue(self, task, *args, lane="interactive"):
+        self.jobs.append(Job(task, list(args), lane=lane))
+
+
+class _StubReconciler(Reconciler):
+    """Watermark scan and Postgres ID scan answered from memory."""
+
+    def __init__(self, stale, postgres_ids, **kwargs):
+        super().__init__(**kwargs)
+        self.stale = stale
+        self.postgres_ids = postgres_ids
+
+    async def _stream_ids(self, session, query):
+        if "index_watermarks" in str(query):
+            return set(self.stale)
+        return set(self.postgres_ids)
+
+
+@pytest.mark.asyncio
+async def test_reconcile_enqueues_stale_and_missing_ids_and_drops_orphans(monkeypatch, fake_session):
+    """Test that only drifted IDs are re-queued in batches and orphan documents deleted."""
+    monkeypatch.setattr(reconcile_module, "get_embedding_provider", lambda: None)
+    stale, lost, indexed = uuid4(), uuid4(), uuid4()
+    meilisearch = _meilisearch([str(stale), str(indexed), "orphan"])
+    deleted = []
+
+    async def record_delete(index, ids):
+        deleted.extend(ids)
+
+    meilisearch.queue_delete = record_delete
+    queue = _RecordingQueue()
+    reconciler = _StubReconciler(
+        stale=[stale],
+        postgres_ids=[stale, lost, indexed],
+        session_factory=lambda: fake_session(default=[4]),
+        meilisearch=meilisearch,
+        queue=queue,
+        batch_size=1,
+    )
+
+    report = await reconciler.reconcile("entries")
+
+    assert report["stale_meilisearch"] == 1
+    assert report["missing_documents"] == 1
+    assert report["orphan_documents"] == 1
+    assert report["enqueued"] == 2
+    assert [(job.task, job.lane) for job in queue.jobs] == [("index_entries", "backfill")] * 2
+    assert {job.args[0][0] for job in queue.jobs} == {str(stale), str(lost)}
+    assert deleted == ["orphan"]
+
+
+@pytest.mark.asyncio
+async def test_reconcile_skips_document_diff_when_counts_match(monkeypatch, fake_session):
+    """Test that matching counts avoid paging through Meilisearch documents."""
+    monkeypatch.setattr(reconcile_module, "get_embedding_provider", lambda: None)
+    meilisearch = _meilisearch(["a", "b"])
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("document IDs should not be read")
+        yield
+
+    meilisearch.iter_document_ids = fail
+    reconciler = _StubReconciler(
+        stale=[],
+        postgres_ids=[],
+        session_factory=lambda: fake_session(default=[2]),
+        meilisearch=meilisearch,
+        queue=_RecordingQueue(),
+        dry_run=True,
+    )
+
+    report = await reconciler.reconcile("entries")
+
+    assert report["enqueued"] == 0
+    assert report["missing_documents"] == 0
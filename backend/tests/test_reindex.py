@@ -0,0 +1,90 @@
+"""Tests for the resumable reindex checkpoint."""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.core.exceptions import ReindexError
+from app.models.entry import Entry
+from app.workers import reindex as reindex_module
+from app.workers.reindex import Checkpoint
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+def _position(second: int):
+    return datetime(2025, 1, 1, 0, 0, second, tzinfo=timezone.utc), uuid4()
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_only_advances_over_contiguous_chunks():
+    """Test that an out-of-order finish does not skip an unfinished chunk."""
+    checkpoint = Checkpoint(_FakeRedis(), "entries")
+    first, second, third = _position(1), _position(2), _position(3)
+
+    await checkpoint.mark_done(1, second)
+    assert await checkpoint.load() is None
+
+    await checkpoint.mark_done(0, first)
+    assert await checkpoint.load() == second
+
+    await checkpoint.mark_done(2, third)
+    assert await checkpoint.load() == third
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_clear():
+    """Test that a completed run leaves no checkpoint behind."""
+    checkpoint = Checkpoint(_FakeRedis(), "solutions")
+    await checkpoint.mark_done(0, _position(1))
+    await checkpoint.clear()
+    assert await checkpoint.load() is None
+
+
+class _NullMeilisearch:
+    @classmethod
+    def from_settings(cls):
+        return cls()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_keeps_checkpoint_and_raises(monkeypatch, fake_session):
+    """Test that a chunk that raises fails the run instead of being skipped."""
+    rows = [SimpleNamespace(id=position[1], created_at=position[0]) for position in map(_position, range(4))]
+    partitions = [rows[0:2], rows[2:4]]
+    indexed = []
+
+    async def index_chunk(meilisearch, method, ids):
+        if ids[0] == rows[2].id:
+            raise RuntimeError("meilisearch unavailable")
+        indexed.append(ids)
+
+    monkeypatch.setattr(reindex_module, "AsyncSessionLocal", lambda: fake_session(*partitions))
+    monkeypatch.setattr(reindex_module, "MeilisearchClient", _NullMeilisearch)
+    monkeypatch.setattr(reindex_module, "_index_chunk", index_chunk)
+    checkpoint = Checkpoint(_FakeRedis(), "entries")
+
+    with pytest.raises(ReindexError):
+        await reindex_module._reindex("entries", Entry, "index_entries", checkpoint, 2, 1, False)
+
+    assert indexed == [[rows[0].id, rows[1].id]]
+    assert await checkpoint.load() == (rows[1].created_at, rows[1].id)
@@ -0,0 +1,115 @@
+"""Tests for repository write round trips."""
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import Session
+
+from app.models.base import Base
+from app.models.entry import EntrySymptom
+from app.models.tag import Tag
+from app.repositories.base import BaseRepository
+from app.repositories.entry_repo import EntryRepository
+from app.repositories.tag_repo import TagRepository
+
+
+class _SQLiteSession:
+    """
+    Async-session facade over a real synchronous SQLite session.
+
+    The ORM flushes for real, so the SQL it emits can be inspected; SQLite
+    supports RETURNING, which is all eager server defaults need.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.refreshed = []
+
+    def add(self, obj):
+        self.session.add(obj)
+
+    async def execute(self, statement, *args, **kwargs):
+        return self.session.execute(statement, *args, **kwargs)
+
+    async def flush(self):
+        self.session.flush()
+
+    async def refresh(self, obj):
+        self.refreshed.append(obj)
+        self.session.refresh(obj)
+
+
+@pytest.fixture
+def sqlite_session():
+    """(session, executed SQL) over in-memory tags and entry_symptoms tables."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Tag.__table__, EntrySymptom.__table__])
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with Session(engine) as session:
+        yield _SQLiteSession(session), statements
+    engine.dispose()
+
+
+def _inserts(session):
+    """(write, server-defaulted attribute it must return) per repository insert."""
+    return [
+        (lambda: TagRepository(session).create({"name": "disk"}), "created_at"),
+        (
+            lambda: EntryRepository(session).add_symptom(uuid4(), {"description": "d", "order_index": 0}),
+            "created_at",
+        ),
+    ]
+
+
+def test_mappers_fetch_server_defaults_eagerly():
+    """Test that every mapper returns server-generated columns from the write itself."""
+    assert all(mapper.eager_defaults for mapper in Base.registry.mappers)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("index", range(2))
+async def test_insert_returns_server_defaults_in_one_statement(sqlite_session, index):
+    """Test that an insert is one INSERT ... RETURNING, with no refresh and no follow-up SELECT."""
+    session, statements = sqlite_session
+    write, attribute = _inserts(session)[index]
+
+    obj = await write()
+
+    [insert] = statements
+    assert insert.startswith("INSERT")
+    assert "RETURNING" in insert and attribute in insert.split("RETURNING", 1)[1]
+    assert session.refreshed == []
+    assert attribute not in inspect(obj).unloaded
+    assert getattr(obj, attribute) is not None
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_update_sends_no_refresh(sqlite_session):
+    """Test that an update by ID is a SELECT plus the UPDATE, with no refresh."""
+    session, statements = sqlite_session
+    tag = await TagRepository(session).create({"name": "disk"})
+    statements.clear()
+
+    updated = await TagRepository(session).update(tag.id, {"name": "storage"})
+
+    assert [statement.split()[0] for statement in statements] == ["SELECT", "UPDATE"]
+    assert session.refreshed == []
+    assert updated.name == "storage"
+
+
+@pytest.mark.asyncio
+async def test_refresh_on_write_reloads_after_the_flush(sqlite_session, monkeypatch):
+    """Test that the opt-in option still re-selects written objects."""
+    monkeypatch.setattr(BaseRepository, "refresh_on_write", True)
+    session, statements = sqlite_session
+
+    tag = await TagRepository(session).create({"name": "disk"})
+
+    assert session.refreshed == [tag]
+    assert [statement.split()[0] for statement in statements] == ["INSERT", "SELECT"]
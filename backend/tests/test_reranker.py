@@ -0,0 +1,164 @@
+"""Tests for the micro-batched re-ranking stage."""
+import asyncio
+import gc
+
+import pytest
+
+from app.core.config import settings
+from app.search import reranker as reranker_module
+from app.search.reranker import LexicalOverlapScorer, MicroBatchReranker, Scorer, get_reranker
+
+
+class _CountingScorer(Scorer):
+    """Lexical scorer that records the size of every batch it receives."""
+
+    def __init__(self):
+        self.batches = []
+        self.inner = LexicalOverlapScorer()
+
+    async def score(self, pairs):
+        self.batches.append(len(pairs))
+        return await self.inner.score(pairs)
+
+
+def test_lexical_overlap_prefers_query_terms():
+    """Test that documents covering more query terms score higher."""
+    score = LexicalOverlapScorer.score_one
+
+    assert score("disk full", "disk is full on /var") > score("disk full", "disk latency high")
+    assert score("disk full", "network timeout") == 0.0
+    assert score("", "anything") == 0.0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_batch():
+    """Test that rerank calls arriving within the wait window are scored together."""
+    scorer = _CountingScorer()
+    reranker = MicroBatchReranker(scorer, max_batch_size=64, max_wait_ms=20)
+
+    results = await asyncio.gather(
+        reranker.rerank("disk full", ["disk full", "cpu high"]),
+        reranker.rerank("cpu high", ["disk full", "cpu high", "memory leak"]),
+    )
+
+    assert scorer.batches == [5]
+    assert results[0][0] > results[0][1]
+    assert results[1][1] > results[1][0]
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_without_waiting():
+    """Test that reaching max_batch_size scores immediately and splits the rest."""
+    scorer = _CountingScorer()
+    reranker = MicroBatchReranker(scorer, max_batch_size=2, max_wait_ms=10_000)
+
+    scores = await asyncio.wait_for(reranker.rerank("q", ["a", "b", "c", "d"]), timeout=1)
+
+    assert scorer.batches == [2, 2]
+    assert len(scores) == 4
+
+
+@pytest.mark.asyncio
+async def test_scores_are_cached_and_in_flight_pairs_deduplicated():
+    """Test that repeated pairs hit the LRU and duplicates share one scoring slot."""
+    scorer = _CountingScorer()
+    reranker = MicroBatchReranker(scorer, max_wait_ms=1)
+
+    first = await reranker.rerank("disk full", ["disk full", "disk full"])
+    second = await reranker.rerank("disk full", ["disk full"])
+
+    assert scorer.batches == [1]
+    assert first[0] == first[1] == second[0]
+
+
+@pytest.mark.asyncio
+async def test_timed_out_request_does_not_cancel_a_shared_pair():
+    """Test that a request cancelled by its deadline leaves the shared future to other waiters."""
+
+    class _SlowScorer(_CountingScorer):
+        async def score(self, pairs):
+            await asyncio.sleep(0.05)
+            return await super().score(pairs)
+
+    scorer = _SlowScorer()
+    reranker = MicroBatchReranker(scorer, max_wait_ms=1)
+
+    results = await asyncio.gather(
+        asyncio.wait_for(reranker.rerank("disk full", ["disk full"]), timeout=0.01),
+        reranker.rerank("disk full", ["disk full", "cpu high"]),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], asyncio.TimeoutError)
+    assert results[1][0] > results[1][1]
+    assert scorer.batches == [2]
+    assert reranker._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_scorer_failure_propagates_to_every_waiter():
+    """Test that a failed batch fails each request and leaves nothing in flight."""
+
+    class _BrokenScorer(Scorer):
+        async def score(self, pairs):
+            raise RuntimeError("boom")
+
+    reranker = MicroBatchReranker(_BrokenScorer(), max_wait_ms=1)
+
+    results = await asyncio.gather(
+        reranker.rerank("a", ["x"]),
+        reranker.rerank("b", ["y"]),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert reranker._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_leaves_no_unretrieved_errors():
+    """Test that waiters skipped after the first error do not log 'exception was never retrieved'."""
+
+    class _BrokenScorer(Scorer):
+        async def score(self, pairs):
+            raise RuntimeError("boom")
+
+    loop = asyncio.get_running_loop()
+    unhandled = []
+    loop.set_exception_handler(lambda _, context: unhandled.append(context))
+    try:
+        reranker = MicroBatchReranker(_BrokenScorer(), max_wait_ms=1)
+        try:
+            # The second document's future fails too but is never awaited
+            await reranker.rerank("q", ["x", "y"])
+        except RuntimeError:
+            pass
+        # Let the batch task's done callbacks run so nothing else holds the futures
+        await asyncio.sleep(0.01)
+        gc.collect()
+    finally:
+        loop.set_exception_handler(None)
+
+    assert unhandled == []
+
+
+def test_missing_cross_encoder_falls_back_once(monkeypatch):
+    """Test that a missing sentence-transformers install is logged once and the lexical scorer used."""
+    attempts = []
+
+    def _missing(model_name):
+        attempts.append(model_name)
+        raise ImportError("No module named 'sentence_transformers'")
+
+    monkeypatch.setattr(settings, "reranker_backend", "cross-encoder")
+    monkeypatch.setattr(reranker_module, "CrossEncoderScorer", _missing)
+    get_reranker.cache_clear()
+    try:
+        first = get_reranker()
+        second = get_reranker()
+    finally:
+        get_reranker.cache_clear()
+
+    assert isinstance(first.scorer, LexicalOverlapScorer)
+    assert second is first
+    assert len(attempts) == 1
@@ -0,0 +1,152 @@
+"""Tests for the debounced indexing scheduler."""
+from uuid import uuid4
+
+import pytest
+
+from app.workers.queue import Job, JobQueue
+from app.workers.scheduler import PENDING_KEY, IndexScheduler
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.members = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    def zrem(self, key, member):
+        self.members.append((key, member))
+
+    async def execute(self):
+        return [await self.redis.zrem(key, member) for key, member in self.members]
+
+
+class _FakeRedis:
+    """Sorted set and list subset used by the scheduler and JobQueue."""
+
+    def __init__(self):
+        self.zsets = {}
+        self.lists = {}
+
+    async def zadd(self, key, mapping, nx=False):
+        zset = self.zsets.setdefault(key, {})
+        for member, score in mapping.items():
+            if nx and member in zset:
+                continue
+            zset[member] = score
+
+    async def zrangebyscore(self, key, min, max, start=0, num=None):
+        items = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+        due = [member for member, score in items if score <= max]
+        return due[start:start + num] if num is not None else due[start:]
+
+    async def zrem(self, key, member):
+        return 1 if self.zsets.get(key, {}).pop(member, None) is not None else 0
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    async def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+    async def llen(self, key):
+        return len(self.lists.get(key, []))
+
+
+def _scheduler(redis, **kwargs):
+    return IndexScheduler(redis, JobQueue(redis, "default"), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_repeated_edits_coalesce_into_one_item():
+    """Test that scheduling the same entity again keeps one pending item and its first due time."""
+    redis = _FakeRedis()
+    scheduler = _scheduler(redis, debounce_ms=1000)
+    entry_id = uuid4()
+
+    for _ in range(5):
+        await scheduler.schedule("entries", [entry_id])
+    pending = redis.zsets[PENDING_KEY.format(lane="interactive")]
+    first_due = pending[f"entries:{entry_id}"]
+    await scheduler.schedule("entries", [entry_id])
+
+    assert await scheduler.pending() == 1
+    assert pending[f"entries:{entry_id}"] == first_due
+
+
+@pytest.mark.asyncio
+async def test_dispatch_only_sends_due_items_in_batches():
+    """Test that items wait out the debounce window and are batched per entity type."""
+    redis = _FakeRedis()
+    queue = JobQueue(redis, "default")
+    scheduler = IndexScheduler(redis, queue, debounce_ms=1000, batch_size=2)
+    entries = [uuid4() for _ in range(3)]
+    solution = uuid4()
+    await scheduler.schedule("entries", entries)
+    await scheduler.schedule("solutions", [solution])
+
+    assert await scheduler.dispatch_due() == 0
+
+    far_future = 10 ** 10
+    assert await scheduler.dispatch_due(now=far_future) == 4
+    assert await scheduler.pending() == 0
+
+    jobs = [Job.loads(raw) for raw in redis.lists[queue.lane_key("interactive")]]
+    assert [(job.task, len(job.args[0])) for job in jobs] == [
+        ("index_entries", 2),
+        ("index_entries", 1),
+        ("index_solutions", 1),
+    ]
+    assert {i for job in jobs[:2] for i in job.args[0]} == {str(e) for e in entries}
+
+
+@pytest.mark.asyncio
+async def test_claim_skips_items_taken_by_another_scheduler():
+    """Test that an item removed concurrently is not dispatched twice."""
+    redis = _FakeRedis()
+    scheduler = _scheduler(redis, debounce_ms=0)
+    taken, mine = uuid4(), uuid4()
+    await scheduler.schedule("entries", [taken, mine])
+
+    original = redis.zrangebyscore
+
+    async def racing_range(*args, **kwargs):
+        members = await original(*args, **kwargs)
+        await redis.zrem(PENDING_KEY.format(lane="interactive"), f"entries:{taken}")
+        return members
+
+    redis.zrangebyscore = racing_range
+
+    assert await scheduler.claim_due("interactive", now=10 ** 10) == {"entries": [str(mine)]}
+
+
+@pytest.mark.asyncio
+async def test_schedule_rejects_unknown_entity_type():
+    """Test that only indexable entity types can be scheduled."""
+    with pytest.raises(ValueError):
+        await _scheduler(_FakeRedis()).schedule("tags", [uuid4()])
+
+
+@pytest.mark.asyncio
+async def test_dispatch_keeps_items_on_their_lane():
+    """Test that critical items are enqueued on the critical lane."""
+    redis = _FakeRedis()
+    queue = JobQueue(redis, "default")
+    scheduler = IndexScheduler(redis, queue, debounce_ms=0)
+    critical, normal = uuid4(), uuid4()
+    await scheduler.schedule("entries", [critical], lane="critical")
+    await scheduler.schedule("entries", [normal])
+
+    await scheduler.dispatch_due(now=10 ** 10)
+
+    [critical_job] = [Job.loads(raw) for raw in redis.lists[queue.lane_key("critical")]]
+    [normal_job] = [Job.loads(raw) for raw in redis.lists[queue.lane_key("interactive")]]
+    assert (critical_job.lane, critical_job.args) == ("critical", [[str(critical)]])
+    assert (normal_job.lane, normal_job.args) == ("interactive", [[str(normal)]])
@@ -0,0 +1,189 @@
+"""Tests for hybrid search fusion and backend deadlines."""
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.repositories.embedding_repo import HNSW_MAX_EF_SEARCH, EmbeddingRepository
+from app.search.hybrid import HybridSearchService, meilisearch_filter, reciprocal_rank_fusion
+from app.search.meilisearch import MeilisearchClient
+from app.search.reranker import LexicalOverlapScorer, MicroBatchReranker, Scorer
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    """Test that IDs returned by both backends outrank single-backend hits."""
+    fused = reciprocal_rank_fusion(
+        {"bm25": ["a", "b", "c"], "vector": ["b", "d"]},
+        k=60,
+    )
+
+    ids = [doc_id for doc_id, _ in fused]
+    assert ids[0] == "b"
+    assert set(ids) == {"a", "b", "c", "d"}
+    assert fused[0][1] == {"bm25": 1 / 62, "vector": 1 / 61}
+
+
+def test_reciprocal_rank_fusion_empty():
+    """Test fusing no rankings."""
+    assert reciprocal_rank_fusion({}) == []
+
+
+class _StubSearchService(HybridSearchService):
+    """Hybrid search with canned backends and no database hydration."""
+
+    def __init__(self, lexical_delay: float, reranker=None):
+        super().__init__(db=None, reranker=reranker)
+        self.lexical_delay = lexical_delay
+
+    async def _lexical_search(self, query, limit, filter=None):
+        await asyncio.sleep(self.lexical_delay)
+        return ["lexical-only", "shared"]
+
+    async def _vector_search(self, query, limit, severity=None, workflow_state=None):
+        await asyncio.sleep(0.1)
+        return ["shared", "vector-only"]
+
+    async def _hydrate(self, fused, limit, severity, workflow_state):
+        return [
+            (
+                SimpleNamespace(
+                    id=doc_id,
+                    title=doc_id,
+                    description=f"{doc_id} document",
+                    severity="low",
+                    workflow_state="draft",
+                ),
+                scores,
+            )
+            for doc_id, scores in fused
+        ][:limit]
+
+
+@pytest.mark.asyncio
+async def test_search_runs_backends_concurrently(monkeypatch):
+    """Test that latency tracks the slowest backend, not the sum."""
+    monkeypatch.setattr(settings, "search_lexical_timeout_ms", 1000)
+    service = _StubSearchService(lexical_delay=0.1)
+
+    started = time.perf_counter()
+    result = await service.search("disk full", limit=5)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.18
+    assert result["degraded_backends"] == []
+    assert result["results"][0]["entry_id"] == "shared"
+
+
+@pytest.mark.asyncio
+async def test_search_degrades_on_backend_timeout(monkeypatch):
+    """Test that a backend missing its deadline is dropped, not fatal."""
+    monkeypatch.setattr(settings, "search_lexical_timeout_ms", 20)
+    service = _StubSearchService(lexical_delay=1.0)
+
+    result = await service.search("disk full", limit=5)
+
+    assert result["degraded_backends"] == ["bm25"]
+    assert [r["entry_id"] for r in result["results"]] == ["shared", "vector-only"]
+
+
+@pytest.mark.asyncio
+async def test_search_reranks_fused_candidates(monkeypatch):
+    """Test that reranker scores reorder results and fill the score breakdown."""
+    monkeypatch.setattr(settings, "search_lexical_timeout_ms", 1000)
+    service = _StubSearchService(
+        lexical_delay=0, reranker=MicroBatchReranker(LexicalOverlapScorer())
+    )
+
+    result = await service.search("vector only", limit=5)
+
+    top = result["results"][0]
+    assert top["entry_id"] == "vector-only"
+    assert top["score_breakdown"]["reranker"] == top["score_breakdown"]["final"]
+    assert result["degraded_backends"] == []
+
+
+@pytest.mark.asyncio
+async def test_search_keeps_fused_order_when_reranker_fails(monkeypatch):
+    """Test that a failing reranker degrades to the fused ranking."""
+
+    class _BrokenScorer(Scorer):
+        async def score(self, pairs):
+            raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(settings, "search_lexical_timeout_ms", 1000)
+    service = _StubSearchService(lexical_delay=0, reranker=MicroBatchReranker(_BrokenScorer()))
+
+    result = await service.search("vector only", limit=5)
+
+    assert result["degraded_backends"] == ["reranker"]
+    assert result["results"][0]["entry_id"] == "shared"
+    assert result["results"][0]["score_breakdown"]["reranker"] is None
+
+
+def test_meilisearch_filter_combines_and_escapes():
+    """Test that entry filters become one escaped Meilisearch expression."""
+    assert meilisearch_filter(None, None) is None
+    assert meilisearch_filter("high", None) == 'severity = "high"'
+    assert meilisearch_filter("high", 'pub"lished') == 'severity = "high" AND workflow_state = "pub\\"lished"'
+
+
+@pytest.mark.asyncio
+async def test_lexical_search_merges_solution_hits_in_one_round_trip():
+    """Test that entries and solutions are queried together and solution hits map to entries."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"results": [
+            {"hits": [{"id": "e1"}, {"id": "e2"}]},
+            {"hits": [{"entry_id": "e3"}, {"entry_id": "e3"}, {"entry_id": "e1"}]},
+        ]})
+
+    client = MeilisearchClient("http://meili", "key")
+    client._http = httpx.AsyncClient(base_url="http://meili", transport=httpx.MockTransport(handler))
+    service = HybridSearchService(db=None, meilisearch=client)
+
+    ids = await service._lexical_search("systemctl restart", 10, 'severity = "high"')
+
+    assert [r.url.path for r in requests] == ["/multi-search"]
+    queries = json.loads(requests[0].content)["queries"]
+    assert [q["indexUid"] for q in queries] == ["entries", "solutions"]
+    assert all(q["filter"] == 'severity = "high"' for q in queries)
+    assert ids[0] == "e1"
+    assert set(ids) == {"e1", "e2", "e3"}
+
+
+def _compiled(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+@pytest.mark.asyncio
+async def test_pgvector_search_applies_entry_filters_in_the_query(fake_session):
+    """Test that severity and workflow-state filters are joined into the ANN query, not applied after it."""
+    session = fake_session()
+
+    await EmbeddingRepository(session).search_entries([0.1] * settings.embedding_dimensions, limit=5, severity="high", workflow_state="published")
+
+    ef_search, search = (_compiled(statement) for statement in session.statements)
+    assert f"'{HNSW_MAX_EF_SEARCH}'" in ef_search
+    assert "JOIN entries ON entries.id = entry_embeddings.entry_id" in search
+    assert "entries.severity = 'HIGH'" in search
+    assert "entries.workflow_state = 'PUBLISHED'" in search
+
+
+@pytest.mark.asyncio
+async def test_pgvector_search_skips_unsearchable_entries_by_default(monkeypatch, fake_session):
+    """Test that unfiltered ANN queries exclude retired and merged entries and keep the default ef_search."""
+    monkeypatch.setattr(settings, "hnsw_ef_search", 40)
+    session = fake_session()
+
+    await EmbeddingRepository(session).search_entries([0.1] * settings.embedding_dimensions, limit=5)
+
+    ef_search, search = (_compiled(statement) for statement in session.statements)
+    assert "'40'" in ef_search
+    assert "entries.workflow_state NOT IN ('RETIRED', 'MERGED')" in search
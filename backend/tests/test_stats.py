@@ -0,0 +1,74 @@
+"""Tests for single-pass dashboard statistics."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.repositories.stats_repo import entry_stats_query, summarize
+from app.services.stats_service import StatsService
+
+ROWS = [
+    ("severity", "CRITICAL", 2, 1),
+    ("severity", "LOW", 3, 0),
+    ("workflow_state", "DRAFT", 4, 1),
+    ("workflow_state", "RETIRED", 1, 0),
+    ("status", "ACTIVE", 4, 1),
+    ("status", "ARCHIVED", 1, 0),
+    ("total", "", 5, 1),
+]
+
+
+def test_stats_query_is_one_grouping_sets_scan():
+    """Test that every distribution and the total come from one GROUP BY."""
+    sql = str(entry_stats_query().compile(dialect=postgresql.dialect()))
+
+    assert sql.count("FROM entries") == 1
+    assert "GROUPING SETS((entries.severity), (entries.workflow_state), (entries.status), ())" in sql
+    assert "count(*) FILTER (WHERE entries.created_at >= now() - interval '30 days')" in sql
+
+
+def test_summarize_maps_enum_labels_and_fills_zeros():
+    """Test that Postgres enum labels become API values and missing values count zero."""
+    stats = summarize(ROWS)
+
+    assert stats["total_entries"] == 5
+    assert stats["recent_entries"] == 1
+    assert stats["critical_entries"] == 2
+    assert (stats["active_entries"], stats["archived_entries"]) == (4, 1)
+    assert stats["severity_distribution"] == {"critical": 2, "high": 0, "medium": 0, "low": 3, "info": 0}
+    assert stats["workflow_distribution"]["retired"] == 1
+    assert stats["workflow_distribution"]["published"] == 0
+
+
+class _FakeStatsRepo:
+    def __init__(self, refreshed_at):
+        self.refreshed_at = refreshed_at
+        self.live_queries = 0
+
+    async def entry_counts_from_view(self):
+        return ROWS, self.refreshed_at
+
+    async def entry_counts(self):
+        self.live_queries += 1
+        return ROWS
+
+    async def top_tags(self, limit=10):
+        return []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("age_seconds, live", [(10, False), (3600, True)])
+async def test_dashboard_reads_view_within_staleness_bound(monkeypatch, age_seconds, live):
+    """Test that a fresh view is served and a stale one falls back to the live query."""
+    monkeypatch.setattr(settings, "stats_view_refresh_seconds", 60)
+    monkeypatch.setattr(settings, "stats_view_max_staleness_seconds", 300)
+    refreshed_at = datetime.now(timezone.utc) - timedelta(seconds=age_seconds)
+
+    service = StatsService(db=None)
+    service.repo = _FakeStatsRepo(refreshed_at)
+    stats = await service.get_dashboard()
+
+    assert service.repo.live_queries == int(live)
+    assert stats["total_entries"] == 5
+    assert (stats["as_of"] == refreshed_at) is not live
@@ -0,0 +1,138 @@
+"""Postgres-backed tests for the outbox and worker transaction boundaries."""
+from contextlib import nullcontext
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.exceptions import EmbeddingError
+from app.models.outbox import OutboxEvent
+from app.repositories.outbox_repo import OutboxRepository
+from app.workers.indexing_worker import run_indexing
+from app.workers.outbox import OutboxDispatcher
+
+
+class _Scheduler:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.scheduled = []
+
+    async def schedule(self, aggregate_type, ids, lane="interactive"):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.scheduled.append((aggregate_type, set(ids)))
+
+
+class _Meilisearch:
+    async def queue_delete(self, index, ids):
+        pass
+
+    async def flush(self):
+        pass
+
+
+async def _add_events(sessions, count):
+    async with sessions() as session:
+        outbox = OutboxRepository(session)
+        events = [outbox.add("entry.updated", "entries", uuid4()) for _ in range(count)]
+        await session.commit()
+    return events
+
+
+async def _event_count(sessions):
+    async with sessions() as session:
+        return (await session.execute(select(func.count()).select_from(OutboxEvent))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_claims_never_share_rows(committing_sessions):
+    """Test that a second dispatcher skips rows locked by an open claim instead of waiting."""
+    await _add_events(committing_sessions, 4)
+
+    async with committing_sessions() as first, committing_sessions() as second:
+        claimed_first = await OutboxRepository(first).claim_batch(2)
+        claimed_second = await OutboxRepository(second).claim_batch(10)
+
+        assert len(claimed_first) == 2
+        assert len(claimed_second) == 2
+        assert {e.id for e in claimed_first}.isdisjoint(e.id for e in claimed_second)
+        await first.rollback()
+        await second.rollback()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_deletes_delivered_events_in_its_commit(committing_sessions):
+    """Test that delivered events are gone for other sessions once the batch commits."""
+    events = await _add_events(committing_sessions, 3)
+    scheduler = _Scheduler()
+
+    delivered = await OutboxDispatcher(committing_sessions, scheduler, _Meilisearch()).dispatch_once()
+
+    assert delivered == 3
+    assert scheduler.scheduled == [("entries", {e.aggregate_id for e in events})]
+    assert await _event_count(committing_sessions) == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_dispatch_rolls_back_and_releases_events(committing_sessions):
+    """Test that a scheduling failure keeps every event and unlocks it for the next claim."""
+    await _add_events(committing_sessions, 2)
+
+    with pytest.raises(ConnectionError):
+        await OutboxDispatcher(committing_sessions, _Scheduler(fail=True), _Meilisearch()).dispatch_once()
+
+    assert await _event_count(committing_sessions) == 2
+    async with committing_sessions() as session:
+        assert len(await OutboxRepository(session).claim_batch(10)) == 2
+        await session.rollback()
+
+
+class _WritingService:
+    """Indexing service double that writes a row in the job's session, then optionally raises."""
+
+    def __init__(self, session, error=None):
+        self.session = session
+        self.error = error
+        self.aggregate_id = uuid4()
+
+    def db_phase(self, stage):
+        return nullcontext()
+
+    async def index_entries(self, ids):
+        OutboxRepository(self.session).add("entry.updated", "entries", self.aggregate_id)
+        await self.session.flush()
+        if self.error is not None:
+            raise self.error
+
+
+async def _run_job(sessions, error=None):
+    """Run one indexing job in its own session as the worker does; returns whether its row survived."""
+    async with sessions() as session:
+        service = _WritingService(session, error)
+        if error is None:
+            await run_indexing(session, service, "index_entries", [uuid4()])
+        else:
+            with pytest.raises(type(error)):
+                await run_indexing(session, service, "index_entries", [uuid4()])
+
+    async with sessions() as session:
+        query = select(func.count()).select_from(OutboxEvent).where(OutboxEvent.aggregate_id == service.aggregate_id)
+        return (await session.execute(query)).scalar_one() == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_commits_a_successful_job(committing_sessions):
+    """Test that a job's writes are visible to other sessions after it returns."""
+    assert await _run_job(committing_sessions)
+
+
+@pytest.mark.asyncio
+async def test_worker_commits_stored_rows_before_a_partial_embedding_failure(committing_sessions):
+    """Test that rows written before an EmbeddingError are committed so the retry skips them."""
+    assert await _run_job(committing_sessions, EmbeddingError("1 of 2 failed"))
+
+
+@pytest.mark.asyncio
+async def test_worker_rolls_back_a_failed_job(committing_sessions):
+    """Test that any other error discards the job's writes when its session closes."""
+    assert not await _run_job(committing_sessions, RuntimeError("meilisearch unavailable"))
@@ -0,0 +1,252 @@
+"""Tests for the memory-mapped in-process vector index."""
+import asyncio
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.search import hybrid
+from app.search.vector_index import VectorIndex
+from app.workers import indexing_worker
+from app.workers.vector_index import VectorIndexRefresher
+
+
+def _row(entry_id, vector, updated_at):
+    return SimpleNamespace(entry_id=entry_id, embedding=np.asarray(vector, dtype=np.float32), updated_at=updated_at)
+
+
+def _refresh_session(fake_session, rows, live=None):
+    """Session answering the delta query with ``rows`` and the live-ID query with ``live``."""
+    return fake_session(rows, [row.entry_id for row in rows] if live is None else live)
+
+
+@pytest.mark.asyncio
+async def test_refresh_persists_and_searches(tmp_path, fake_session):
+    """Test that refreshed rows are memory-mapped and ranked by cosine similarity."""
+    now = datetime.now(timezone.utc)
+    index = VectorIndex.for_entries(tmp_path)
+    applied = await index.refresh(_refresh_session(fake_session, [
+        _row("a", [1.0, 0.0, 0.0], now),
+        _row("b", [0.0, 1.0, 0.0], now),
+        _row("c", [0.7, 0.7, 0.0], now),
+    ]))
+
+    assert applied == 3
+    assert isinstance(index.matrix, np.memmap)
+    assert index.matrix.dtype == np.float16
+
+    hits = index.search([1.0, 0.1, 0.0], k=2)[0]
+    assert [doc_id for doc_id, _ in hits] == ["a", "c"]
+
+
+@pytest.mark.asyncio
+async def test_incremental_refresh_overwrites_and_appends(tmp_path, fake_session):
+    """Test that a second refresh updates known IDs in place and appends new ones."""
+    now = datetime.now(timezone.utc)
+    index = VectorIndex.for_entries(tmp_path)
+    await index.refresh(_refresh_session(fake_session, [_row("a", [1.0, 0.0], now), _row("b", [0.0, 1.0], now)]))
+
+    later = now + timedelta(seconds=5)
+    rows = [_row("a", [0.0, 1.0], later), _row("c", [1.0, 0.0], later)]
+    await index.refresh(_refresh_session(fake_session, rows, ["a", "b", "c"]))
+
+    assert index.ids == ["a", "b", "c"]
+    assert index.watermark == later
+
+    reopened = VectorIndex.for_entries(tmp_path)
+    reopened.load()
+    assert [doc_id for doc_id, _ in reopened.search([1.0, 0.0], k=1)[0]] == ["c"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_drops_ids_whose_embeddings_are_gone(tmp_path, fake_session):
+    """Test that deleted or withdrawn documents are compacted out even when nothing new arrived."""
+    now = datetime.now(timezone.utc)
+    index = VectorIndex.for_entries(tmp_path)
+    rows = [_row("a", [1.0, 0.0], now), _row("b", [0.0, 1.0], now), _row("c", [0.7, 0.7], now)]
+    await index.refresh(_refresh_session(fake_session, rows))
+
+    assert await index.refresh(_refresh_session(fake_session, [], ["a", "c"])) == 0
+
+    assert index.ids == ["a", "c"]
+    assert index.matrix.shape == (2, 2)
+    assert [doc_id for doc_id, _ in index.search([0.0, 1.0], k=3)[0]] == ["c", "a"]
+    assert (index.watermark, index.watermark_id) == (now, "c")
+
+
+@pytest.mark.asyncio
+async def test_refresh_without_changes_writes_nothing(tmp_path, fake_session):
+    """Test that an idle refresh leaves the files alone."""
+    now = datetime.now(timezone.utc)
+    index = VectorIndex.for_entries(tmp_path)
+    await index.refresh(_refresh_session(fake_session, [_row("a", [1.0, 0.0], now)]))
+    mtime = index.meta_path.stat().st_mtime
+
+    assert await index.refresh(_refresh_session(fake_session, [], ["a", "b"])) == 0
+    assert index.meta_path.stat().st_mtime == mtime
+
+
+def test_each_write_maps_its_own_matrix_file(tmp_path):
+    """Test that a loaded index keeps its matrix across a compaction and only old files are removed."""
+    writer = VectorIndex.for_entries(tmp_path, dtype="float32")
+    writer._persist(np.eye(3, dtype=np.float32), ["a", "b", "c"], None)
+    reader = VectorIndex.for_entries(tmp_path, dtype="float32")
+    reader.load()
+    # Files written within one timestamp tick look equally old, so age the first
+    for path in tmp_path.glob("entries.*.npy"):
+        os.utime(path, (path.stat().st_atime - 10, path.stat().st_mtime - 10))
+
+    writer._persist(np.eye(3, dtype=np.float32)[[0, 2]], ["a", "c"], None)
+    writer._persist(np.eye(3, dtype=np.float32)[[2]], ["c"], None)
+
+    # Still mapped to the original version; the two newest files are kept on disk
+    assert [doc_id for doc_id, _ in reader.search([0.0, 1.0, 0.0], k=1)[0]] == ["b"]
+    assert len(list(tmp_path.glob("entries.*.npy"))) == 2
+    reader.reload_if_changed()
+    assert reader.ids == ["c"]
+
+
+def test_batched_queries_match_single_queries(tmp_path):
+    """Test that scoring many queries in one call matches per-query results."""
+    rng = np.random.default_rng(0)
+    index = VectorIndex.for_entries(tmp_path, dtype="float32")
+    index._persist(rng.normal(size=(200, 16)).astype(np.float32), [str(i) for i in range(200)], None)
+    index.load()
+
+    queries = rng.normal(size=(4, 16))
+    batched = index.search(queries, k=5)
+
+    for query, expected in zip(queries, batched):
+        single = index.search(query, k=5)[0]
+        assert [doc_id for doc_id, _ in single] == [doc_id for doc_id, _ in expected]
+        assert [score for _, score in single] == pytest.approx([score for _, score in expected], rel=1e-5)
+
+
+def test_search_empty_index(tmp_path):
+    """Test searching before anything was persisted."""
+    index = VectorIndex.for_entries(tmp_path)
+    index.load()
+    assert index.search([1.0, 0.0], k=3) == [[]]
+
+
+@pytest.mark.asyncio
+async def test_refresh_resumes_after_the_last_applied_key(tmp_path, fake_session):
+    """Test that the watermark is an (updated_at, id) keyset, so rows tied on updated_at are not skipped."""
+    now = datetime.now(timezone.utc)
+    index = VectorIndex.for_entries(tmp_path)
+    await index.refresh(_refresh_session(fake_session, [_row("a", [1.0, 0.0], now), _row("b", [0.0, 1.0], now)]))
+
+    reopened = VectorIndex.for_entries(tmp_path)
+    reopened.load()
+    assert (reopened.watermark, reopened.watermark_id) == (now, "b")
+
+    session = fake_session([])
+    await reopened.refresh(session)
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert "(entry_embeddings.updated_at, entry_embeddings.entry_id) >" in sql
+    assert "ORDER BY entry_embeddings.updated_at, entry_embeddings.entry_id" in sql
+
+
+@pytest.mark.asyncio
+async def test_refresh_without_watermark_id_reapplies_the_boundary(tmp_path, fake_session):
+    """Test that an index persisted before the ID tie-breaker re-reads rows at its watermark."""
+    now = datetime.now(timezone.utc)
+    index = VectorIndex.for_entries(tmp_path)
+    index._persist(np.eye(2, dtype=np.float16), ["a", "b"], now)
+    index.load()
+
+    session = fake_session([])
+    await index.refresh(session)
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert "entry_embeddings.updated_at >= " in sql
+
+
+@pytest.mark.asyncio
+async def test_worker_refresh_runs_in_a_context_session(monkeypatch, fake_session):
+    """Test that the periodic refresh uses the worker's session and Postgres limit until stopped."""
+    calls = []
+
+    async def refresh(db, db_slots=None):
+        calls.append((db, db_slots))
+
+    monkeypatch.setattr(indexing_worker, "refresh_vector_indexes", refresh)
+    session = fake_session()
+    context = SimpleNamespace(session=lambda: session, postgres_slots=asyncio.Semaphore(1))
+    stopping = asyncio.Event()
+
+    run = asyncio.create_task(VectorIndexRefresher(context, interval_seconds=60).run(stopping))
+    await asyncio.sleep(0.01)
+    stopping.set()
+    await asyncio.wait_for(run, timeout=1)
+
+    assert calls == [(session, context.postgres_slots)]
+
+
+class _FilteringEntryRepo:
+    """Entry repository double that passes only the allowed IDs through the search filters."""
+
+    def __init__(self, allowed):
+        self.allowed = set(allowed)
+        self.calls = []
+
+    async def filter_searchable_ids(self, ids, *, severity=None, workflow_state=None):
+        self.calls.append((list(ids), severity, workflow_state))
+        return {entry_id for entry_id in ids if entry_id in self.allowed}
+
+
+class _Provider:
+    async def embed(self, texts):
+        return [[1.0, 0.0]]
+
+
+def _index_search_service(tmp_path, monkeypatch, vectors, allowed):
+    """Hybrid search over an in-process index of ``vectors`` with ``allowed`` passing the filters."""
+    ids = [str(uuid4()) for _ in vectors]
+    index = VectorIndex.for_entries(tmp_path, dtype="float32")
+    index._persist(np.asarray(vectors, dtype=np.float32), ids, None)
+    index.load()
+    monkeypatch.setattr(hybrid.settings, "vector_index_dir", str(tmp_path))
+    monkeypatch.setattr(hybrid, "get_vector_index", lambda name: index)
+
+    service = hybrid.HybridSearchService.__new__(hybrid.HybridSearchService)
+    service.embedding_provider = _Provider()
+    service.entry_repo = _FilteringEntryRepo(UUID(ids[i]) for i in allowed)
+    return service, index, ids
+
+
+@pytest.mark.asyncio
+async def test_vector_search_runs_the_index_off_the_event_loop(tmp_path, monkeypatch):
+    """Test that reloading and scanning the in-process index happen in an executor thread."""
+    service, index, ids = _index_search_service(tmp_path, monkeypatch, [[1.0, 0.0], [0.0, 1.0]], [0, 1])
+
+    loop_thread = threading.get_ident()
+    threads = []
+    search = index.search
+
+    def recording_search(queries, k):
+        threads.append(threading.get_ident())
+        return search(queries, k)
+
+    monkeypatch.setattr(index, "search", recording_search)
+
+    assert await service._vector_search("disk full", 1) == [ids[0]]
+    assert threads and threads[0] != loop_thread
+
+
+@pytest.mark.asyncio
+async def test_filtered_vector_search_tops_up_to_the_limit(tmp_path, monkeypatch):
+    """Test that candidates failing the filters are replaced by widening the in-process scan."""
+    # Increasing angle from the query [1, 0]: cosine strictly decreases with i
+    vectors = [[np.cos(0.1 * i), np.sin(0.1 * i)] for i in range(10)]
+    service, _, ids = _index_search_service(tmp_path, monkeypatch, vectors, [7, 8, 9])
+
+    hits = await service._vector_search("disk full", 2, severity="high")
+
+    assert hits == [ids[7], ids[8]]
+    assert [len(candidates) for candidates, _, _ in service.entry_repo.calls] == [2, 8, 10]
+    assert service.entry_repo.calls[0][1:] == ("high", None)
@@ -0,0 +1,319 @@
+"""Tests for the native async worker runtime."""
+import asyncio
+import time
+
+import pytest
+
+from app.core.metrics import STAGE_SECONDS, span
+from app.services.embedding_provider import EmbeddingProvider, LimitedEmbeddingProvider
+from app.workers.context import WorkerContext
+from app.workers.metrics import JOBS, OLDEST_JOB_AGE, QUEUE_DEPTH, MetricsReporter
+from app.workers.queue import BACKFILL, Job, JobQueue
+from app.workers.runtime import AsyncWorker
+
+
+class _FakeRedis:
+    """Just enough of a Redis list for JobQueue."""
+
+    def __init__(self):
+        self.lists = {}
+
+    async def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+    async def lpop(self, key):
+        if self.lists.get(key):
+            return self.lists[key].pop(0)
+        return None
+
+    async def blpop(self, keys, timeout=0):
+        for key in keys:
+            if self.lists.get(key):
+                return key, self.lists[key].pop(0)
+        await asyncio.sleep(0)
+        return None
+
+    async def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    async def lindex(self, key, index):
+        items = self.lists.get(key, [])
+        return items[index] if -len(items) <= index < len(items) else None
+
+    async def lrange(self, key, start, end):
+        return self.lists.get(key, [])[start:end + 1]
+
+    async def eval(self, script, numkeys, source, destination, expected, value):
+        # Only the queue's compare-and-move script is ever evaluated
+        if await self.lindex(source, 0) != expected:
+            return 0
+        self.lists[source].pop(0)
+        self.lists.setdefault(destination, []).append(value)
+        return 1
+
+
+def test_job_round_trips_through_json():
+    """Test that a job survives serialisation unchanged."""
+    job = Job("index_entries", [["a", "b"]])
+    restored = Job.loads(job.dumps())
+
+    assert (restored.id, restored.task, restored.args) == (job.id, job.task, job.args)
+    assert restored.enqueued_at == job.enqueued_at
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_jobs_in_order_with_shared_context():
+    """Test that every job gets the same context object on one loop."""
+    queue = JobQueue(_FakeRedis(), "default")
+    context = object()
+    seen = []
+
+    async def record(ctx, value):
+        seen.append((ctx, value, asyncio.get_running_loop()))
+        if value == "last":
+            worker.stop()
+
+    worker = AsyncWorker(queue, context, tasks={"record": record}, poll_timeout=0.01)
+    for value in ("first", "second", "last"):
+        await queue.enqueue("record", value)
+
+    await asyncio.wait_for(worker.run(), timeout=1)
+
+    assert [value for _, value, _ in seen] == ["first", "second", "last"]
+    assert all(ctx is context for ctx, _, _ in seen)
+    assert len({loop for _, _, loop in seen}) == 1
+    assert await queue.size() == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_and_unknown_jobs_do_not_stop_the_worker():
+    """Test that job errors are contained and reported as failures."""
+    queue = JobQueue(_FakeRedis(), "default")
+
+    async def boom(ctx):
+        raise RuntimeError("boom")
+
+    worker = AsyncWorker(queue, context=None, tasks={"boom": boom})
+
+    assert await worker.execute(Job("boom", [])) is False
+    assert await worker.execute(Job("missing", [])) is False
+
+
+@pytest.mark.asyncio
+async def test_failed_jobs_are_dead_lettered_and_replayable():
+    """Test that a failing job lands in the dead-letter list and replays onto the queue."""
+    queue = JobQueue(_FakeRedis(), "default")
+
+    async def boom(ctx, entry_id):
+        raise RuntimeError("provider unavailable")
+
+    worker = AsyncWorker(queue, context=None, tasks={"boom": boom})
+    job = Job("boom", ["e1"])
+    await worker.execute(job)
+
+    [dead] = await queue.dead_letters()
+    assert (dead.id, dead.args) == (job.id, ["e1"])
+    assert dead.error == "RuntimeError: provider unavailable"
+    assert dead.failed_at is not None
+
+    assert await queue.replay_dead_letters() == 1
+    assert await queue.dead_letter_size() == 0
+    assert await queue.size(BACKFILL) == 1
+    replayed = await queue.dequeue()
+    assert (replayed.id, replayed.task, replayed.args) == (job.id, "boom", ["e1"])
+    assert replayed.lane == BACKFILL
+    assert replayed.enqueued_at >= dead.failed_at
+    assert (replayed.error, replayed.failed_at) == (None, None)
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_up_to_concurrency_jobs_at_once():
+    """Test that jobs overlap on one loop but never exceed the concurrency limit."""
+    queue = JobQueue(_FakeRedis(), "default")
+    in_flight = 0
+    peak = 0
+    done = 0
+
+    async def slow(ctx):
+        nonlocal in_flight, peak, done
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        done += 1
+        if done == 6:
+            worker.stop()
+
+    worker = AsyncWorker(queue, None, tasks={"slow": slow}, poll_timeout=0.01, concurrency=3)
+    for _ in range(6):
+        await queue.enqueue("slow")
+
+    started = time.perf_counter()
+    await asyncio.wait_for(worker.run(), timeout=1)
+    elapsed = time.perf_counter() - started
+
+    assert done == 6
+    assert peak == 3
+    assert elapsed < 0.25
+
+
+@pytest.mark.asyncio
+async def test_limited_embedding_provider_caps_in_flight_calls():
+    """Test that the embedding limiter queues calls beyond its limit."""
+    in_flight = 0
+    peak = 0
+
+    class _SlowProvider(EmbeddingProvider):
+        async def embed(self, texts):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [[0.0] * self.dimensions for _ in texts]
+
+    provider = LimitedEmbeddingProvider(_SlowProvider(4), max_concurrency=2)
+    await asyncio.gather(*(provider.embed(["text"]) for _ in range(6)))
+
+    assert peak == 2
+    assert provider.dimensions == 4
+
+
+@pytest.mark.asyncio
+async def test_worker_context_limits_postgres_work_not_sessions():
+    """Test that only DB phases take a Postgres slot, so a job waiting on embeddings blocks no one."""
+    in_db = 0
+    peak = 0
+
+    class _Session:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            pass
+
+    context = WorkerContext(
+        session_factory=_Session,
+        meilisearch=object(),
+        embedding_provider=None,
+        postgres_concurrency=1,
+    )
+
+    async def query(service):
+        nonlocal in_db, peak
+        async with service.db_phase("fetch"):
+            in_db += 1
+            peak = max(peak, in_db)
+            await asyncio.sleep(0.01)
+            in_db -= 1
+
+    embedded = asyncio.Event()
+
+    async def embedding_job():
+        async with context.session() as session:
+            await query(context.indexing_service(session))
+            # Stands in for a slow embedding call between the load and the store
+            await embedded.wait()
+            await query(context.indexing_service(session))
+
+    async def db_job():
+        async with context.session() as session:
+            await query(context.indexing_service(session))
+
+    slow = asyncio.create_task(embedding_job())
+    await asyncio.wait_for(asyncio.gather(*(db_job() for _ in range(3))), timeout=1)
+    embedded.set()
+    await slow
+
+    assert peak == 1
+
+
+@pytest.mark.asyncio
+async def test_lanes_are_served_by_weight_while_all_are_busy():
+    """Test that a deep backfill lane only gets its weighted share."""
+    queue = JobQueue(_FakeRedis(), "default", lane_weights={"critical": 8, "interactive": 4, "backfill": 1})
+    for i in range(20):
+        await queue.enqueue("index_entries", [f"b{i}"], lane="backfill")
+        await queue.enqueue("index_entries", [f"i{i}"], lane="interactive")
+        await queue.enqueue("index_entries", [f"c{i}"], lane="critical")
+
+    lanes = [(await queue.dequeue()).lane for _ in range(13)]
+
+    assert lanes.count("critical") == 8
+    assert lanes.count("interactive") == 4
+    assert lanes.count("backfill") == 1
+
+
+@pytest.mark.asyncio
+async def test_empty_lanes_yield_their_turn():
+    """Test that backfill drains at full speed when nothing else is queued."""
+    queue = JobQueue(_FakeRedis(), "default")
+    for i in range(3):
+        await queue.enqueue("index_entries", [f"b{i}"], lane="backfill")
+
+    jobs = [await queue.dequeue() for _ in range(3)]
+
+    assert [job.args for job in jobs] == [[["b0"]], [["b1"]], [["b2"]]]
+    assert await queue.dequeue(timeout=0) is None
+
+
+@pytest.mark.asyncio
+async def test_enqueue_rejects_unknown_lane():
+    """Test that jobs can only target configured lanes."""
+    with pytest.raises(ValueError):
+        await JobQueue(_FakeRedis(), "default").enqueue("index_entries", [], lane="urgent")
+
+
+@pytest.mark.asyncio
+async def test_worker_counts_outcomes_and_collects_stage_timings():
+    """Test that jobs are counted by outcome and spans from child tasks reach the job."""
+    queue = JobQueue(_FakeRedis(), "metrics")
+    before = {
+        outcome: JOBS.get(task="timed", lane="critical", outcome=outcome)
+        for outcome in ("success", "failure")
+    }
+    embeds_before = STAGE_SECONDS.count(stage="embed")
+
+    async def timed(ctx, fail):
+        async def embed():
+            with span("embed"):
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(embed(), embed())
+        if fail:
+            raise RuntimeError("boom")
+
+    worker = AsyncWorker(queue, None, tasks={"timed": timed})
+    assert await worker.execute(Job("timed", [False], lane="critical")) is True
+    assert await worker.execute(Job("timed", [True], lane="critical")) is False
+
+    assert JOBS.get(task="timed", lane="critical", outcome="success") == before["success"] + 1
+    assert JOBS.get(task="timed", lane="critical", outcome="failure") == before["failure"] + 1
+    assert STAGE_SECONDS.count(stage="embed") == embeds_before + 4
+
+
+@pytest.mark.asyncio
+async def test_metrics_reporter_reports_depth_and_oldest_age_per_lane():
+    """Test queue gauges and the Prometheus endpoint."""
+    queue = JobQueue(_FakeRedis(), "gauges")
+    job = await queue.enqueue("index_entries", ["a"], lane="backfill")
+    await queue.enqueue("index_entries", ["b"], lane="backfill")
+
+    reporter = MetricsReporter(queue)
+    await reporter.collect(now=job.enqueued_at + 42)
+
+    assert QUEUE_DEPTH.get(queue="gauges", lane="backfill") == 2
+    assert QUEUE_DEPTH.get(queue="gauges", lane="critical") == 0
+    assert OLDEST_JOB_AGE.get(queue="gauges", lane="backfill") == pytest.approx(42)
+    assert OLDEST_JOB_AGE.get(queue="gauges", lane="critical") == 0
+
+    server = await asyncio.start_server(reporter._handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: worker\r\n\r\n")
+        response = (await reader.read()).decode()
+        writer.close()
+
+    assert response.startswith("HTTP/1.1 200 OK")
+    assert 'kedb_worker_queue_depth{queue="gauges",lane="backfill"} 2' in response